@@ -0,0 +1,166 @@
+"""Parallel chunked historical backfill."""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.config import Config
+from storage.bar_store import BarStore
+
+
+class HistoricalBackfill:
+    """Backfills multi-year bar history into the columnar bar store.
+    
+    The requested range is split into ``backfill.chunk_days`` date chunks per
+    symbol and the (symbol, chunk) tasks are fetched on a worker pool. Each
+    completed chunk is recorded in a checkpoint file so an interrupted run
+    resumes with only the missing chunks.
+    """
+    
+    def __init__(self, config: Config, collector, store: Optional[BarStore] = None):
+        """Initialize backfill.
+        
+        Pass the processor's ``store`` so both write through one instance.
+        """
+        self.config = config
+        self.backfill_config = config.backfill
+        self.collector = collector
+        self.logger = logging.getLogger(__name__)
+        
+        self.store = store if store is not None else BarStore(config.storage.historical_dir)
+        
+        checkpoint_dir = Path(config.storage.cache_dir) / "backfill"
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_file = checkpoint_dir / "checkpoint.log"
+        
+        self._lock = threading.Lock()
+        self.completed = set()
+    
+    @staticmethod
+    def plan_chunks(start: datetime, end: datetime, chunk_days: int) -> List[Tuple[str, str]]:
+        """Split ``[start, end)`` into consecutive date chunks.
+        
+        Chunk boundaries are aligned to multiples of ``chunk_days`` since the
+        epoch so that runs started on different days share checkpoint keys;
+        only the first chunk is clipped to ``start``.
+        """
+        epoch = datetime(1970, 1, 1)
+        aligned = (start - epoch).days // chunk_days * chunk_days
+        chunks = []
+        chunk_start = epoch + timedelta(days=aligned)
+        
+        while chunk_start < end:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days), end)
+            chunks.append((max(chunk_start, start).strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d')))
+            chunk_start = chunk_end
+        
+        return chunks
+    
+    @staticmethod
+    def _task_key(symbol: str, start: str, end: str, interval: str) -> str:
+        """Build the checkpoint key of a chunk."""
+        return f"{symbol}|{interval}|{start}|{end}"
+    
+    def run(self, symbols: Optional[List[str]] = None, days: Optional[int] = None,
+            resume: bool = True) -> Dict:
+        """Backfill ``days`` of history for ``symbols`` and return a summary."""
+        symbols = symbols or self.config.data_sources.yahoo_finance.stocks
+        days = days or self.backfill_config.days
+        interval = self.backfill_config.interval
+        
+        end = datetime.now() + timedelta(days=1)
+        start = end - timedelta(days=days + 1)
+        chunks = self.plan_chunks(start.replace(hour=0, minute=0, second=0, microsecond=0),
+                                  end.replace(hour=0, minute=0, second=0, microsecond=0),
+                                  self.backfill_config.chunk_days)
+        
+        self.completed = self._load_checkpoint() if resume else set()
+        
+        tasks = [
+            (symbol, chunk_start, chunk_end)
+            for symbol in symbols
+            for chunk_start, chunk_end in chunks
+            if self._task_key(symbol, chunk_start, chunk_end, interval) not in self.completed
+        ]
+        
+        total = len(symbols) * len(chunks)
+        self.logger.info(f"📚 Backfilling {days} days for {len(symbols)} symbols "
+                         f"({len(tasks)}/{total} chunks pending)...")
+        
+        started = time.time()
+        rows = 0
+        failed = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, self.backfill_config.max_workers),
+                                thread_name_prefix='backfill') as executor:
+            futures = {
+                executor.submit(self._fetch_chunk, symbol, chunk_start, chunk_end, interval):
+                    (symbol, chunk_start, chunk_end)
+                for symbol, chunk_start, chunk_end in tasks
+            }
+            
+            for future in as_completed(futures):
+                symbol, chunk_start, chunk_end = futures[future]
+                try:
+                    rows += future.result()
+                    self._mark_done(self._task_key(symbol, chunk_start, chunk_end, interval))
+                except Exception as e:
+                    failed += 1
+                    self.logger.warning(f"   ✗ {symbol} {chunk_start}→{chunk_end}: {e}")
+        
+        # Short chunks land in the store's tails; fold them into the partitions
+        self.store.compact()
+        
+        elapsed = time.time() - started
+        summary = {
+            'symbols': len(symbols),
+            'chunks_total': total,
+            'chunks_fetched': len(tasks) - failed,
+            'chunks_failed': failed,
+            'chunks_skipped': total - len(tasks),
+            'rows': rows,
+            'elapsed': round(elapsed, 2)
+        }
+        
+        self.logger.info(f"   ✓ Backfill done in {elapsed:.1f}s: {rows} rows, "
+                         f"{summary['chunks_fetched']} fetched, {failed} failed, "
+                         f"{summary['chunks_skipped']} already done")
+        return summary
+    
+    def _fetch_chunk(self, symbol: str, start: str, end: str, interval: str) -> int:
+        """Fetch one chunk and write it to the store; returns the row count."""
+        hist = self.collector.fetch_history_range(symbol, start, end, interval)
+        
+        if hist is None or hist.empty:
+            return 0
+        
+        self.store.append(symbol, hist)
+        return len(hist)
+    
+    def _mark_done(self, key: str):
+        """Record a completed chunk by appending it to the checkpoint log."""
+        with self._lock:
+            self.completed.add(key)
+            with open(self.checkpoint_file, 'a') as f:
+                f.write(key + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _load_checkpoint(self) -> set:
+        """Load completed chunk keys (a torn last line is simply not a match)."""
+        if not self.checkpoint_file.exists():
+            return set()
+        
+        with open(self.checkpoint_file) as f:
+            return {line.strip() for line in f if line.strip()}
+    
+    def reset(self):
+        """Forget all checkpoints."""
+        with self._lock:
+            self.completed = set()
+            self.checkpoint_file.unlink(missing_ok=True)
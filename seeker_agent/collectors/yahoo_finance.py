@@ -1,34 +1,95 @@
 """Yahoo Finance data collector."""
 
+import asyncio
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import yfinance as yf
 import pandas as pd
 
 from core.config import Config
+from utils.rate_limiter import RateLimiter
+from utils.cache import DiskCache, LRUCache
+from utils.validation import RAW_RECORD_SCHEMA, Rejection, RejectionStats
+
+
+# ticker.info fields used in records; only these are kept in the metadata cache
+METADATA_FIELDS = [
+    'longName', 'sector', 'industry', 'marketCap', 'currency',
+    'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'averageVolume', 'trailingPE'
+]
 
 
 class YahooFinanceCollector:
     """Collects stock market data from Yahoo Finance."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, rate_limiter: Optional[RateLimiter] = None):
         """Initialize Yahoo Finance collector."""
         self.config = config
         self.yahoo_config = config.data_sources.yahoo_finance
         self.logger = logging.getLogger(__name__)
         
+        # Limiter shared with other collectors when provided by the agent
+        self.rate_limiter = rate_limiter or RateLimiter(
+            config.performance.rate_limit_delay,
+            config.performance.rate_limit_burst
+        )
+        # Tokens acquired on the event loop before an async fetch runs on a worker thread
+        self._prepaid = threading.local()
+        self.max_workers = max(1, config.performance.max_workers)
+        self.request_timeout = config.performance.request_timeout
+        
         # Setup data directory
         self.data_dir = Path(config.storage.raw_data_dir) / "yahoo_finance"
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Last-seen bar timestamp per symbol for incremental fetches
+        self.state_dir = Path(config.storage.cache_dir) / "yahoo_finance"
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        
         # Cache for avoiding redundant API calls
-        self.cache = {} if config.features.cache_enabled else None
-        self.cache_ttl = 300  # 5 minutes
+        self.cache_ttl = config.cache.ttl
+        if config.features.cache_enabled:
+            self.cache = LRUCache(
+                ttl=self.cache_ttl,
+                max_entries=config.cache.memory_max_entries,
+                max_bytes=config.cache.memory_max_bytes,
+                sweep_interval=config.cache.sweep_interval
+            )
+        else:
+            self.cache = None
+        
+        # Disk tier survives restarts and one-shot runs
+        if config.features.cache_enabled and config.cache.disk_enabled:
+            self.disk_cache = DiskCache(
+                self.state_dir / "bars",
+                ttl=config.cache.ttl,
+                max_entries=config.cache.disk_max_entries,
+                max_bytes=config.cache.disk_max_bytes
+            )
+        else:
+            self.disk_cache = None
+        
+        # Records failing the shared schema are dropped before caching
+        self.schema = RAW_RECORD_SCHEMA
+        self.rejections = RejectionStats()
+        
+        self.high_water_file = self.state_dir / "high_water_marks.json"
+        self._high_water_lock = threading.Lock()
+        self.high_water_marks = self._load_high_water_marks() if self.yahoo_config.incremental else {}
+        
+        # Long-lived ticker.info metadata, kept separate from the price cache
+        self.metadata_file = self.state_dir / "metadata_cache.json"
+        self._metadata_lock = threading.Lock()
+        self._metadata_dirty = False
+        self.metadata_cache = self._load_metadata_cache()
         
         self.logger.info(f"✅ Yahoo Finance collector initialized")
         self.logger.info(f"   Tracking {len(self.yahoo_config.stocks)} symbols: {', '.join(self.yahoo_config.stocks)}")
@@ -37,27 +98,290 @@ class YahooFinanceCollector:
         """Collect latest data from Yahoo Finance."""
         self.logger.info(f"📥 Collecting data for {len(self.yahoo_config.stocks)} stocks...")
         
+        if self.yahoo_config.bulk_download:
+            all_data = self._collect_bulk(self.yahoo_config.stocks)
+        elif self.max_workers > 1:
+            all_data = self._collect_concurrent(self.yahoo_config.stocks)
+        else:
+            all_data = self._collect_sequential(self.yahoo_config.stocks)
+        
+        self._finish_collection(all_data)
+        return all_data
+    
+    def iter_collect(self) -> Iterator[Dict]:
+        """Yield records as soon as each symbol (or bulk chunk) is fetched.
+        
+        Used by the streaming pipeline; records come in completion order
+        rather than configured symbol order. Raw data and collector state are
+        persisted once the generator is exhausted or closed.
+        """
+        symbols = self.yahoo_config.stocks
+        self.logger.info(f"📥 Streaming data for {len(symbols)} stocks...")
         all_data = []
         
-        for symbol in self.yahoo_config.stocks:
+        try:
+            if self.yahoo_config.bulk_download:
+                records = (data for _, data in self._iter_bulk(symbols))
+            elif self.max_workers > 1:
+                records = self._iter_concurrent(symbols)
+            else:
+                records = self._iter_sequential(symbols)
+            
+            for data in records:
+                all_data.append(data)
+                yield data
+        finally:
+            self._finish_collection(all_data)
+    
+    async def collect_async(self) -> List[Dict]:
+        """Collect latest data with many symbol fetches in flight on the event loop.
+        
+        yfinance is blocking, so each fetch runs on a thread pool driven by the
+        loop. Rate limiter tokens are awaited on the loop first; only the
+        requests themselves are bounded by ``performance.request_timeout``, and
+        a symbol that times out is skipped instead of holding up the cycle.
+        """
+        symbols = self.yahoo_config.stocks
+        self.logger.info(f"📥 Collecting data for {len(symbols)} stocks (async)...")
+        
+        if self.yahoo_config.bulk_download:
+            all_data = await asyncio.to_thread(self._collect_bulk, symbols)
+        else:
+            concurrency = max(1, self.config.performance.async_concurrency)
+            semaphore = asyncio.Semaphore(concurrency)
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='yahoo-async')
+            
             try:
-                data = self._fetch_stock_data(symbol)
-                if data:
-                    all_data.append(data)
+                results = await asyncio.gather(*(
+                    self._fetch_with_timeout(symbol, semaphore, executor) for symbol in symbols
+                ))
+            finally:
+                # Do not wait for abandoned (timed out) fetches
+                executor.shutdown(wait=False, cancel_futures=True)
+            
+            all_data = [data for data in results if data]
+        
+        await asyncio.to_thread(self._finish_collection, all_data)
+        return all_data
+    
+    async def _fetch_with_timeout(self, symbol: str, semaphore: asyncio.Semaphore,
+                                  executor: ThreadPoolExecutor) -> Optional[Dict]:
+        """Fetch one symbol on the executor, giving up after the request timeout."""
+        loop = asyncio.get_running_loop()
+        
+        async with semaphore:
+            try:
+                if self.cache is not None:
+                    cached = await loop.run_in_executor(executor, self._get_from_cache, symbol)
+                    if cached:
+                        self.logger.debug(f"   ↻ Using cached data for {symbol}")
+                        return cached
                 
-                # Rate limiting
-                if self.config.performance.rate_limit_delay > 0:
-                    time.sleep(self.config.performance.rate_limit_delay)
-                    
+                # Wait for the limiter outside the timeout so queueing is not counted as a slow request
+                tokens = 2 if self._needs_info(symbol) else 1
+                await self.rate_limiter.acquire_async(tokens)
+                
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, self._fetch_prepaid, symbol, tokens),
+                    timeout=self.request_timeout
+                )
+            except asyncio.TimeoutError:
+                self.logger.warning(f"   ⏱ Timed out fetching {symbol} after {self.request_timeout}s")
             except Exception as e:
                 self.logger.error(f"   ✗ Failed to fetch {symbol}: {e}")
         
+        return None
+    
+    def _fetch_prepaid(self, symbol: str, tokens: int) -> Optional[Dict]:
+        """Fetch a symbol whose first ``tokens`` limiter tokens the caller already acquired."""
+        self._prepaid.tokens = tokens
+        try:
+            return self._fetch_stock_data(symbol)
+        finally:
+            self._prepaid.tokens = 0
+    
+    def _acquire(self):
+        """Take a limiter token, unless one was acquired for this thread in advance."""
+        prepaid = getattr(self._prepaid, 'tokens', 0)
+        if prepaid:
+            self._prepaid.tokens = prepaid - 1
+        else:
+            self.rate_limiter.acquire()
+    
+    def _finish_collection(self, all_data: List[Dict]):
+        """Persist raw data and collector state at the end of a cycle."""
         # Save raw data
         self._save_raw_data(all_data)
         
+        if self.yahoo_config.incremental:
+            self._save_high_water_marks()
+        
+        if self._metadata_dirty:
+            self._save_metadata_cache()
+        
+        if self.disk_cache is not None:
+            self.disk_cache.flush()
+        
         self.logger.info(f"   ✓ Collected {len(all_data)} stocks successfully")
+    
+    def _collect_sequential(self, symbols: List[str]) -> List[Dict]:
+        """Collect symbols one ticker request at a time."""
+        return list(self._iter_sequential(symbols))
+    
+    def _iter_sequential(self, symbols: List[str]) -> Iterator[Dict]:
+        """Fetch symbols one at a time, yielding each record as it arrives."""
+        for symbol in symbols:
+            try:
+                data = self._fetch_stock_data(symbol)
+                if data:
+                    yield data
+            except Exception as e:
+                self.logger.error(f"   ✗ Failed to fetch {symbol}: {e}")
+    
+    def _collect_concurrent(self, symbols: List[str]) -> List[Dict]:
+        """Collect symbols on a bounded worker pool, paced by the shared rate limiter."""
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='yahoo') as executor:
+            futures = [executor.submit(self._fetch_stock_data, symbol) for symbol in symbols]
+        
+        # Gather in submission order so output matches the configured symbol order
+        all_data = []
+        for symbol, future in zip(symbols, futures):
+            try:
+                data = future.result()
+                if data:
+                    all_data.append(data)
+            except Exception as e:
+                self.logger.error(f"   ✗ Failed to fetch {symbol}: {e}")
+        
         return all_data
     
+    def _iter_concurrent(self, symbols: List[str]) -> Iterator[Dict]:
+        """Fetch symbols on the worker pool, yielding records in completion order."""
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='yahoo')
+        
+        try:
+            futures = {executor.submit(self._fetch_stock_data, symbol): symbol for symbol in symbols}
+            
+            for future in as_completed(futures):
+                try:
+                    data = future.result()
+                    if data:
+                        yield data
+                except Exception as e:
+                    self.logger.error(f"   ✗ Failed to fetch {futures[future]}: {e}")
+        finally:
+            # A closed stream should not keep fetching the remaining symbols
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _collect_bulk(self, symbols: List[str]) -> List[Dict]:
+        """Collect symbols through grouped multi-ticker download requests."""
+        results = dict(self._iter_bulk(symbols))
+        
+        # Preserve configured symbol order
+        return [results[symbol] for symbol in symbols if symbol in results]
+    
+    def _iter_bulk(self, symbols: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """Yield ``(symbol, record)`` pairs, cached ones first, then one download chunk at a time."""
+        pending = []
+        
+        # Serve what we can from cache
+        for symbol in symbols:
+            cached = self._get_from_cache(symbol) if self.cache is not None else None
+            if cached:
+                self.logger.debug(f"   ↻ Using cached data for {symbol}")
+                yield symbol, cached
+            else:
+                pending.append(symbol)
+        
+        chunk_size = max(1, self.yahoo_config.bulk_chunk_size)
+        
+        for i in range(0, len(pending), chunk_size):
+            chunk = pending[i:i + chunk_size]
+            frames = self._download_chunk(chunk)
+            built = []
+            
+            for symbol in chunk:
+                hist = frames.get(symbol)
+                if hist is None or hist.empty:
+                    self.logger.warning(f"   No data returned for {symbol}")
+                    continue
+                
+                try:
+                    if self.yahoo_config.bulk_metadata:
+                        info = self._get_info(symbol)
+                    else:
+                        info = self._get_info(symbol, allow_fetch=False)
+                    built.append((symbol, hist.index[-1], self._build_record(symbol, hist, info)))
+                except Exception as e:
+                    self.logger.error(f"   ✗ Failed to build record for {symbol}: {e}")
+            
+            # One vectorized validation pass per chunk
+            rejections = self.schema.validate_batch([data for _, _, data in built])
+            
+            for (symbol, bar_time, data), rejection in zip(built, rejections):
+                if rejection is not None:
+                    self._reject(symbol, rejection)
+                    continue
+                
+                self._mark_seen(symbol, bar_time)
+                
+                if self.cache is not None:
+                    self._add_to_cache(symbol, data)
+                yield symbol, data
+    
+    def _download_chunk(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Download history for several symbols in one request and split it per symbol."""
+        retries = 0
+        max_retries = self.yahoo_config.retry_limit
+        retry_delay = self.yahoo_config.retry_delay
+        
+        while retries <= max_retries:
+            try:
+                # yf.download issues one request per ticker, so charge one token each
+                self.rate_limiter.acquire(len(symbols))
+                frame = yf.download(
+                    tickers=symbols,
+                    interval=self.yahoo_config.interval,
+                    **self._history_window(symbols),
+                    group_by='ticker',
+                    auto_adjust=True,  # match Ticker.history; download() defaults to False
+                    threads=True,
+                    progress=False,
+                    timeout=self.request_timeout
+                )
+                return self._split_bulk_frame(frame, symbols)
+                
+            except Exception as e:
+                retries += 1
+                if retries <= max_retries:
+                    self.logger.warning(f"   Retry {retries}/{max_retries} for bulk request ({len(symbols)} symbols): {e}")
+                    time.sleep(retry_delay)
+                else:
+                    self.logger.error(f"   Bulk request for {len(symbols)} symbols failed after {max_retries} retries")
+        
+        return {}
+    
+    @staticmethod
+    def _split_bulk_frame(frame: Optional[pd.DataFrame], symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Split a multi-ticker download frame into one OHLCV frame per symbol."""
+        if frame is None or frame.empty:
+            return {}
+        
+        # Single ticker without a ticker column level
+        if not isinstance(frame.columns, pd.MultiIndex):
+            return {symbols[0]: frame.dropna(how='all')} if len(symbols) == 1 else {}
+        
+        # Ticker may sit on either column level depending on group_by / yfinance version
+        level = 0 if set(symbols) & set(frame.columns.get_level_values(0)) else 1
+        available = set(frame.columns.get_level_values(level))
+        
+        frames = {}
+        for symbol in symbols:
+            if symbol in available:
+                frames[symbol] = frame.xs(symbol, axis=1, level=level).dropna(how='all')
+        
+        return frames
+    
     def _fetch_stock_data(self, symbol: str) -> Optional[Dict]:
         """Fetch data for a single stock symbol."""
         # Check cache
@@ -70,7 +394,7 @@ class YahooFinanceCollector:
         self.logger.debug(f"   Fetching {symbol}...")
         
         retries = 0
-        max_retries = self.yahoo_config.max_retries
+        max_retries = self.yahoo_config.retry_limit
         retry_delay = self.yahoo_config.retry_delay
         
         while retries <= max_retries:
@@ -79,49 +403,27 @@ class YahooFinanceCollector:
                 ticker = yf.Ticker(symbol)
                 
                 # Get historical data
+                self._acquire()
                 hist = ticker.history(
-                    period=self.yahoo_config.period,
-                    interval=self.yahoo_config.interval
+                    interval=self.yahoo_config.interval,
+                    timeout=self.request_timeout,
+                    **self._history_window([symbol])
                 )
                 
                 if hist.empty:
                     self.logger.warning(f"   No data returned for {symbol}")
                     return None
                 
-                # Get latest data point
-                latest = hist.iloc[-1]
-                timestamp = hist.index[-1]
-                
-                # Get additional info
-                info = ticker.info
+                # Get additional info (cached separately with a long TTL)
+                info = self._get_info(symbol)
                 
-                # Build data structure
-                data = {
-                    'source': 'yahoo_finance',
-                    'symbol': symbol,
-                    'timestamp': timestamp.isoformat(),
-                    'collected_at': datetime.now().isoformat(),
-                    'prices': {
-                        'open': float(latest['Open']),
-                        'high': float(latest['High']),
-                        'low': float(latest['Low']),
-                        'close': float(latest['Close']),
-                        'volume': int(latest['Volume'])
-                    },
-                    'metadata': {
-                        'company_name': info.get('longName', symbol),
-                        'sector': info.get('sector', 'Unknown'),
-                        'industry': info.get('industry', 'Unknown'),
-                        'market_cap': info.get('marketCap', 0),
-                        'currency': info.get('currency', 'USD')
-                    },
-                    'stats': {
-                        'week_high_52': info.get('fiftyTwoWeekHigh', 0),
-                        'week_low_52': info.get('fiftyTwoWeekLow', 0),
-                        'avg_volume': info.get('averageVolume', 0),
-                        'pe_ratio': info.get('trailingPE', 0)
-                    }
-                }
+                # Build data structure from the latest data point
+                data = self._build_record(symbol, hist, info)
+                rejection = self.schema.validate(data)
+                if rejection is not None:
+                    self._reject(symbol, rejection)
+                    return None
+                self._mark_seen(symbol, hist.index[-1])
                 
                 # Add to cache
                 if self.cache is not None:
@@ -140,6 +442,179 @@ class YahooFinanceCollector:
         
         return None
     
+    def _history_window(self, symbols: List[str]) -> Dict:
+        """Build the history request window for a set of symbols.
+        
+        Full mode asks for the configured period. Incremental mode starts at
+        the oldest last-seen bar of the group so only a few new rows transfer.
+        """
+        if not self.yahoo_config.incremental:
+            return {'period': self.yahoo_config.period}
+        
+        with self._high_water_lock:
+            marks = [self.high_water_marks.get(symbol) for symbol in symbols]
+        
+        if not marks or None in marks:
+            return {'period': self.yahoo_config.incremental_period}
+        
+        start = min(pd.Timestamp(mark) for mark in marks)
+        return {'start': start.strftime('%Y-%m-%d')}
+    
+    def _mark_seen(self, symbol: str, timestamp: pd.Timestamp):
+        """Advance the high-water mark for a symbol."""
+        if not self.yahoo_config.incremental:
+            return
+        
+        with self._high_water_lock:
+            current = self.high_water_marks.get(symbol)
+            if current is None or pd.Timestamp(current) < timestamp:
+                self.high_water_marks[symbol] = timestamp.isoformat()
+    
+    def _load_high_water_marks(self) -> Dict[str, str]:
+        """Load persisted high-water marks."""
+        if not self.high_water_file.exists():
+            return {}
+        
+        try:
+            with open(self.high_water_file) as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"   Ignoring unreadable high-water marks: {e}")
+            return {}
+    
+    def _save_high_water_marks(self):
+        """Persist high-water marks atomically."""
+        with self._high_water_lock:
+            marks = dict(self.high_water_marks)
+        
+        tmp_file = self.high_water_file.with_suffix('.tmp')
+        
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(marks, f)
+            os.replace(tmp_file, self.high_water_file)
+            
+        except Exception as e:
+            self.logger.error(f"   Failed to save high-water marks: {e}")
+    
+    def _needs_info(self, symbol: str) -> bool:
+        """Whether fetching the symbol also has to refresh its metadata."""
+        with self._metadata_lock:
+            entry = self.metadata_cache.get(symbol)
+        return not entry or time.time() - entry['fetched_at'] >= self.yahoo_config.metadata_ttl
+    
+    def _get_info(self, symbol: str, allow_fetch: bool = True) -> Dict:
+        """Get ticker metadata from the metadata cache, fetching it when stale."""
+        with self._metadata_lock:
+            entry = self.metadata_cache.get(symbol)
+        
+        if entry and time.time() - entry['fetched_at'] < self.yahoo_config.metadata_ttl:
+            return entry['info']
+        
+        if not allow_fetch:
+            return entry['info'] if entry else {}
+        
+        try:
+            return self._refresh_info(symbol)
+        except Exception as e:
+            # Metadata is informational; fall back to stale values rather than failing the bar
+            self.logger.warning(f"   Failed to fetch metadata for {symbol}: {e}")
+            return entry['info'] if entry else {}
+    
+    def _refresh_info(self, symbol: str) -> Dict:
+        """Fetch ticker metadata and store it in the metadata cache."""
+        raw_info = self._fetch_info(symbol)
+        info = {key: raw_info[key] for key in METADATA_FIELDS if key in raw_info}
+        
+        with self._metadata_lock:
+            self.metadata_cache[symbol] = {'info': info, 'fetched_at': time.time()}
+            self._metadata_dirty = True
+        
+        return info
+    
+    def _fetch_info(self, symbol: str) -> Dict:
+        """Fetch ticker metadata (a separate request from price history)."""
+        self._acquire()
+        return yf.Ticker(symbol).info or {}
+    
+    def refresh_metadata(self, symbols: Optional[List[str]] = None) -> int:
+        """Refresh cached metadata for all (or the given) symbols."""
+        symbols = symbols or self.yahoo_config.stocks
+        self.logger.info(f"🏷️  Refreshing metadata for {len(symbols)} symbols...")
+        
+        refreshed = 0
+        for symbol in symbols:
+            try:
+                self._refresh_info(symbol)
+                refreshed += 1
+            except Exception as e:
+                self.logger.warning(f"   ✗ Metadata refresh failed for {symbol}: {e}")
+        
+        self._save_metadata_cache()
+        
+        self.logger.info(f"   ✓ Refreshed metadata for {refreshed}/{len(symbols)} symbols")
+        return refreshed
+    
+    def _load_metadata_cache(self) -> Dict[str, Dict]:
+        """Load persisted metadata cache."""
+        if not self.metadata_file.exists():
+            return {}
+        
+        try:
+            with open(self.metadata_file) as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"   Ignoring unreadable metadata cache: {e}")
+            return {}
+    
+    def _save_metadata_cache(self):
+        """Persist metadata cache atomically."""
+        with self._metadata_lock:
+            cache = dict(self.metadata_cache)
+            self._metadata_dirty = False
+        
+        tmp_file = self.metadata_file.with_suffix('.tmp')
+        
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_file, self.metadata_file)
+            
+        except Exception as e:
+            self.logger.error(f"   Failed to save metadata cache: {e}")
+    
+    def _build_record(self, symbol: str, hist: pd.DataFrame, info: Dict) -> Dict:
+        """Build a raw record from the latest bar of a history frame."""
+        latest = hist.iloc[-1]
+        timestamp = hist.index[-1]
+        
+        return {
+            'source': 'yahoo_finance',
+            'symbol': symbol,
+            'timestamp': timestamp.isoformat(),
+            'collected_at': datetime.now().isoformat(),
+            'prices': {
+                'open': float(latest['Open']),
+                'high': float(latest['High']),
+                'low': float(latest['Low']),
+                'close': float(latest['Close']),
+                'volume': int(latest['Volume'])
+            },
+            'metadata': {
+                'company_name': info.get('longName', symbol),
+                'sector': info.get('sector', 'Unknown'),
+                'industry': info.get('industry', 'Unknown'),
+                'market_cap': info.get('marketCap', 0),
+                'currency': info.get('currency', 'USD')
+            },
+            'stats': {
+                'week_high_52': info.get('fiftyTwoWeekHigh', 0),
+                'week_low_52': info.get('fiftyTwoWeekLow', 0),
+                'avg_volume': info.get('averageVolume', 0),
+                'pe_ratio': info.get('trailingPE', 0)
+            }
+        }
+    
     def fetch_historical_data(self, symbol: str, days: int = 365) -> Optional[pd.DataFrame]:
         """Fetch historical data for analysis."""
         self.logger.info(f"📊 Fetching {days} days of historical data for {symbol}...")
@@ -152,10 +627,12 @@ class YahooFinanceCollector:
             start_date = end_date - timedelta(days=days)
             
             # Fetch historical data
+            self.rate_limiter.acquire()
             hist = ticker.history(
                 start=start_date.strftime('%Y-%m-%d'),
                 end=end_date.strftime('%Y-%m-%d'),
-                interval='1d'
+                interval='1d',
+                timeout=self.request_timeout
             )
             
             if hist.empty:
@@ -169,23 +646,45 @@ class YahooFinanceCollector:
             self.logger.error(f"   Failed to fetch historical data: {e}")
             return None
     
+    def _cache_key(self, symbol: str) -> str:
+        """Build the disk cache key for a symbol."""
+        return DiskCache.make_key(symbol, self.yahoo_config.interval, self.yahoo_config.period)
+    
+    def fetch_history_range(self, symbol: str, start: str, end: str, interval: str = '1d') -> pd.DataFrame:
+        """Fetch bars for ``[start, end)`` (YYYY-MM-DD); raises on request failure."""
+        self.rate_limiter.acquire()
+        return yf.Ticker(symbol).history(
+            start=start,
+            end=end,
+            interval=interval,
+            timeout=self.request_timeout,
+            raise_errors=True
+        )
+    
     def _get_from_cache(self, symbol: str) -> Optional[Dict]:
         """Get data from cache if not expired."""
-        if symbol in self.cache:
-            cached_data, cached_time = self.cache[symbol]
-            
-            # Check if cache is still valid
-            if (datetime.now() - cached_time).total_seconds() < self.cache_ttl:
+        cached_data = self.cache.get(symbol)
+        if cached_data is not None:
+            return cached_data
+        
+        # Fall back to the persistent tier and promote hits to memory
+        if self.disk_cache is not None:
+            cached_data = self.disk_cache.get(self._cache_key(symbol))
+            if cached_data is not None:
+                self.cache.set(symbol, cached_data)
                 return cached_data
-            else:
-                # Cache expired
-                del self.cache[symbol]
         
         return None
     
     def _add_to_cache(self, symbol: str, data: Dict):
         """Add data to cache."""
-        self.cache[symbol] = (data, datetime.now())
+        self.cache.set(symbol, data)
+        
+        if self.disk_cache is not None:
+            try:
+                self.disk_cache.set(self._cache_key(symbol), data)
+            except Exception as e:
+                self.logger.warning(f"   Failed to write disk cache for {symbol}: {e}")
     
     def _save_raw_data(self, data: List[Dict]):
         """Save raw data to disk."""
@@ -206,42 +705,24 @@ class YahooFinanceCollector:
     
     def validate_data(self, data: Dict) -> bool:
         """Validate data completeness and quality."""
-        required_fields = ['symbol', 'timestamp', 'prices']
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in data:
-                self.logger.warning(f"   Missing required field: {field}")
-                return False
-        
-        # Check prices
-        prices = data['prices']
-        required_prices = ['open', 'high', 'low', 'close', 'volume']
-        
-        for price_field in required_prices:
-            if price_field not in prices:
-                self.logger.warning(f"   Missing price field: {price_field}")
-                return False
-            
-            # Check for valid values
-            value = prices[price_field]
-            if price_field == 'volume':
-                if not isinstance(value, int) or value < 0:
-                    self.logger.warning(f"   Invalid volume: {value}")
-                    return False
-            else:
-                if not isinstance(value, (int, float)) or value <= 0:
-                    self.logger.warning(f"   Invalid price {price_field}: {value}")
-                    return False
-        
-        # Check OHLC logic
-        if not (prices['low'] <= prices['open'] <= prices['high'] and
-                prices['low'] <= prices['close'] <= prices['high']):
-            self.logger.warning("   Invalid OHLC relationship")
+        rejection = self.schema.validate(data)
+        if rejection is not None:
+            self._reject(data.get('symbol'), rejection)
             return False
-        
         return True
     
+    def _reject(self, symbol: Optional[str], rejection: Rejection):
+        """Count and log a record that failed validation."""
+        self.rejections.record(rejection)
+        self.logger.warning(f"   Rejected {symbol}: {rejection}")
+    
+    def close(self):
+        """Release background resources and flush persistent state."""
+        if self.cache is not None:
+            self.cache.close()
+        if self.disk_cache is not None:
+            self.disk_cache.flush()
+    
     def get_stats(self) -> Dict:
         """Get collector statistics."""
         return {
@@ -249,5 +730,10 @@ class YahooFinanceCollector:
             'symbols': self.yahoo_config.stocks,
             'symbol_count': len(self.yahoo_config.stocks),
             'cache_enabled': self.cache is not None,
-            'cached_items': len(self.cache) if self.cache else 0
+            'cached_items': len(self.cache) if self.cache else 0,
+            'cache': self.cache.get_stats() if self.cache is not None else None,
+            'cached_metadata': len(self.metadata_cache),
+            'disk_cache': self.disk_cache.get_stats() if self.disk_cache is not None else None,
+            'rate_limiter': self.rate_limiter.get_stats(),
+            'rejections': self.rejections.as_dict()
         }
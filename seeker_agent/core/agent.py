@@ -1,7 +1,9 @@
 """Main Seeker Agent class."""
 
+import asyncio
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -11,10 +13,14 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 
 from core.config import Config
+from core.pipeline import StreamingPipeline
 from collectors.yahoo_finance import YahooFinanceCollector
+from collectors.backfill import HistoricalBackfill
 from processors.data_processor import DataProcessor
+from storage.upload_queue import UploadQueue
 from uploaders.blockchain_uploader import BlockchainUploader
 from utils.metrics import MetricsTracker
+from utils.rate_limiter import RateLimiter
 
 
 class SeekerAgent:
@@ -30,13 +36,39 @@ class SeekerAgent:
         # Initialize components
         self.logger.info("Initializing Seeker Agent components...")
         
+        # One limiter shared by all collectors so parallel workers respect the same budget
+        self.rate_limiter = RateLimiter(
+            config.performance.rate_limit_delay,
+            config.performance.rate_limit_burst
+        )
+        
         self.collectors = {}
         if config.data_sources.yahoo_finance.enabled:
-            self.collectors['yahoo_finance'] = YahooFinanceCollector(config)
+            self.collectors['yahoo_finance'] = YahooFinanceCollector(config, self.rate_limiter)
+        
+        # Rolling features warm up from the collector when no bars are stored yet
+        history_provider = None
+        if 'yahoo_finance' in self.collectors:
+            history_provider = self.collectors['yahoo_finance'].fetch_historical_data
+        self.processor = DataProcessor(config, history_provider)
+        
+        # Historical backfill uses the Yahoo collector for its (rate limited) requests
+        # and writes through the processor's bar store
+        if 'yahoo_finance' in self.collectors:
+            self.backfill = HistoricalBackfill(
+                config, self.collectors['yahoo_finance'], store=self.processor.bar_store
+            )
+        else:
+            self.backfill = None
         
-        self.processor = DataProcessor(config)
         self.uploader = BlockchainUploader(config)
         
+        # Records are journaled here before upload so a crash does not lose them
+        self.upload_queue = UploadQueue(
+            Path(config.storage.processed_data_dir) / 'uploads' / 'queue.db',
+            max_attempts=config.blockchain.upload_config.get('max_attempts', 0)
+        )
+        
         if config.features.metrics_enabled:
             self.metrics = MetricsTracker()
         else:
@@ -46,6 +78,46 @@ class SeekerAgent:
     
     def run_once(self):
         """Execute one complete cycle."""
+        if self.config.performance.streaming:
+            self.run_once_streaming()
+        elif self.config.performance.async_collection:
+            asyncio.run(self.run_once_async())
+        else:
+            self._run_cycle(self._collect_data)
+    
+    async def run_once_async(self):
+        """Execute one cycle with collection driven by the running event loop."""
+        loop = asyncio.get_running_loop()
+        
+        def collect() -> list:
+            return asyncio.run_coroutine_threadsafe(self._collect_data_async(), loop).result()
+        
+        # Processing and upload are blocking; keep them off the loop
+        await asyncio.to_thread(self._run_cycle, collect)
+    
+    async def run_async(self):
+        """Run the scheduled jobs from an event loop until stopped or cancelled.
+        
+        Jobs follow ``scheduling.mode`` exactly as with ``start()``, including
+        ``historical_sync``; each stock update collects on its own event loop
+        in the scheduler's worker thread (``performance.async_collection``).
+        """
+        if not self._schedule_jobs():
+            return
+        
+        self.logger.info("✅ Scheduler started from the event loop. Press Ctrl+C to stop.")
+        
+        try:
+            while self.running:
+                await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            self.logger.info("Async loop cancelled")
+            raise
+        finally:
+            self.stop()
+    
+    def _run_cycle(self, collect):
+        """Run collect → process → upload once, using ``collect`` for step 1."""
         self.logger.info("=" * 80)
         self.logger.info(f"⏰ Starting collection cycle at {datetime.now()}")
         self.logger.info("=" * 80)
@@ -55,7 +127,7 @@ class SeekerAgent:
         try:
             # 1. Collect data
             self.logger.info("📥 Step 1/3: Collecting data from sources...")
-            raw_data = self._collect_data()
+            raw_data = collect()
             self.logger.info(f"   Collected {len(raw_data)} raw data points")
             
             # 2. Process data
@@ -72,6 +144,11 @@ class SeekerAgent:
             elapsed = time.time() - start_time
             if self.metrics:
                 self.metrics.record_cycle(len(raw_data), len(processed_data), uploaded_count, elapsed)
+                self.metrics.record_component('rate_limiter', self.rate_limiter.get_stats())
+                for name, collector in self.collectors.items():
+                    self.metrics.record_component(name, collector.get_stats())
+                self.metrics.record_component('processor', self.processor.get_stats())
+                self.metrics.record_component('uploader', self.uploader.get_upload_stats())
             
             self.logger.info("=" * 80)
             self.logger.info(f"✅ Cycle complete in {elapsed:.2f}s")
@@ -83,52 +160,210 @@ class SeekerAgent:
             if self.metrics:
                 self.metrics.record_error(str(e))
     
+    def run_once_streaming(self):
+        """Execute one cycle with records streamed through bounded queues.
+        
+        Uploads start as soon as the first batch is processed, while later
+        symbols are still being fetched.
+        """
+        self.logger.info("=" * 80)
+        self.logger.info(f"⏰ Starting streaming cycle at {datetime.now()}")
+        self.logger.info("=" * 80)
+        
+        pipeline = StreamingPipeline(
+            self.collectors,
+            self.processor,
+            self._upload_stream,
+            queue_size=self.config.performance.stream_queue_size,
+            batch_size=self.config.blockchain.upload_config['batch_size'],
+            journal=self._journal
+        )
+        
+        try:
+            stats = pipeline.run()
+            
+            if self.metrics:
+                self.metrics.record_cycle(stats['collected'], stats['processed'], stats['uploaded'], stats['elapsed'])
+                self.metrics.record_component('pipeline', stats)
+                self.metrics.record_component('rate_limiter', self.rate_limiter.get_stats())
+                for name, collector in self.collectors.items():
+                    self.metrics.record_component(name, collector.get_stats())
+                self.metrics.record_component('processor', self.processor.get_stats())
+                self.metrics.record_component('uploader', self.uploader.get_upload_stats())
+            
+            self.logger.info("=" * 80)
+            self.logger.info(f"✅ Cycle complete in {stats['elapsed']:.2f}s "
+                             f"(first record ready after {stats['first_record_latency']}s)")
+            self.logger.info(f"   Collection: {stats['collected']} → Processing: {stats['processed']} → Upload: {stats['uploaded']}")
+            self.logger.info("=" * 80)
+            
+        except Exception as e:
+            self.logger.error(f"❌ Cycle failed: {e}", exc_info=True)
+            if self.metrics:
+                self.metrics.record_error(str(e))
+    
     def _collect_data(self) -> list:
         """Collect data from all enabled sources."""
         all_data = []
+        max_workers = min(self.config.performance.max_workers, len(self.collectors))
         
-        for name, collector in self.collectors.items():
-            try:
-                self.logger.info(f"   Collecting from {name}...")
-                data = collector.collect()
-                all_data.extend(data)
-                self.logger.info(f"   ✓ {name}: {len(data)} records")
-            except Exception as e:
-                self.logger.error(f"   ✗ {name} failed: {e}")
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='collector') as executor:
+                futures = {
+                    name: executor.submit(self._run_collector, name, collector)
+                    for name, collector in self.collectors.items()
+                }
+            results = [future.result() for future in futures.values()]
+        else:
+            results = [self._run_collector(name, collector) for name, collector in self.collectors.items()]
+        
+        for data in results:
+            all_data.extend(data)
         
         return all_data
     
-    def _process_data(self, raw_data: list) -> list:
-        """Process and validate raw data."""
-        processed = []
+    async def _collect_data_async(self) -> list:
+        """Collect data from all enabled sources concurrently on the event loop."""
+        results = await asyncio.gather(*(
+            self._run_collector_async(name, collector)
+            for name, collector in self.collectors.items()
+        ))
         
-        for item in raw_data:
-            try:
-                processed_item = self.processor.process(item)
-                if processed_item:
-                    processed.append(processed_item)
-            except Exception as e:
-                self.logger.warning(f"   Failed to process item: {e}")
+        all_data = []
+        for data in results:
+            all_data.extend(data)
         
-        return processed
+        return all_data
+    
+    async def _run_collector_async(self, name: str, collector) -> list:
+        """Run a single collector on the loop, isolating its failures from the others."""
+        try:
+            self.logger.info(f"   Collecting from {name}...")
+            if hasattr(collector, 'collect_async'):
+                data = await collector.collect_async()
+            else:
+                data = await asyncio.to_thread(collector.collect)
+            self.logger.info(f"   ✓ {name}: {len(data)} records")
+            return data
+        except Exception as e:
+            self.logger.error(f"   ✗ {name} failed: {e}")
+            return []
+    
+    def _run_collector(self, name: str, collector) -> list:
+        """Run a single collector, isolating its failures from the others."""
+        try:
+            self.logger.info(f"   Collecting from {name}...")
+            data = collector.collect()
+            self.logger.info(f"   ✓ {name}: {len(data)} records")
+            return data
+        except Exception as e:
+            self.logger.error(f"   ✗ {name} failed: {e}")
+            return []
+    
+    def _process_data(self, raw_data: list) -> list:
+        """Process and validate raw data; bars are indexed once ``_upload_data`` journaled them."""
+        try:
+            return self.processor.process_batch(raw_data, commit=False)
+        except Exception as e:
+            self.logger.warning(f"   Failed to process batch: {e}")
+            return []
     
     def _upload_data(self, processed_data: list) -> int:
         """Upload processed data to blockchain."""
         if self.config.features.dry_run:
             self.logger.warning("   🔴 DRY RUN - Skipping blockchain upload")
+            self.processor.commit(processed_data)
             return len(processed_data)
         
         uploaded = 0
         
         try:
-            uploaded = self.uploader.upload_batch(processed_data)
+            self.upload_queue.enqueue(processed_data)
+            self.processor.commit(processed_data)
+            uploaded = self.uploader.upload_queued(self.upload_queue)
         except Exception as e:
             self.logger.error(f"   Upload failed: {e}")
         
         return uploaded
     
+    def _journal(self, processed: list) -> list:
+        """Journal a processed micro-batch and return its queue entries."""
+        if self.config.features.dry_run:
+            return processed
+        return list(zip(self.upload_queue.enqueue(processed), processed))
+    
+    def _upload_stream(self, entries) -> int:
+        """Upload a stream of journaled records as batches fill up."""
+        if self.config.features.dry_run:
+            self.logger.warning("   🔴 DRY RUN - Skipping blockchain upload")
+            return sum(1 for _ in entries)
+        
+        try:
+            return self.uploader.upload_queued(self.upload_queue, entries)
+        except Exception as e:
+            self.logger.error(f"   Upload failed: {e}")
+            return 0
+    
+    def _replay_upload_queue(self):
+        """Upload records left queued by a previous run."""
+        self.logger.info(f"♻️  Replaying {len(self.upload_queue)} queued records")
+        try:
+            uploaded = self.uploader.upload_queued(self.upload_queue)
+            self.logger.info(f"   Replayed {uploaded} records")
+        except Exception as e:
+            self.logger.error(f"   Upload queue replay failed: {e}")
+    
+    def run_historical_sync(self):
+        """Execute the slow-moving sync job (metadata refresh and recent history)."""
+        self.logger.info(f"🗂️  Starting historical sync at {datetime.now()}")
+        
+        for name, collector in self.collectors.items():
+            if not hasattr(collector, 'refresh_metadata'):
+                continue
+            
+            try:
+                collector.refresh_metadata()
+            except Exception as e:
+                self.logger.error(f"   ✗ {name} metadata refresh failed: {e}")
+                if self.metrics:
+                    self.metrics.record_error(str(e))
+        
+        self.run_backfill(days=self.config.backfill.sync_days)
+    
+    def run_backfill(self, days: Optional[int] = None, symbols: Optional[list] = None,
+                     resume: bool = True) -> Optional[dict]:
+        """Backfill historical bars into the local historical store."""
+        if self.backfill is None:
+            self.logger.warning("No collector available for backfill")
+            return None
+        
+        try:
+            summary = self.backfill.run(symbols=symbols, days=days, resume=resume)
+            if self.metrics:
+                self.metrics.record_component('backfill', summary)
+            return summary
+        except Exception as e:
+            self.logger.error(f"   ✗ Backfill failed: {e}", exc_info=True)
+            if self.metrics:
+                self.metrics.record_error(str(e))
+            return None
+    
     def start(self):
         """Start the agent with scheduling."""
+        if not self._schedule_jobs():
+            return
+        
+        self.logger.info("✅ Scheduler started. Press Ctrl+C to stop.")
+        
+        # Keep running
+        try:
+            while self.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stop()
+    
+    def _schedule_jobs(self) -> bool:
+        """Add the jobs of the configured scheduling mode and start the scheduler."""
         self.logger.info("Starting Seeker Agent scheduler...")
         
         # Add jobs based on scheduling mode
@@ -138,20 +373,16 @@ class SeekerAgent:
             self._setup_cron_jobs()
         else:
             self.logger.error(f"Unknown scheduling mode: {self.config.scheduling.mode}")
-            return
+            return False
+        
+        # Resume records a previous run left in the upload queue
+        if len(self.upload_queue) and not self.config.features.dry_run:
+            self.scheduler.add_job(self._replay_upload_queue, id='upload_replay', name='Upload Queue Replay')
         
         # Start scheduler
         self.scheduler.start()
         self.running = True
-        
-        self.logger.info("✅ Scheduler started. Press Ctrl+C to stop.")
-        
-        # Keep running
-        try:
-            while self.running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.stop()
+        return True
     
     def _setup_interval_jobs(self):
         """Setup interval-based jobs."""
@@ -166,6 +397,14 @@ class SeekerAgent:
             replace_existing=True
         )
         
+        self.scheduler.add_job(
+            self.run_historical_sync,
+            trigger=IntervalTrigger(seconds=historical_interval),
+            id='historical_sync',
+            name='Historical Sync',
+            replace_existing=True
+        )
+        
         self.logger.info(f"   ✓ Stock updates: every {stock_interval}s ({stock_interval // 60} minutes)")
         self.logger.info(f"   ✓ Historical sync: every {historical_interval}s ({historical_interval // 3600} hours)")
     
@@ -182,6 +421,14 @@ class SeekerAgent:
             replace_existing=True
         )
         
+        self.scheduler.add_job(
+            self.run_historical_sync,
+            trigger=CronTrigger.from_crontab(historical_cron),
+            id='historical_sync',
+            name='Historical Sync',
+            replace_existing=True
+        )
+        
         self.logger.info(f"   ✓ Stock updates: {stock_cron}")
         self.logger.info(f"   ✓ Historical sync: {historical_cron}")
     
@@ -193,6 +440,14 @@ class SeekerAgent:
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
         
+        for collector in self.collectors.values():
+            if hasattr(collector, 'close'):
+                collector.close()
+        
+        self.processor.close()
+        self.uploader.close()
+        self.upload_queue.close()
+        
         self.logger.info("✅ Agent stopped")
     
     def get_status(self) -> dict:
@@ -211,5 +466,6 @@ class SeekerAgent:
             'scheduler_running': self.scheduler.running,
             'collectors': list(self.collectors.keys()),
             'jobs': jobs,
+            'upload_queue': self.upload_queue.get_stats(),
             'config': self.config.to_dict()
         }
@@ -15,6 +15,17 @@ class YahooFinanceConfig:
     interval: str = "1d"
     retry_limit: int = 3
     retry_delay: int = 5
+    bulk_download: bool = False
+    bulk_chunk_size: int = 100
+    bulk_metadata: bool = False
+    incremental: bool = False
+    incremental_period: str = "5d"
+    metadata_ttl: int = 86400
+    
+    @property
+    def max_retries(self) -> int:
+        """Retries per request (alias of ``retry_limit``)."""
+        return self.retry_limit
 
 
 @dataclass
@@ -26,9 +37,13 @@ class DataSourcesConfig:
 @dataclass
 class NormalizationConfig:
     """Data normalization configuration."""
-    method: str = "minmax"
+    method: str = "minmax"  # minmax, zscore, robust
     scale_min: int = 0
     scale_max: int = 1000000
+    scope: str = "history"  # history, bar
+    window_days: int = 365
+    min_bars: int = 20
+    refresh_interval: int = 86400
 
 
 @dataclass
@@ -49,6 +64,22 @@ class OutlierDetectionConfig:
     enabled: bool = True
     method: str = "iqr"
     threshold: float = 3.0
+    scope: str = "history"  # history, bar
+    window: int = 250
+    min_samples: int = 30
+    warmup_days: int = 365
+
+
+@dataclass
+class RollingFeaturesConfig:
+    """Rolling-window feature configuration."""
+    enabled: bool = True
+    sma_windows: List[int] = field(default_factory=lambda: [20, 50])
+    ema_spans: List[int] = field(default_factory=lambda: [12, 26])
+    rsi_period: int = 14
+    volatility_window: int = 20
+    volume_window: int = 20
+    warmup_days: int = 120
 
 
 @dataclass
@@ -57,6 +88,7 @@ class DataProcessingConfig:
     normalization: NormalizationConfig = field(default_factory=NormalizationConfig)
     quality_scoring: QualityScoringConfig = field(default_factory=QualityScoringConfig)
     outlier_detection: OutlierDetectionConfig = field(default_factory=OutlierDetectionConfig)
+    rolling_features: RollingFeaturesConfig = field(default_factory=RollingFeaturesConfig)
 
 
 @dataclass
@@ -72,7 +104,15 @@ class BlockchainConfig:
         "batch_size": 10,
         "batch_delay": 5,
         "max_retries": 3,
-        "retry_delay": 10
+        "retry_delay": 10,
+        "max_in_flight": 4,
+        "max_backoff": 60,
+        "adaptive_batching": True,
+        "min_batch_size": 1,
+        "max_batch_size": 500,
+        "target_latency": 10,
+        "gas_per_record": 100,
+        "max_attempts": 10
     })
 
 
@@ -108,7 +148,45 @@ class StorageConfig:
     raw_data_dir: str = "data/raw"
     processed_data_dir: str = "data/processed"
     cache_dir: str = "data/cache"
+    historical_dir: str = "data/historical"
+    processed_format: str = "segments"  # segments, files
+    segment_max_bytes: int = 67108864
+    segment_max_age: int = 3600
+    flush_interval: float = 1.0
+    flush_max_records: int = 1000
+    retention_days: int = 30
+
+
+@dataclass
+class BackfillConfig:
+    """Historical backfill configuration."""
+    days: int = 3650
+    chunk_days: int = 365
+    interval: str = "1d"
+    max_workers: int = 8
+    sync_days: int = 7
+
+
+@dataclass
+class CacheConfig:
+    """Collector cache configuration."""
+    ttl: int = 300
+    memory_max_entries: int = 5000
+    memory_max_bytes: int = 67108864
+    sweep_interval: int = 60
+    disk_enabled: bool = True
+    disk_max_entries: int = 10000
+    disk_max_bytes: int = 104857600
+
+
+@dataclass
+class DedupConfig:
+    """Bar deduplication configuration."""
+    enabled: bool = True
     retention_days: int = 30
+    snapshot_interval: float = 5.0
+    bloom_bits: int = 0  # 0 disables the Bloom filter front
+    bloom_hashes: int = 4
 
 
 @dataclass
@@ -143,7 +221,13 @@ class PerformanceConfig:
     """Performance configuration."""
     max_workers: int = 4
     request_timeout: int = 30
+    processing_mode: str = "inline"  # inline, process
+    async_collection: bool = False
+    async_concurrency: int = 100
+    streaming: bool = False
+    stream_queue_size: int = 100
     rate_limit_delay: int = 1
+    rate_limit_burst: int = 1
     memory_limit_mb: int = 512
 
 
@@ -165,6 +249,9 @@ class Config:
     scheduling: SchedulingConfig = field(default_factory=SchedulingConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     storage: StorageConfig = field(default_factory=StorageConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    backfill: BackfillConfig = field(default_factory=BackfillConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
     notifications: NotificationsConfig = field(default_factory=NotificationsConfig)
     performance: PerformanceConfig = field(default_factory=PerformanceConfig)
     features: FeaturesConfig = field(default_factory=FeaturesConfig)
@@ -175,19 +262,28 @@ class Config:
         with open(path, 'r') as f:
             data = yaml.safe_load(f)
         
+        # ``max_retries`` is accepted as the older name of ``retry_limit``
+        yahoo_finance = dict(data.get('data_sources', {}).get('yahoo_finance', {}))
+        if 'max_retries' in yahoo_finance:
+            yahoo_finance.setdefault('retry_limit', yahoo_finance.pop('max_retries'))
+        
         return cls(
             data_sources=DataSourcesConfig(
-                yahoo_finance=YahooFinanceConfig(**data.get('data_sources', {}).get('yahoo_finance', {}))
+                yahoo_finance=YahooFinanceConfig(**yahoo_finance)
             ),
             data_processing=DataProcessingConfig(
                 normalization=NormalizationConfig(**data.get('data_processing', {}).get('normalization', {})),
                 quality_scoring=QualityScoringConfig(**data.get('data_processing', {}).get('quality_scoring', {})),
-                outlier_detection=OutlierDetectionConfig(**data.get('data_processing', {}).get('outlier_detection', {}))
+                outlier_detection=OutlierDetectionConfig(**data.get('data_processing', {}).get('outlier_detection', {})),
+                rolling_features=RollingFeaturesConfig(**data.get('data_processing', {}).get('rolling_features', {}))
             ),
             blockchain=BlockchainConfig(**data.get('blockchain', {})),
             scheduling=SchedulingConfig(**data.get('scheduling', {})),
             logging=LoggingConfig(**data.get('logging', {})),
             storage=StorageConfig(**data.get('storage', {})),
+            cache=CacheConfig(**data.get('cache', {})),
+            backfill=BackfillConfig(**data.get('backfill', {})),
+            dedup=DedupConfig(**data.get('dedup', {})),
             notifications=NotificationsConfig(
                 enabled=data.get('notifications', {}).get('enabled', False),
                 email=EmailConfig(**data.get('notifications', {}).get('email', {})),
@@ -0,0 +1,177 @@
+"""Streaming collect → process → upload pipeline."""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+class StreamingPipeline:
+    """Streams records from collectors through the processor into the uploader.
+    
+    Each collector feeds a bounded raw queue from its own thread, one thread
+    drains that queue in micro-batches through ``process_batch`` into a
+    bounded processed queue, and the caller's thread hands the processed
+    stream to ``upload``. A full queue blocks its producer, so a slow upload
+    throttles processing and collection instead of buffering the whole cycle.
+    
+    With ``journal``, each processed micro-batch is handed to it before it
+    is queued for upload, and the processor's dedup index is committed only
+    after that, so records waiting in the processed queue survive a crash.
+    ``upload`` then receives the items ``journal`` returns.
+    """
+    
+    def __init__(self, collectors: Dict, processor, upload: Callable[[Iterable], int],
+                 queue_size: int = 100, batch_size: int = 10, journal: Optional[Callable[[List[Dict]], List]] = None):
+        """Initialize pipeline."""
+        self.collectors = collectors
+        self.processor = processor
+        self.upload = upload
+        self.journal = journal
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.logger = logging.getLogger(__name__)
+        
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+    
+    def run(self) -> Dict:
+        """Run one cycle and return counts and timings."""
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        processed_queue = queue.Queue(maxsize=self.queue_size)
+        self._stop.clear()
+        self.stats = {'collected': 0, 'processed': 0, 'uploaded': 0, 'first_record_latency': None}
+        self._started = time.time()
+        
+        collectors = [
+            threading.Thread(target=self._collect, args=(name, collector, raw_queue),
+                             name=f'stream-{name}', daemon=True)
+            for name, collector in self.collectors.items()
+        ]
+        processor = threading.Thread(target=self._process, args=(raw_queue, processed_queue, len(collectors)),
+                                     name='stream-process', daemon=True)
+        
+        for thread in collectors + [processor]:
+            thread.start()
+        
+        try:
+            self.stats['uploaded'] = self.upload(self._drain(processed_queue))
+        finally:
+            # Unblock producers if the upload stage stopped early
+            self._stop.set()
+            for thread in collectors + [processor]:
+                thread.join()
+        
+        self.stats['elapsed'] = round(time.time() - self._started, 2)
+        return self.stats
+    
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Put with backpressure; gives up once the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _collect(self, name: str, collector, raw_queue: queue.Queue):
+        """Feed one collector's records into the raw queue."""
+        count = 0
+        
+        try:
+            self.logger.info(f"   Streaming from {name}...")
+            if hasattr(collector, 'iter_collect'):
+                records = collector.iter_collect()
+            else:
+                records = iter(collector.collect())
+            
+            try:
+                for record in records:
+                    if not self._put(raw_queue, record):
+                        break
+                    count += 1
+            finally:
+                if hasattr(records, 'close'):
+                    records.close()
+            
+            self.logger.info(f"   ✓ {name}: {count} records")
+        except Exception as e:
+            self.logger.error(f"   ✗ {name} failed: {e}")
+        finally:
+            with self._lock:
+                self.stats['collected'] += count
+            self._put(raw_queue, _DONE)
+    
+    def _process(self, raw_queue: queue.Queue, processed_queue: queue.Queue, producers: int):
+        """Process raw records in micro-batches until every collector is done."""
+        remaining = producers
+        
+        try:
+            while remaining and not self._stop.is_set():
+                batch, finished = self._next_batch(raw_queue)
+                remaining -= finished
+                
+                if not batch:
+                    continue
+                
+                try:
+                    if self.journal is None:
+                        results = self.processor.process_batch(batch)
+                    else:
+                        processed = self.processor.process_batch(batch, commit=False)
+                        results = self.journal(processed)
+                        self.processor.commit(processed)
+                except Exception as e:
+                    self.logger.warning(f"   Failed to process batch: {e}")
+                    continue
+                
+                for result in results:
+                    if not self._put(processed_queue, result):
+                        return
+                    self.stats['processed'] += 1
+        finally:
+            self._put(processed_queue, _DONE)
+    
+    def _next_batch(self, raw_queue: queue.Queue) -> Tuple[List[Dict], int]:
+        """Block for one item, then take whatever else is ready up to ``batch_size``."""
+        batch = []
+        finished = 0
+        
+        try:
+            item = raw_queue.get(timeout=0.1)
+        except queue.Empty:
+            return batch, finished
+        
+        while True:
+            if item is _DONE:
+                finished += 1
+            else:
+                batch.append(item)
+            
+            if len(batch) >= self.batch_size:
+                break
+            
+            try:
+                item = raw_queue.get_nowait()
+            except queue.Empty:
+                break
+        
+        return batch, finished
+    
+    def _drain(self, processed_queue: queue.Queue) -> Iterator[Dict]:
+        """Yield processed records until the processing stage is done."""
+        while True:
+            item = processed_queue.get()
+            if item is _DONE:
+                return
+            
+            if self.stats['first_record_latency'] is None:
+                self.stats['first_record_latency'] = round(time.time() - self._started, 2)
+            yield item
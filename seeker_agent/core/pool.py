@@ -0,0 +1,136 @@
+"""Sharded process pool for CPU-bound record processing."""
+
+import logging
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from core.config import Config
+
+
+# Processor owned by a worker process. Worker entry points live in ``core`` so
+# that unpickling them in a fresh interpreter imports ``core`` before
+# ``processors``, the same order the agent uses.
+_worker = None
+
+
+def _init_worker(config: Config):
+    """Build the worker's own processor (never pooled itself)."""
+    global _worker
+    from processors.data_processor import DataProcessor
+    
+    config.performance.processing_mode = 'inline'
+    # Duplicates are dropped by the parent before records are sharded
+    config.dedup.enabled = False
+    _worker = DataProcessor(config)
+
+
+def _process_shard(records: List[Dict]) -> List[Optional[Dict]]:
+    """Process one shard; results are aligned with ``records``."""
+    return _worker.process_aligned(records)
+
+
+def _worker_stats() -> Dict:
+    """Stats of the worker's processor."""
+    return _worker.get_stats()
+
+
+def _close_worker():
+    """Flush the worker's processor before shutdown."""
+    _worker.close()
+
+
+class ShardedProcessPool:
+    """Processes batches on worker processes with symbols pinned to workers.
+    
+    Each worker is a single-process executor holding its own
+    ``DataProcessor``. A symbol always hashes to the same worker, so its
+    rolling features, outlier statistics and scaling parameters stay in that
+    process and are never shipped between processes. Results are merged back
+    in input order.
+    """
+    
+    def __init__(self, config: Config, workers: int):
+        """Initialize pool; worker processes start on first use."""
+        self.config = config
+        self.workers = max(1, workers)
+        self.logger = logging.getLogger(__name__)
+        
+        # spawn: the parent runs writer/cache threads that must not be forked mid-operation
+        self._context = multiprocessing.get_context('spawn')
+        self.executors: List[Optional[ProcessPoolExecutor]] = [None] * self.workers
+        self.stats = {'batches': 0, 'records': 0, 'failed_shards': 0}
+    
+    def shard_of(self, symbol: str) -> int:
+        """Worker index of a symbol (stable across runs)."""
+        return zlib.crc32(symbol.encode()) % self.workers
+    
+    def _executor(self, shard: int) -> ProcessPoolExecutor:
+        """Executor of a shard, started (or restarted after a crash) on demand."""
+        if self.executors[shard] is None:
+            self.executors[shard] = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            )
+        return self.executors[shard]
+    
+    def process_batch(self, raw_data_list: List[Dict]) -> List[Dict]:
+        """Process records across the shards and return results in input order."""
+        shards: Dict[int, List[int]] = {}
+        for i, raw_data in enumerate(raw_data_list):
+            symbol = raw_data.get('symbol') if isinstance(raw_data, dict) else None
+            shards.setdefault(self.shard_of(str(symbol)), []).append(i)
+        
+        futures = {
+            shard: self._executor(shard).submit(_process_shard, [raw_data_list[i] for i in rows])
+            for shard, rows in shards.items()
+        }
+        
+        results: List[Optional[Dict]] = [None] * len(raw_data_list)
+        for shard, future in futures.items():
+            try:
+                for i, item in zip(shards[shard], future.result()):
+                    results[i] = item
+            except Exception as e:
+                self.stats['failed_shards'] += 1
+                self.logger.error(f"Processing shard {shard} failed: {e}")
+                self._discard(shard)
+        
+        self.stats['batches'] += 1
+        self.stats['records'] += len(raw_data_list)
+        return [item for item in results if item]
+    
+    def _discard(self, shard: int):
+        """Drop a (possibly broken) executor so the next batch starts a fresh worker."""
+        executor, self.executors[shard] = self.executors[shard], None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def close(self):
+        """Flush every worker's processor and stop the workers."""
+        for shard, executor in enumerate(self.executors):
+            if executor is None:
+                continue
+            
+            try:
+                executor.submit(_close_worker).result()
+            except Exception as e:
+                self.logger.error(f"Failed to close processing worker {shard}: {e}")
+            executor.shutdown(wait=True)
+            self.executors[shard] = None
+    
+    def get_stats(self) -> Dict:
+        """Get pool statistics, including each running worker's processor stats."""
+        workers = {}
+        for shard, executor in enumerate(self.executors):
+            if executor is None:
+                continue
+            try:
+                workers[shard] = executor.submit(_worker_stats).result(timeout=5)
+            except Exception as e:
+                workers[shard] = {'error': str(e)}
+        
+        return {**self.stats, 'workers': self.workers, 'worker_stats': workers}
@@ -7,6 +7,7 @@ Automated data collection and blockchain upload system for PROPHETIA oracle.
 
 import sys
 import signal
+import asyncio
 import logging
 from pathlib import Path
 from typing import Optional
@@ -45,7 +46,8 @@ def cli():
 @click.option('--config', '-c', default='config.yaml', help='Path to config file')
 @click.option('--dry-run', is_flag=True, help='Run without uploading to blockchain')
 @click.option('--once', is_flag=True, help='Run once and exit (no scheduling)')
-def start(config: str, dry_run: bool, once: bool):
+@click.option('--use-asyncio', is_flag=True, help='Drive collection from an asyncio event loop')
+def start(config: str, dry_run: bool, once: bool, use_asyncio: bool):
     """Start the Seeker Agent."""
     global agent
     
@@ -69,6 +71,9 @@ def start(config: str, dry_run: bool, once: bool):
             cfg.features.dry_run = True
             logger.warning("🔴 DRY RUN MODE - No blockchain uploads will occur")
         
+        if use_asyncio:
+            cfg.performance.async_collection = True
+        
         # Initialize agent
         agent = SeekerAgent(cfg)
         
@@ -80,7 +85,11 @@ def start(config: str, dry_run: bool, once: bool):
         if once:
             logger.info("Running in ONCE mode - will execute one cycle and exit")
             agent.run_once()
+            agent.stop()
             logger.info("✅ Single execution complete. Exiting.")
+        elif cfg.performance.async_collection:
+            logger.info("Starting in ASYNC mode - will run continuously")
+            asyncio.run(agent.run_async())
         else:
             logger.info("Starting in SCHEDULED mode - will run continuously")
             agent.start()
@@ -112,6 +121,7 @@ def test(config: str):
         
         logger.info("Testing data collection...")
         agent.run_once()
+        agent.stop()
         
         logger.info("✅ Test complete. Check logs for details.")
         
@@ -145,6 +155,41 @@ def validate(config: str):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--config', '-c', default='config.yaml', help='Path to config file')
+@click.option('--days', type=int, default=None, help='Days of history to backfill (default: backfill.days)')
+@click.option('--symbols', default=None, help='Comma-separated symbols (default: configured stocks)')
+@click.option('--no-resume', is_flag=True, help='Ignore checkpoints and refetch every chunk')
+def backfill(config: str, days: Optional[int], symbols: Optional[str], no_resume: bool):
+    """Backfill historical data into the local historical store."""
+    logger = setup_logger()
+    logger.info("=" * 80)
+    logger.info("PROPHETIA Seeker Agent - Historical Backfill")
+    logger.info("=" * 80)
+    
+    try:
+        config_path = Path(config)
+        if not config_path.exists():
+            logger.error(f"Config file not found: {config}")
+            sys.exit(1)
+        
+        cfg = Config.from_file(config_path)
+        agent = SeekerAgent(cfg)
+        
+        symbol_list = [s.strip() for s in symbols.split(',') if s.strip()] if symbols else None
+        summary = agent.run_backfill(days=days, symbols=symbol_list, resume=not no_resume)
+        
+        if summary is None or summary['chunks_failed']:
+            logger.warning("⚠️  Backfill incomplete - rerun to resume from the checkpoint")
+            sys.exit(1)
+        
+        logger.info("✅ Backfill complete.")
+        
+    except Exception as e:
+        logger.error(f"❌ Backfill failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
 @cli.command()
 def status():
     """Check agent status and recent activity."""
@@ -165,31 +210,46 @@ def status():
         logger.warning("No log file found.")
 
 
+def expired_record_files(cfg: Config, cutoff) -> list:
+    """Raw and processed record files last modified before ``cutoff``.
+    
+    Only collector output (``raw_*.json``) and processed records
+    (``processed_*.json`` files and finalized ``.jsonl`` segments) are
+    swept. The bar store, caches and backfill checkpoints, the upload
+    queue, ledger, nonce, dedup snapshots and Merkle trees are state the
+    agent still needs, however old.
+    """
+    from datetime import datetime
+    
+    candidates = list(Path(cfg.storage.raw_data_dir).rglob("raw_*.json"))
+    processed_dir = Path(cfg.storage.processed_data_dir)
+    candidates += list(processed_dir.glob("processed_*.json")) + list(processed_dir.glob("processed_*.jsonl"))
+    
+    return sorted(
+        path for path in candidates
+        if path.is_file() and datetime.fromtimestamp(path.stat().st_mtime) < cutoff
+    )
+
+
 @cli.command()
+@click.option('--config', '-c', default='config.yaml', help='Path to config file')
 @click.option('--days', default=30, help='Number of days to keep')
-def cleanup(days: int):
-    """Clean up old data files."""
-    logger = setup_logger()
-    logger.info(f"Cleaning up data older than {days} days...")
-    
+def cleanup(config: str, days: int):
+    """Clean up old raw and processed record files."""
     from datetime import datetime, timedelta
-    import shutil
     
-    cutoff = datetime.now() - timedelta(days=days)
-    data_dir = Path("data")
+    config_path = Path(config)
+    cfg = Config.from_file(config_path) if config_path.exists() else Config()
     
-    if not data_dir.exists():
-        logger.warning("Data directory not found.")
-        return
+    logger = setup_logger(cfg)
+    logger.info(f"Cleaning up data older than {days} days...")
+    cutoff = datetime.now() - timedelta(days=days)
     
     removed_count = 0
-    for item in data_dir.rglob("*"):
-        if item.is_file():
-            mtime = datetime.fromtimestamp(item.stat().st_mtime)
-            if mtime < cutoff:
-                logger.info(f"Removing: {item}")
-                item.unlink()
-                removed_count += 1
+    for item in expired_record_files(cfg, cutoff):
+        logger.info(f"Removing: {item}")
+        item.unlink()
+        removed_count += 1
     
     logger.info(f"✅ Removed {removed_count} old files.")
 
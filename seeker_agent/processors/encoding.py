@@ -0,0 +1,129 @@
+"""Fixed-point encoding of processed records for on-chain submission."""
+
+import json
+import logging
+import math
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+
+# Fixed-point scale of contracts/modules/math_utils.leo: 1.0 is 1,000,000
+SCALE = 1000000
+U64_MAX = 2 ** 64 - 1
+
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+
+class FixedPointError(ValueError):
+    """A value cannot be represented as a u64 fixed-point number."""
+
+
+def to_fixed(value, name: str = 'value', signed: bool = False) -> int:
+    """Convert a number to a fixed-point integer (rounded to the nearest unit).
+    
+    Unsigned values must be non-negative. Signed values may be negative; u64
+    cannot hold the sign, so callers store the magnitude and the sign apart.
+    """
+    value = float(value)
+    if not math.isfinite(value):
+        raise FixedPointError(f"{name} is not finite: {value}")
+    
+    fixed = round(value * SCALE)
+    if fixed < 0 and not signed:
+        raise FixedPointError(f"{name} underflows u64: {value}")
+    if abs(fixed) > U64_MAX:
+        raise FixedPointError(f"{name} overflows u64: {value}")
+    return fixed
+
+
+def to_u64(value, name: str = 'value') -> int:
+    """Check an integer quantity (volume, timestamp, scaled price) fits u64 unscaled."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise FixedPointError(f"{name} is not an integer: {value}")
+        value = int(value)
+    
+    if value < 0:
+        raise FixedPointError(f"{name} underflows u64: {value}")
+    if value > U64_MAX:
+        raise FixedPointError(f"{name} overflows u64: {value}")
+    return int(value)
+
+
+def from_fixed(value: int, negative: bool = False) -> float:
+    """Convert a fixed-point integer back to a float."""
+    return (-value if negative else value) / SCALE
+
+
+class FixedPointEncoder:
+    """Encodes processed records into the u64 fixed-point form used on-chain.
+    
+    ``encode()`` returns the canonical JSON (sorted keys, no whitespace) of
+    the record's integer representation:
+    
+    - ``prices``: min-max normalized prices as is (already integers on the
+      configured scale), other normalizations as fixed-point; ``volume`` unscaled
+    - ``quality_score`` in fixed-point (0 - 1,000,000), ``is_outlier`` as 0/1
+    - ``features`` in fixed-point; features still warming up are omitted
+    - ``timestamp`` in Unix seconds
+    - ``negative``: sorted names of fields whose magnitude is stored, since u64
+      has no sign (math_utils.leo leaves sign handling to the caller)
+    
+    The text is computed once per record and hashed and submitted verbatim.
+    """
+    
+    def __init__(self):
+        """Initialize encoder."""
+        self.logger = logging.getLogger(__name__)
+        self.stats = {'encoded': 0, 'rejected': 0}
+    
+    def encode(self, processed: Dict) -> str:
+        """Encode a processed record; raises ``FixedPointError`` if a value does not fit."""
+        negative: List[str] = []
+        
+        def signed(value, name):
+            fixed = to_fixed(value, name, signed=True)
+            if fixed < 0:
+                negative.append(name)
+            return abs(fixed)
+        
+        normalized = processed['normalized_prices']
+        method = normalized.get('_normalization', {}).get('method')
+        if method == 'minmax':
+            prices = {field: to_u64(normalized[field], f'prices.{field}') for field in PRICE_FIELDS}
+        else:
+            prices = {field: signed(normalized[field], f'prices.{field}') for field in PRICE_FIELDS}
+        prices['volume'] = to_u64(normalized['volume'], 'prices.volume')
+        
+        features = {
+            name: signed(value, f'features.{name}')
+            for name, value in processed['features'].items() if value is not None
+        }
+        
+        encoded = {
+            'symbol': processed['symbol'],
+            'source': processed['source'],
+            'timestamp': to_u64(int(pd.Timestamp(processed['timestamp']).timestamp()), 'timestamp'),
+            'prices': prices,
+            'quality_score': to_fixed(processed['quality_score'], 'quality_score'),
+            'is_outlier': int(bool(processed['is_outlier'])),
+            'features': features,
+            'negative': sorted(negative)
+        }
+        
+        self.stats['encoded'] += 1
+        return json.dumps(encoded, sort_keys=True, separators=(',', ':'))
+    
+    def try_encode(self, processed: Dict) -> Optional[str]:
+        """Encode a record, logging and returning None if it does not fit."""
+        try:
+            return self.encode(processed)
+        except (FixedPointError, KeyError, TypeError, ValueError) as e:
+            self.stats['rejected'] += 1
+            self.logger.warning(f"Cannot encode {processed.get('symbol')}: {e}")
+            return None
+    
+    def get_stats(self) -> Dict:
+        """Get encoder statistics."""
+        return dict(self.stats)
@@ -0,0 +1,256 @@
+"""Incremental rolling-window features."""
+
+import logging
+import math
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.config import RollingFeaturesConfig
+
+
+class RollingWindow:
+    """Fixed-size ring buffer with a running sum and sum of squares."""
+    
+    __slots__ = ('size', 'values', 'count', 'pos', 'total', 'total_sq')
+    
+    def __init__(self, size: int):
+        """Initialize window."""
+        self.size = max(1, size)
+        self.values = [0.0] * self.size
+        self.count = 0
+        self.pos = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+    
+    @property
+    def full(self) -> bool:
+        """Whether the window holds ``size`` values."""
+        return self.count == self.size
+    
+    def push(self, value: float):
+        """Add a value, evicting the oldest one once full."""
+        if self.full:
+            old = self.values[self.pos]
+            self.total -= old
+            self.total_sq -= old * old
+        else:
+            self.count += 1
+        
+        self.values[self.pos] = value
+        self.total += value
+        self.total_sq += value * value
+        self.pos = (self.pos + 1) % self.size
+        
+        # Resync once per wrap so running sums do not drift (amortized O(1))
+        if self.pos == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+    
+    def with_next(self, value: float) -> Tuple[float, float, int]:
+        """Sum, sum of squares and count the window would have after pushing ``value``."""
+        total = self.total + value
+        total_sq = self.total_sq + value * value
+        count = self.count
+        
+        if self.full:
+            old = self.values[self.pos]
+            total -= old
+            total_sq -= old * old
+        else:
+            count += 1
+        
+        return total, total_sq, count
+
+
+def _std(total: float, total_sq: float, count: int) -> Optional[float]:
+    """Sample standard deviation from running sums."""
+    if count < 2:
+        return None
+    variance = (total_sq - total * total / count) / (count - 1)
+    return math.sqrt(max(variance, 0.0))
+
+
+class SymbolFeatures:
+    """Rolling feature state of one symbol.
+    
+    Committed state covers every bar before the latest one. The latest bar is
+    kept pending because a live feed re-delivers it with updated values until
+    the next bar opens: a bar with the same timestamp replaces the pending
+    bar, a newer one commits it first. Features are previewed from the
+    committed state plus the pending bar, so every update is O(1).
+    """
+    
+    def __init__(self, config: RollingFeaturesConfig):
+        """Initialize state."""
+        self.config = config
+        self.sma = {window: RollingWindow(window) for window in config.sma_windows}
+        self.ema = {span: None for span in config.ema_spans}
+        self.returns = RollingWindow(config.volatility_window)
+        self.volumes = RollingWindow(config.volume_window)
+        
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi_changes = 0
+        
+        self.bars = 0
+        self.prev_close = None
+        self.pending = None
+    
+    def update(self, ts: int, close: float, volume: float) -> Optional[Dict]:
+        """Apply a bar and return its features, or None for a bar older than the latest."""
+        if self.pending is not None:
+            if ts < self.pending[0]:
+                return None
+            if ts > self.pending[0]:
+                self._commit(self.pending[1], self.pending[2])
+        
+        self.pending = (ts, close, volume)
+        return self._features(close, volume)
+    
+    def _rsi_step(self, gain: float, loss: float) -> Tuple[float, float]:
+        """Average gain/loss after one more change (simple mean while seeding, then Wilder)."""
+        period = self.config.rsi_period
+        n = self.rsi_changes
+        
+        if n < period:
+            return (self.avg_gain * n + gain) / (n + 1), (self.avg_loss * n + loss) / (n + 1)
+        
+        return (self.avg_gain * (period - 1) + gain) / period, (self.avg_loss * (period - 1) + loss) / period
+    
+    def _commit(self, close: float, volume: float):
+        """Fold a finished bar into the rolling state."""
+        for window in self.sma.values():
+            window.push(close)
+        
+        for span, ema in self.ema.items():
+            alpha = 2 / (span + 1)
+            self.ema[span] = close if ema is None else alpha * close + (1 - alpha) * ema
+        
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.avg_gain, self.avg_loss = self._rsi_step(max(change, 0.0), max(-change, 0.0))
+            self.rsi_changes += 1
+            
+            if self.prev_close > 0 and close > 0:
+                self.returns.push(math.log(close / self.prev_close))
+        
+        self.volumes.push(float(volume))
+        self.prev_close = close
+        self.bars += 1
+    
+    def _features(self, close: float, volume: float) -> Dict:
+        """Features of a bar on top of the committed state; None until a window is warm."""
+        features = {}
+        
+        for window_size, window in self.sma.items():
+            total, _, count = window.with_next(close)
+            features[f'sma_{window_size}'] = total / count if count == window_size else None
+        
+        for span, ema in self.ema.items():
+            alpha = 2 / (span + 1)
+            value = close if ema is None else alpha * close + (1 - alpha) * ema
+            features[f'ema_{span}'] = value if self.bars + 1 >= span else None
+        
+        period = self.config.rsi_period
+        rsi = None
+        if self.prev_close is not None and self.rsi_changes + 1 >= period:
+            change = close - self.prev_close
+            avg_gain, avg_loss = self._rsi_step(max(change, 0.0), max(-change, 0.0))
+            if avg_loss == 0:
+                rsi = 100.0 if avg_gain > 0 else 50.0
+            else:
+                rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+        features[f'rsi_{period}'] = rsi
+        
+        volatility = None
+        if self.prev_close is not None and self.prev_close > 0 and close > 0:
+            total, total_sq, count = self.returns.with_next(math.log(close / self.prev_close))
+            if count == self.returns.size:
+                volatility = _std(total, total_sq, count)
+        features[f'volatility_{self.config.volatility_window}'] = volatility
+        
+        # Compared against the previous bars only, so a volume spike is not diluted by itself
+        zscore = None
+        if self.volumes.full:
+            std = _std(self.volumes.total, self.volumes.total_sq, self.volumes.count)
+            mean = self.volumes.total / self.volumes.count
+            zscore = (float(volume) - mean) / std if std else 0.0
+        features[f'volume_zscore_{self.config.volume_window}'] = zscore
+        
+        return features
+
+
+class FeatureEngine:
+    """Keeps rolling feature state per symbol.
+    
+    A symbol's state is created on its first bar and warm-started from
+    ``history(symbol)``, a bar array (``storage.bar_store.BAR_DTYPE``) of
+    prior bars. After that each bar is a constant-time update.
+    """
+    
+    def __init__(self, config: RollingFeaturesConfig,
+                 history: Optional[Callable[[str], Optional[np.ndarray]]] = None):
+        """Initialize engine."""
+        self.config = config
+        self.history = history
+        self.logger = logging.getLogger(__name__)
+        
+        self.states: Dict[str, SymbolFeatures] = {}
+        self._lock = threading.Lock()
+        self.stats = {'updates': 0, 'stale': 0, 'warm_starts': 0, 'warm_bars': 0}
+    
+    def update(self, symbol: str, timestamp, close: float, volume: float) -> Dict:
+        """Apply a bar for ``symbol`` and return its rolling features."""
+        ts = pd.Timestamp(timestamp).value
+        
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                state = self._new_state(symbol, ts)
+            
+            features = state.update(ts, close, volume)
+            
+            if features is None:
+                self.stats['stale'] += 1
+                return {}
+            
+            self.stats['updates'] += 1
+            return features
+    
+    def _new_state(self, symbol: str, before_ts: int) -> SymbolFeatures:
+        """Create a symbol's state, replaying history older than ``before_ts``."""
+        state = SymbolFeatures(self.config)
+        
+        bars = None
+        if self.history is not None:
+            try:
+                bars = self.history(symbol)
+            except Exception as e:
+                self.logger.warning(f"Failed to load history for {symbol}: {e}")
+        
+        if bars is not None and len(bars):
+            bars = bars[bars['ts'] < before_ts]
+            for bar in bars:
+                state.update(int(bar['ts']), float(bar['close']), float(bar['volume']))
+            
+            self.stats['warm_starts'] += 1
+            self.stats['warm_bars'] += len(bars)
+            self.logger.debug(f"Warm-started {symbol} features from {len(bars)} bars")
+        
+        self.states[symbol] = state
+        return state
+    
+    def reset(self, symbol: Optional[str] = None):
+        """Drop state for one symbol, or all symbols."""
+        with self._lock:
+            if symbol is None:
+                self.states.clear()
+            else:
+                self.states.pop(symbol, None)
+    
+    def get_stats(self) -> Dict:
+        """Get engine statistics."""
+        return {**self.stats, 'symbols': len(self.states)}
@@ -0,0 +1,125 @@
+"""Per-symbol scaling parameters for history-aware normalization."""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.config import NormalizationConfig
+
+
+# "standard" is the historical name of the z-score method
+METHOD_ALIASES = {'standard': 'zscore'}
+METHODS = ('minmax', 'zscore', 'robust')
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+
+def fit_params(method: str, bars: np.ndarray) -> Dict:
+    """Fit scaling parameters of ``method`` on a bar array."""
+    if method == 'minmax':
+        return {'min_price': float(bars['low'].min()), 'max_price': float(bars['high'].max())}
+    
+    values = np.concatenate([bars[field] for field in PRICE_FIELDS])
+    
+    if method == 'zscore':
+        return {'mean': float(values.mean()), 'std': float(values.std())}
+    
+    if method == 'robust':
+        q1, median, q3 = np.percentile(values, [25, 50, 75])
+        return {'median': float(median), 'iqr': float(q3 - q1)}
+    
+    raise ValueError(f"Unknown normalization method: {method}")
+
+
+class ScalingCache:
+    """Caches per-symbol scaling parameters fitted on recent bars.
+    
+    Parameters are fitted on the symbol's last ``window_days`` of bars from
+    ``history(symbol)`` and refitted once they are ``refresh_interval``
+    seconds old. Symbols with fewer than ``min_bars`` bars get no parameters
+    (callers fall back to per-bar scaling) until the next refresh.
+    """
+    
+    def __init__(self, config: NormalizationConfig, history: Callable[[str], Optional[np.ndarray]]):
+        """Initialize cache."""
+        self.config = config
+        self.method = METHOD_ALIASES.get(config.method, config.method)
+        self.history = history
+        self.logger = logging.getLogger(__name__)
+        
+        if self.method not in METHODS:
+            self.logger.warning(f"Unknown normalization method {config.method!r}, using minmax")
+            self.method = 'minmax'
+        
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {'fits': 0, 'misses': 0, 'extended': 0}
+    
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Return the symbol's parameters, refitting them when missing or stale."""
+        with self._lock:
+            entry = self.entries.get(symbol)
+            if entry is None or time.time() - entry['fitted_at'] >= self.config.refresh_interval:
+                entry = self._fit(symbol)
+                self.entries[symbol] = entry
+            return entry['params']
+    
+    def observe(self, symbol: str, low: float, high: float) -> Optional[Dict]:
+        """Widen cached min-max parameters to cover a new bar and return them."""
+        with self._lock:
+            entry = self.entries.get(symbol)
+            if entry is None or entry['params'] is None or self.method != 'minmax':
+                return entry['params'] if entry else None
+            
+            params = entry['params']
+            if low < params['min_price'] or high > params['max_price']:
+                entry['params'] = params = {
+                    **params,
+                    'min_price': min(params['min_price'], low),
+                    'max_price': max(params['max_price'], high)
+                }
+                self.stats['extended'] += 1
+            return params
+    
+    def _fit(self, symbol: str) -> Dict:
+        """Fit parameters from history; a miss is cached until the next refresh too."""
+        now = time.time()
+        bars = None
+        
+        try:
+            bars = self.history(symbol)
+        except Exception as e:
+            self.logger.warning(f"Failed to load history for {symbol}: {e}")
+        
+        if bars is not None and len(bars):
+            cutoff = (pd.Timestamp.now(tz='UTC') - pd.Timedelta(days=self.config.window_days)).value
+            bars = bars[bars['ts'] >= cutoff]
+        
+        if bars is None or len(bars) < self.config.min_bars:
+            self.stats['misses'] += 1
+            return {'params': None, 'fitted_at': now}
+        
+        params = {
+            'method': self.method,
+            **fit_params(self.method, bars),
+            'bars': len(bars),
+            'fitted_at': pd.Timestamp(now, unit='s', tz='UTC').isoformat()
+        }
+        self.stats['fits'] += 1
+        self.logger.debug(f"Fitted {self.method} scaling for {symbol} on {len(bars)} bars")
+        return {'params': params, 'fitted_at': now}
+    
+    def invalidate(self, symbol: Optional[str] = None):
+        """Force a refit on next use for one symbol, or all symbols."""
+        with self._lock:
+            if symbol is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(symbol, None)
+    
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        return {**self.stats, 'symbols': len(self.entries), 'method': self.method}
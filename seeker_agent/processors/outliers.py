@@ -0,0 +1,248 @@
+"""Per-symbol streaming outlier detection."""
+
+import bisect
+import logging
+import math
+import threading
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.config import OutlierDetectionConfig
+
+
+class Welford:
+    """Running mean and variance in constant memory.
+    
+    Exact Welford updates until ``max_count`` observations; after that the
+    count stops growing, which turns the same update into an exponentially
+    weighted mean/variance with ``alpha = 1 / max_count`` so the statistics
+    track the recent regime.
+    """
+    
+    __slots__ = ('max_count', 'count', 'mean', 'var')
+    
+    def __init__(self, max_count: int):
+        """Initialize estimator."""
+        self.max_count = max(1, max_count)
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+    
+    def add(self, value: float):
+        """Add an observation."""
+        if self.count < self.max_count:
+            self.count += 1
+        
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.var += (delta * (value - self.mean) - self.var) / self.count
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(max(self.var, 0.0))
+
+
+class P2Quantile:
+    """Streaming quantile estimate with the P² algorithm (Jain & Chlamtac, 1985).
+    
+    Keeps five markers whose heights approximate the minimum, ``p/2``, ``p``,
+    ``(1+p)/2`` quantiles and the maximum, adjusted with piecewise-parabolic
+    interpolation on every observation.
+    """
+    
+    __slots__ = ('p', 'count', 'heights', 'positions', 'desired', 'increments')
+    
+    def __init__(self, p: float):
+        """Initialize estimator for quantile ``p``."""
+        self.p = p
+        self.count = 0
+        self.heights = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+    
+    def add(self, value: float):
+        """Add an observation."""
+        self.count += 1
+        
+        if self.count <= 5:
+            bisect.insort(self.heights, value)
+            return
+        
+        q, n = self.heights, self.positions
+        
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(q, value) - 1
+        
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic prediction of marker ``i`` moved by ``step``."""
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+    
+    def value(self) -> Optional[float]:
+        """Current estimate (exact while five or fewer observations)."""
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            return float(np.percentile(self.heights, self.p * 100))
+        return self.heights[2]
+
+
+class SymbolOutlierState:
+    """Streaming statistics of one symbol's close-to-close log returns.
+    
+    Quartiles come from two generations of P² sketches: the current one and
+    the last completed ``window``, which is used for scoring once it exists,
+    so the fences follow recent history in constant memory.
+    """
+    
+    __slots__ = ('window', 'moments', 'q1', 'q3', 'ref_q1', 'ref_q3', 'prev_close', 'pending')
+    
+    def __init__(self, window: int):
+        """Initialize state."""
+        self.window = max(5, window)
+        self.moments = Welford(self.window)
+        self.q1 = P2Quantile(0.25)
+        self.q3 = P2Quantile(0.75)
+        self.ref_q1 = None
+        self.ref_q3 = None
+        self.prev_close = None
+        self.pending = None
+    
+    def commit(self, close: float):
+        """Fold a finished bar into the statistics."""
+        if self.prev_close is not None and self.prev_close > 0 and close > 0:
+            value = math.log(close / self.prev_close)
+            self.moments.add(value)
+            self.q1.add(value)
+            self.q3.add(value)
+            
+            if self.q1.count >= self.window:
+                self.ref_q1, self.ref_q3 = self.q1, self.q3
+                self.q1, self.q3 = P2Quantile(0.25), P2Quantile(0.75)
+        
+        self.prev_close = close
+    
+    def quartiles(self):
+        """Quartiles of the last completed window, or of the current one before that."""
+        if self.ref_q1 is not None:
+            return self.ref_q1.value(), self.ref_q3.value()
+        return self.q1.value(), self.q3.value()
+    
+    @property
+    def samples(self) -> int:
+        """Observations behind the statistics."""
+        return self.moments.count if self.ref_q1 is None else max(self.moments.count, self.window)
+
+
+class OutlierDetector:
+    """Flags bars whose return is anomalous for the symbol's own recent history.
+    
+    The latest bar of each symbol is kept pending so a re-delivered bar with
+    the same timestamp is scored again without being counted twice; it joins
+    the statistics once a newer bar arrives. New symbols are warm-started
+    from ``history(symbol)``, a bar array of prior bars.
+    """
+    
+    def __init__(self, config: OutlierDetectionConfig,
+                 history: Optional[Callable[[str], Optional[np.ndarray]]] = None):
+        """Initialize detector."""
+        self.config = config
+        self.history = history
+        self.logger = logging.getLogger(__name__)
+        
+        self.states: Dict[str, SymbolOutlierState] = {}
+        self._lock = threading.Lock()
+        self.stats = {'checked': 0, 'flagged': 0, 'warming_up': 0, 'stale': 0}
+    
+    def check(self, symbol: str, timestamp, close: float) -> bool:
+        """Score a bar for ``symbol`` and return whether it is an outlier."""
+        ts = pd.Timestamp(timestamp).value
+        
+        with self._lock:
+            state = self.states.get(symbol)
+            if state is None:
+                state = self._new_state(symbol, ts)
+            
+            if state.pending is not None:
+                if ts < state.pending[0]:
+                    self.stats['stale'] += 1
+                    return False
+                if ts > state.pending[0]:
+                    state.commit(state.pending[1])
+            state.pending = (ts, close)
+            
+            self.stats['checked'] += 1
+            if state.prev_close is None or state.prev_close <= 0 or close <= 0 \
+                    or state.samples < self.config.min_samples:
+                self.stats['warming_up'] += 1
+                return False
+            
+            is_outlier = self._score(state, math.log(close / state.prev_close))
+            if is_outlier:
+                self.stats['flagged'] += 1
+            return is_outlier
+    
+    def _score(self, state: SymbolOutlierState, value: float) -> bool:
+        """Apply the configured test to a log return."""
+        threshold = self.config.threshold
+        
+        if self.config.method == "iqr":
+            q1, q3 = state.quartiles()
+            iqr = q3 - q1
+            return value < q1 - threshold * iqr or value > q3 + threshold * iqr
+        
+        if self.config.method == "zscore":
+            std = state.moments.std
+            return std > 0 and abs(value - state.moments.mean) / std > threshold
+        
+        return False
+    
+    def _new_state(self, symbol: str, before_ts: int) -> SymbolOutlierState:
+        """Create a symbol's state, replaying history older than ``before_ts``."""
+        state = SymbolOutlierState(self.config.window)
+        
+        bars = None
+        if self.history is not None:
+            try:
+                bars = self.history(symbol)
+            except Exception as e:
+                self.logger.warning(f"Failed to load history for {symbol}: {e}")
+        
+        if bars is not None and len(bars):
+            for close in bars['close'][bars['ts'] < before_ts]:
+                state.commit(float(close))
+        
+        self.states[symbol] = state
+        return state
+    
+    def get_stats(self) -> Dict:
+        """Get detector statistics."""
+        return {**self.stats, 'symbols': len(self.states)}
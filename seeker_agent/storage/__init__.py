@@ -0,0 +1,9 @@
+"""Storage package."""
+
+from .bar_store import BarStore
+from .dedup_index import DedupIndex
+from .segment_writer import SegmentWriter
+from .upload_ledger import UploadLedger
+from .upload_queue import UploadQueue
+
+__all__ = ['BarStore', 'DedupIndex', 'SegmentWriter', 'UploadLedger', 'UploadQueue']
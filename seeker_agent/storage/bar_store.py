@@ -0,0 +1,291 @@
+"""Columnar OHLCV bar store."""
+
+import logging
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread locks only
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+
+# One row per bar; timestamps are UTC nanoseconds since the epoch
+BAR_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'i8')
+])
+
+FRAME_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+
+def _to_utc_ns(values) -> np.ndarray:
+    """Convert timestamps (strings, datetimes or a DatetimeIndex) to UTC epoch nanoseconds."""
+    index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return index.as_unit('ns').asi8
+
+
+class BarStore:
+    """Symbol/year partitioned bar store backed by NumPy ``.npy`` files.
+    
+    Each ``<root>/<SYMBOL>/<YEAR>.npy`` holds a structured array sorted by
+    timestamp. Reads memory-map the partitions and binary-search the
+    timestamp column, so range scans and last-N reads touch only the rows
+    they return.
+    
+    Small appends are written to the end of ``<root>/<SYMBOL>/tail.bin``, so
+    a per-cycle update costs one short write instead of rewriting a year
+    partition. Once a tail holds ``compact_rows`` bars (and on ``compact()``
+    or ``close()``) it is merged into the affected year partitions, which are
+    replaced atomically; appends of at least ``compact_rows`` bars merge
+    directly. Newer values win on duplicate timestamps, and reads overlay
+    the tail on the partitions.
+    
+    Appends and compactions hold a per-symbol thread lock plus an exclusive
+    ``flock`` on ``<root>/<SYMBOL>/.lock``, so stores opened on the same
+    directory (in this process or in worker processes) never lose bars
+    written between a tail read and its unlink.
+    """
+    
+    TAIL = 'tail.bin'
+    LOCK = '.lock'
+    
+    def __init__(self, root: Union[str, Path], compact_rows: int = 256):
+        """Initialize bar store."""
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compact_rows = max(1, compact_rows)
+        self.logger = logging.getLogger(__name__)
+        
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+    
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.root / symbol.replace('-', '_').replace('/', '_')
+    
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks[self._symbol_dir(symbol).name]
+    
+    @contextmanager
+    def _locked(self, symbol: str):
+        """Hold the symbol's thread lock and its cross-process file lock."""
+        symbol_dir = self._symbol_dir(symbol)
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+        
+        with self._lock(symbol):
+            if fcntl is None:
+                yield
+                return
+            
+            with open(symbol_dir / self.LOCK, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _partitions(self, symbol: str) -> List[int]:
+        """List the years stored for a symbol in ascending order."""
+        symbol_dir = self._symbol_dir(symbol)
+        if not symbol_dir.exists():
+            return []
+        return sorted(int(path.stem) for path in symbol_dir.glob("*.npy"))
+    
+    def _load(self, symbol: str, year: int, mmap: bool = True) -> np.ndarray:
+        path = self._symbol_dir(symbol) / f"{year}.npy"
+        if not path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(path, mmap_mode='r' if mmap else None)
+    
+    def _tail(self, symbol: str) -> np.ndarray:
+        """Bars appended since the last compaction, oldest first."""
+        try:
+            data = (self._symbol_dir(symbol) / self.TAIL).read_bytes()
+        except FileNotFoundError:
+            return np.empty(0, dtype=BAR_DTYPE)
+        # A crash mid-write can leave a partial row at the end
+        usable = len(data) - len(data) % BAR_DTYPE.itemsize
+        return np.frombuffer(data[:usable], dtype=BAR_DTYPE).copy()
+    
+    @staticmethod
+    def _merge(newer: np.ndarray, older: np.ndarray) -> np.ndarray:
+        """Sorted union of two bar arrays; later rows of ``newer`` win on duplicate timestamps."""
+        # Newer rows first so np.unique keeps them on duplicate timestamps
+        merged = np.concatenate([newer[::-1], older])
+        _, first = np.unique(merged['ts'], return_index=True)
+        return merged[first]
+    
+    @staticmethod
+    def from_frame(frame: pd.DataFrame) -> np.ndarray:
+        """Convert a yfinance-style OHLCV frame to a bar array."""
+        bars = np.empty(len(frame), dtype=BAR_DTYPE)
+        bars['ts'] = _to_utc_ns(frame.index)
+        for field, column in FRAME_COLUMNS.items():
+            values = frame[column].to_numpy()
+            bars[field] = np.nan_to_num(values, nan=0) if field == 'volume' else values
+        return bars
+    
+    @staticmethod
+    def from_records(records: Iterable[Dict]) -> np.ndarray:
+        """Convert raw/processed records (``timestamp`` + ``prices``) to a bar array."""
+        records = list(records)
+        bars = np.empty(len(records), dtype=BAR_DTYPE)
+        bars['ts'] = _to_utc_ns([record['timestamp'] for record in records])
+        for field in FRAME_COLUMNS:
+            bars[field] = [record['prices'][field] for record in records]
+        return bars
+    
+    def append(self, symbol: str, bars: Union[np.ndarray, pd.DataFrame]) -> int:
+        """Add bars to the store and return the number of new timestamps."""
+        if isinstance(bars, pd.DataFrame):
+            bars = self.from_frame(bars)
+        if len(bars) == 0:
+            return 0
+        
+        bars = np.ascontiguousarray(bars, dtype=BAR_DTYPE)
+        symbol_dir = self._symbol_dir(symbol)
+        
+        with self._locked(symbol):
+            tail = self._tail(symbol)
+            added = self._count_new(symbol, bars, tail)
+            
+            if len(bars) >= self.compact_rows:
+                self._compact(symbol, np.concatenate([tail, bars]))
+            else:
+                with open(symbol_dir / self.TAIL, 'ab') as f:
+                    f.write(bars.tobytes())
+                if len(tail) + len(bars) >= self.compact_rows:
+                    self._compact(symbol, np.concatenate([tail, bars]))
+        
+        return added
+    
+    def _count_new(self, symbol: str, bars: np.ndarray, tail: np.ndarray) -> int:
+        """Number of distinct timestamps in ``bars`` not yet stored."""
+        ts = np.unique(bars['ts'])
+        new = ~np.isin(ts, tail['ts'])
+        years = pd.to_datetime(ts, unit='ns', utc=True).year.to_numpy()
+        
+        for year in np.unique(years):
+            stored = self._load(symbol, int(year))['ts']
+            if len(stored):
+                in_year = years == year
+                pos = np.searchsorted(stored, ts[in_year]).clip(max=len(stored) - 1)
+                new[in_year] &= stored[pos] != ts[in_year]
+        
+        return int(new.sum())
+    
+    def _compact(self, symbol: str, tail: np.ndarray):
+        """Merge ``tail`` into the year partitions, then drop the tail file (``_locked`` must be held)."""
+        symbol_dir = self._symbol_dir(symbol)
+        years = pd.to_datetime(tail['ts'], unit='ns', utc=True).year.to_numpy()
+        
+        for year in np.unique(years):
+            merged = self._merge(tail[years == year], self._load(symbol, int(year), mmap=False))
+            path = symbol_dir / f"{int(year)}.npy"
+            tmp_path = symbol_dir / f".{int(year)}.{os.getpid()}.{threading.get_ident()}.tmp.npy"
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, path)
+        
+        # Partitions are replaced first, so a crash here only replays the tail again
+        (symbol_dir / self.TAIL).unlink(missing_ok=True)
+    
+    def compact(self, symbol: Optional[str] = None):
+        """Merge the tail of ``symbol`` (or of every symbol) into its year partitions."""
+        names = [symbol] if symbol else [path.parent.name for path in self.root.glob(f"*/{self.TAIL}")]
+        for name in names:
+            if not self._symbol_dir(name).exists():
+                continue
+            with self._locked(name):
+                tail = self._tail(name)
+                if len(tail):
+                    self._compact(name, tail)
+    
+    def close(self):
+        """Compact all tails."""
+        self.compact()
+    
+    def scan(self, symbol: str, start=None, end=None) -> np.ndarray:
+        """Return bars with ``start <= ts < end`` in timestamp order."""
+        start_ns = _to_utc_ns([start])[0] if start is not None else None
+        end_ns = _to_utc_ns([end])[0] if end is not None else None
+        start_year = pd.Timestamp(start_ns, tz='UTC').year if start_ns is not None else None
+        end_year = pd.Timestamp(end_ns, tz='UTC').year if end_ns is not None else None
+        
+        # Tail before partitions: a compaction in between replaces the partitions first
+        tail = self._tail(symbol)
+        if start_ns is not None:
+            tail = tail[tail['ts'] >= start_ns]
+        if end_ns is not None:
+            tail = tail[tail['ts'] < end_ns]
+        
+        parts = []
+        for year in self._partitions(symbol):
+            if (start_year is not None and year < start_year) or (end_year is not None and year > end_year):
+                continue
+            
+            bars = self._load(symbol, year)
+            lo = np.searchsorted(bars['ts'], start_ns, 'left') if start_ns is not None else 0
+            hi = np.searchsorted(bars['ts'], end_ns, 'left') if end_ns is not None else len(bars)
+            if hi > lo:
+                parts.append(np.array(bars[lo:hi]))
+        
+        stored = np.concatenate(parts) if parts else np.empty(0, dtype=BAR_DTYPE)
+        return self._merge(tail, stored) if len(tail) else stored
+    
+    def last(self, symbol: str, n: int) -> np.ndarray:
+        """Return the last ``n`` bars in timestamp order."""
+        if n <= 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        
+        tail = self._tail(symbol)
+        parts = []
+        remaining = n
+        
+        for year in reversed(self._partitions(symbol)):
+            if remaining <= 0:
+                break
+            bars = self._load(symbol, year)
+            parts.append(np.array(bars[-remaining:]))
+            remaining -= len(parts[-1])
+        
+        stored = np.concatenate(parts[::-1]) if parts else np.empty(0, dtype=BAR_DTYPE)
+        return self._merge(tail, stored)[-n:] if len(tail) else stored
+    
+    def last_timestamp(self, symbol: str) -> Optional[pd.Timestamp]:
+        """Return the timestamp of the newest stored bar."""
+        bars = self.last(symbol, 1)
+        return pd.Timestamp(int(bars['ts'][0]), tz='UTC') if len(bars) else None
+    
+    @staticmethod
+    def to_frame(bars: np.ndarray) -> pd.DataFrame:
+        """Convert a bar array to a yfinance-style OHLCV frame."""
+        index = pd.DatetimeIndex(pd.to_datetime(bars['ts'], unit='ns', utc=True), name='Date')
+        return pd.DataFrame({column: bars[field] for field, column in FRAME_COLUMNS.items()}, index=index)
+    
+    def symbols(self) -> List[str]:
+        """List stored symbol directories."""
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+    
+    def get_stats(self) -> Dict:
+        """Get store statistics."""
+        files = list(self.root.glob("*/*.npy"))
+        tails = list(self.root.glob(f"*/{self.TAIL}"))
+        return {
+            'root': str(self.root),
+            'symbols': len({path.parent for path in files + tails}),
+            'partitions': len(files),
+            'tail_rows': sum(path.stat().st_size // BAR_DTYPE.itemsize for path in tails),
+            'bytes': sum(path.stat().st_size for path in files + tails)
+        }
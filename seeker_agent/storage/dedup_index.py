@@ -0,0 +1,219 @@
+"""Persistent (symbol, bar timestamp, OHLCV) deduplication index."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from core.config import Config
+
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def bar_key(symbol: str, timestamp, prices: Optional[Dict] = None) -> int:
+    """64-bit key of a symbol's bar (timestamps compared in UTC nanoseconds).
+    
+    With ``prices`` the OHLCV values are part of the key, so a bar that is
+    still forming gets a new key each time it changes.
+    """
+    ts = pd.Timestamp(timestamp).value
+    content = '|'.join(repr(prices.get(field)) for field in BAR_FIELDS) if prices else ''
+    digest = hashlib.blake2b(f"{symbol}|{ts}|{content}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def record_key(record: Dict) -> int:
+    """Key of a raw or processed record's bar, including its OHLCV values."""
+    prices = record.get('original_prices', record.get('prices'))
+    return bar_key(record['symbol'], record['timestamp'], prices if isinstance(prices, dict) else None)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over 64-bit keys (double hashing)."""
+    
+    def __init__(self, bits: int, hashes: int = 4):
+        """Initialize filter."""
+        self.bits = max(64, bits)
+        self.hashes = max(1, hashes)
+        self.array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+    
+    def _positions(self, key: int) -> List[int]:
+        """Bit positions of a key."""
+        h1, h2 = key & 0xFFFFFFFF, (key >> 32) | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+    
+    def add(self, key: int):
+        """Add a key."""
+        for pos in self._positions(key):
+            self.array[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: int) -> bool:
+        return all(self.array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class DedupIndex:
+    """Set of bars already seen, persisted as a snapshot.
+    
+    Keys are 64-bit hashes of (symbol, bar timestamp, OHLCV) kept in a dict with the
+    time they were added, so membership is O(1) and entries added more than
+    ``retention_days`` ago can be pruned. ``flush()`` writes an atomic ``.npy``
+    snapshot when the index changed (``checkpoint()`` at most every
+    ``snapshot_interval`` seconds); it is loaded again on startup. An
+    optional Bloom filter answers most lookups of new bars without touching
+    the dict.
+    """
+    
+    def __init__(self, path: Union[str, Path], retention_days: int = 30, snapshot_interval: float = 0,
+                 bloom_bits: int = 0, bloom_hashes: int = 4):
+        """Initialize index, loading the last snapshot."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self.snapshot_interval = snapshot_interval
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._keys: Dict[int, float] = {}  # key -> added at (Unix seconds)
+        self.bloom = BloomFilter(bloom_bits, bloom_hashes) if bloom_bits > 0 else None
+        self._dirty = False
+        self._flushed_at = time.monotonic()
+        self.stats = {'checked': 0, 'duplicates': 0, 'bloom_negatives': 0}
+        
+        self._load()
+    
+    def _known(self, key: int) -> bool:
+        """Membership test, Bloom filter first (lock must be held)."""
+        if self.bloom is not None and key not in self.bloom:
+            self.stats['bloom_negatives'] += 1
+            return False
+        return key in self._keys
+    
+    def seen(self, record: Dict) -> bool:
+        """Whether a record's bar, with its current values, is already in the index."""
+        key = record_key(record)
+        
+        with self._lock:
+            self.stats['checked'] += 1
+            if self._known(key):
+                self.stats['duplicates'] += 1
+                return True
+            return False
+    
+    def add_records(self, records: Iterable[Dict]):
+        """Record the bars of processed or uploaded records (records without a valid bar key are ignored)."""
+        keys = []
+        for record in records:
+            try:
+                keys.append(record_key(record))
+            except Exception:
+                continue
+        
+        self._insert(keys)
+    
+    def _insert(self, keys: List[int]):
+        """Add keys stamped with the current time."""
+        now = time.time()
+        
+        with self._lock:
+            for key in keys:
+                self._keys[key] = now
+                if self.bloom is not None:
+                    self.bloom.add(key)
+            self._dirty = self._dirty or bool(keys)
+    
+    def unseen(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield records whose bar (with its current values) is neither indexed nor repeated earlier in ``records``."""
+        keys = set()
+        
+        for record in records:
+            try:
+                key = record_key(record)
+            except Exception:
+                # Malformed records are left for validation to reject
+                yield record
+                continue
+            
+            with self._lock:
+                self.stats['checked'] += 1
+                if key in keys or self._known(key):
+                    self.stats['duplicates'] += 1
+                    continue
+            
+            keys.add(key)
+            yield record
+    
+    @classmethod
+    def for_config(cls, config: 'Config', name: str) -> Optional['DedupIndex']:
+        """Open the named index under the processed data directory, or None if disabled."""
+        dedup = config.dedup
+        if not dedup.enabled:
+            return None
+        return cls(
+            Path(config.storage.processed_data_dir) / 'dedup' / f'{name}.npy',
+            retention_days=dedup.retention_days,
+            snapshot_interval=dedup.snapshot_interval,
+            bloom_bits=dedup.bloom_bits,
+            bloom_hashes=dedup.bloom_hashes
+        )
+    
+    def _load(self):
+        """Load the snapshot, dropping entries past retention."""
+        if not self.path.exists():
+            return
+        
+        try:
+            snapshot = np.load(self.path)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable dedup snapshot {self.path}: {e}")
+            return
+        
+        cutoff = self._cutoff()
+        snapshot = snapshot[snapshot['added_at'] >= cutoff]
+        self._keys = dict(zip(snapshot['key'].tolist(), snapshot['added_at'].tolist()))
+        if self.bloom is not None:
+            for key in self._keys:
+                self.bloom.add(key)
+    
+    def _cutoff(self) -> float:
+        """Oldest addition time kept."""
+        return time.time() - self.retention_days * 86400
+    
+    def checkpoint(self):
+        """Flush if ``snapshot_interval`` seconds passed since the last snapshot."""
+        if time.monotonic() - self._flushed_at >= self.snapshot_interval:
+            self.flush()
+    
+    def flush(self):
+        """Prune expired entries and write the snapshot atomically if the index changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = self._cutoff()
+            self._keys = {key: added for key, added in self._keys.items() if added >= cutoff}
+            snapshot = np.array(list(self._keys.items()), dtype=[('key', '<u8'), ('added_at', '<f8')])
+            self._dirty = False
+            self._flushed_at = time.monotonic()
+        
+        tmp_path = self.path.with_name(f".{self.path.name}.{threading.get_ident()}.tmp.npy")
+        try:
+            np.save(tmp_path, snapshot)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Failed to persist dedup index {self.path}: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def get_stats(self) -> Dict:
+        """Get index statistics."""
+        with self._lock:
+            return {**self.stats, 'entries': len(self._keys), 'bloom': self.bloom is not None}
+
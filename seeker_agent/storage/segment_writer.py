@@ -0,0 +1,259 @@
+"""Buffered append-only JSON lines segment writer."""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+
+class SegmentWriter:
+    """Appends records as JSON lines to rotating segment files.
+    
+    ``write()`` only serializes the record and buffers the line. A background
+    thread appends the buffer to the active segment every ``flush_interval``
+    seconds, or as soon as ``flush_max_records`` lines are pending, with one
+    fsync per flush.
+    
+    The active segment carries an ``.open`` suffix. Once it reaches
+    ``max_bytes`` or ``max_age`` seconds it is fsynced and atomically renamed
+    to ``.jsonl``, so a finalized segment is always complete. Segments left
+    open by a crash are truncated to their last complete line and finalized
+    on the next start; segments of other live processes are left alone.
+    """
+    
+    SUFFIX = '.jsonl'
+    OPEN_SUFFIX = '.jsonl.open'
+    
+    def __init__(self, directory: str, prefix: str = 'processed', max_bytes: int = 64 * 1024 * 1024,
+                 max_age: float = 3600, flush_interval: float = 1.0, flush_max_records: int = 1000):
+        """Initialize writer and recover segments left open by a previous run."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.flush_interval = flush_interval
+        self.flush_max_records = max(1, flush_max_records)
+        self.logger = logging.getLogger(__name__)
+        
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        
+        self._file = None
+        self._path = None
+        self._opened_at = 0.0
+        self._size = 0
+        self._seq = 0
+        
+        self.stats = {
+            'records': 0,
+            'bytes': 0,
+            'flushes': 0,
+            'segments': 0,
+            'recovered': 0,
+            'errors': 0
+        }
+        
+        self._recover()
+        
+        self._thread = threading.Thread(target=self._run, name=f'{prefix}-writer', daemon=True)
+        self._thread.start()
+    
+    def write(self, record: Dict):
+        """Buffer one record for the next flush."""
+        self.write_many([record])
+    
+    def write_many(self, records: Iterable[Dict]):
+        """Buffer several records for the next flush."""
+        if self._closed:
+            raise RuntimeError("SegmentWriter is closed")
+        
+        lines = [json.dumps(record, default=str) + '\n' for record in records]
+        
+        with self._buffer_lock:
+            self._buffer.extend(lines)
+            pending = len(self._buffer)
+        
+        if pending >= self.flush_max_records:
+            self._wake.set()
+    
+    def flush(self):
+        """Append buffered lines to the active segment and fsync it."""
+        # Hold the file lock while taking the buffer so concurrent flushes keep write order
+        with self._io_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+            
+            if lines:
+                if self._file is None:
+                    self._open_segment()
+                
+                data = ''.join(lines).encode()
+                try:
+                    self._file.write(data)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                except Exception:
+                    # Cut any partial write and keep the lines for the next flush
+                    with self._buffer_lock:
+                        self._buffer[:0] = lines
+                    self._file.truncate(self._size)
+                    raise
+                
+                self._size += len(data)
+                self.stats['records'] += len(lines)
+                self.stats['bytes'] += len(data)
+                self.stats['flushes'] += 1
+            
+            if self._file is not None and (self._size >= self.max_bytes or
+                                           time.time() - self._opened_at >= self.max_age):
+                self._finalize()
+    
+    def close(self):
+        """Flush pending records, finalize the active segment and stop the thread."""
+        if self._closed:
+            return
+        
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        
+        self.flush()
+        with self._io_lock:
+            if self._file is not None:
+                self._finalize()
+    
+    def _run(self):
+        """Background loop flushing on size or time."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            
+            try:
+                self.flush()
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"Failed to flush {self.prefix} segment: {e}")
+    
+    def _open_segment(self):
+        """Start a new active segment."""
+        self._seq += 1
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = f"{self.prefix}_{timestamp}_{os.getpid()}_{self._seq:04d}{self.OPEN_SUFFIX}"
+        
+        self._path = self.directory / name
+        self._file = open(self._path, 'ab')
+        self._opened_at = time.time()
+        self._size = 0
+    
+    def _finalize(self):
+        """Close the active segment and atomically publish it under its final name."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        
+        os.replace(self._path, self._final_path(self._path))
+        self._sync_directory()
+        
+        self.stats['segments'] += 1
+        self.logger.debug(f"💾 Finalized segment {self._final_path(self._path).name}")
+        
+        self._file = None
+        self._path = None
+    
+    def _recover(self):
+        """Finalize segments a crashed run left open, dropping a torn last line."""
+        for path in sorted(self.directory.glob(f"{self.prefix}_*{self.OPEN_SUFFIX}")):
+            if self._owner_alive(path):
+                continue
+            
+            try:
+                with open(path, 'rb+') as f:
+                    data = f.read()
+                    complete = data.rfind(b'\n') + 1
+                    if complete < len(data):
+                        f.truncate(complete)
+                        f.flush()
+                        os.fsync(f.fileno())
+                
+                if complete == 0:
+                    path.unlink()
+                    continue
+                
+                os.replace(path, self._final_path(path))
+                self.stats['recovered'] += 1
+                self.logger.info(f"   ↻ Recovered segment {path.name} ({len(data) - complete} torn bytes dropped)")
+            
+            except Exception as e:
+                self.logger.error(f"Failed to recover segment {path}: {e}")
+        
+        self._sync_directory()
+    
+    @staticmethod
+    def _owner_alive(path: Path) -> bool:
+        """Whether another running process (e.g. a processing worker) still writes a segment."""
+        try:
+            pid = int(path.name.split('.')[0].split('_')[-2])
+        except (IndexError, ValueError):
+            return False
+        
+        if pid == os.getpid():
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+    
+    def _final_path(self, path: Path) -> Path:
+        """Name of the finalized segment for an open one."""
+        return path.with_name(path.name[:-len(self.OPEN_SUFFIX)] + self.SUFFIX)
+    
+    def _sync_directory(self):
+        """Persist renames in the segment directory (no-op where unsupported)."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
+    @classmethod
+    def read(cls, directory: str, prefix: str = 'processed',
+             include_open: bool = False) -> Iterator[Dict]:
+        """Yield records from finalized segments in write order."""
+        directory = Path(directory)
+        paths = list(directory.glob(f"{prefix}_*{cls.SUFFIX}"))
+        if include_open:
+            paths += list(directory.glob(f"{prefix}_*{cls.OPEN_SUFFIX}"))
+        
+        for path in sorted(paths, key=lambda p: p.name.split('.')[0]):
+            with open(path) as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        yield json.loads(line)
+    
+    def get_stats(self) -> Dict:
+        """Get writer statistics."""
+        with self._buffer_lock:
+            pending = len(self._buffer)
+        
+        return {
+            **self.stats,
+            'pending': pending,
+            'active_segment': self._path.name if self._path else None
+        }
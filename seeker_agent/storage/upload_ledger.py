@@ -0,0 +1,177 @@
+"""Indexed ledger of submitted upload batches."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+Moment = Union[datetime, str, float, int]
+
+
+def _epoch(moment: Moment) -> float:
+    """Unix seconds of a datetime, ISO string or number (naive times are local)."""
+    if isinstance(moment, (int, float)):
+        return float(moment)
+    if isinstance(moment, str):
+        moment = pd.Timestamp(moment).to_pydatetime()
+    return moment.timestamp()
+
+
+def _iso(epoch: float) -> str:
+    """Local ISO time, as the tracking files recorded it."""
+    return datetime.fromtimestamp(epoch).isoformat()
+
+
+class UploadLedger:
+    """SQLite ledger of uploads, indexed by tx_id, file_hash, symbol and time.
+    
+    One ``uploads`` row per transaction and one ``upload_records`` row per
+    record (its position in the batch is its Merkle leaf index). Running
+    totals are kept in a ``totals`` row updated in the same transaction, so
+    stats are O(1); lookups and range queries use B-tree indexes and cost
+    O(log n) plus the rows returned.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        """Open (or create) the ledger."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS uploads (
+                tx_id TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                uploaded_at REAL NOT NULL,
+                batch_size INTEGER NOT NULL,
+                network TEXT,
+                contract TEXT
+            );
+            CREATE INDEX IF NOT EXISTS uploads_file_hash ON uploads (file_hash);
+            CREATE INDEX IF NOT EXISTS uploads_time ON uploads (uploaded_at);
+            CREATE TABLE IF NOT EXISTS upload_records (
+                tx_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                bar_timestamp TEXT,
+                uploaded_at REAL NOT NULL,
+                PRIMARY KEY (tx_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS upload_records_symbol ON upload_records (symbol, uploaded_at);
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                uploads INTEGER NOT NULL,
+                records INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+        """)
+    
+    def record(self, tx_id: str, file_hash: str, batch: List[Dict], network: Optional[str] = None,
+               contract: Optional[str] = None, uploaded_at: Optional[float] = None):
+        """Record an accepted batch (a tx_id already recorded is ignored)."""
+        uploaded_at = time.time() if uploaded_at is None else uploaded_at
+        records = [
+            (tx_id, position, item['symbol'], None if item.get('timestamp') is None else str(item['timestamp']),
+             uploaded_at)
+            for position, item in enumerate(batch)
+        ]
+        
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                    (tx_id, file_hash, uploaded_at, len(batch), network, contract)
+                ).rowcount
+                if inserted:
+                    self._conn.executemany("INSERT INTO upload_records VALUES (?, ?, ?, ?, ?)", records)
+                    self._conn.execute(
+                        "UPDATE totals SET uploads = uploads + 1, records = records + ? WHERE id = 0", (len(batch),)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _upload(self, row: sqlite3.Row) -> Dict:
+        """Upload row as a dict, with its symbols in batch order (lock must be held)."""
+        symbols = [r[0] for r in self._conn.execute(
+            "SELECT symbol FROM upload_records WHERE tx_id = ? ORDER BY position", (row['tx_id'],)
+        )]
+        return {**dict(row), 'uploaded_at': _iso(row['uploaded_at']), 'symbols': symbols}
+    
+    def get(self, tx_id: str) -> Optional[Dict]:
+        """Upload by transaction id."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM uploads WHERE tx_id = ?", (tx_id,)).fetchone()
+            return self._upload(row) if row is not None else None
+    
+    def by_file_hash(self, file_hash: str) -> List[Dict]:
+        """Uploads that committed ``file_hash`` (a batch resubmitted after a crash appears twice)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM uploads WHERE file_hash = ? ORDER BY uploaded_at", (file_hash,)
+            ).fetchall()
+            return [self._upload(row) for row in rows]
+    
+    def between(self, start: Moment, end: Moment, limit: int = 1000) -> List[Dict]:
+        """Uploads with ``start <= uploaded_at < end``, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM uploads WHERE uploaded_at >= ? AND uploaded_at < ? ORDER BY uploaded_at LIMIT ?",
+                (_epoch(start), _epoch(end), limit)
+            ).fetchall()
+            return [self._upload(row) for row in rows]
+    
+    def symbol_history(self, symbol: str, limit: int = 100, since: Optional[Moment] = None) -> List[Dict]:
+        """A symbol's uploaded records, newest first, with the tx and Merkle position of each."""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT r.tx_id, r.position, r.bar_timestamp, r.uploaded_at, u.file_hash
+                FROM upload_records r JOIN uploads u ON u.tx_id = r.tx_id
+                WHERE r.symbol = ? AND r.uploaded_at >= ?
+                ORDER BY r.uploaded_at DESC LIMIT ?
+            """, (symbol, _epoch(since) if since is not None else 0.0, limit)).fetchall()
+        return [{**dict(row), 'uploaded_at': _iso(row['uploaded_at'])} for row in rows]
+    
+    def totals(self) -> Dict:
+        """Total uploads and records."""
+        with self._lock:
+            row = self._conn.execute("SELECT uploads, records FROM totals WHERE id = 0").fetchone()
+        return {'total_uploads': row['uploads'], 'total_records': row['records']}
+    
+    def import_tracking_files(self, directory: Union[str, Path]) -> int:
+        """Import legacy ``upload_*.json`` tracking files, renaming each to ``*.json.imported``."""
+        imported = 0
+        
+        for path in sorted(Path(directory).glob("upload_*.json")):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                self.record(
+                    data['tx_id'], data['file_hash'], [{'symbol': symbol} for symbol in data.get('symbols', [])],
+                    data.get('network'), data.get('contract'), _epoch(data['uploaded_at'])
+                )
+                path.rename(path.with_name(path.name + '.imported'))
+                imported += 1
+            except Exception as e:
+                self.logger.warning(f"Skipping tracking file {path}: {e}")
+        
+        if imported:
+            self.logger.info(f"📥 Imported {imported} upload tracking files into the ledger")
+        return imported
+    
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
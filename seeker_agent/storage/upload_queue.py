@@ -0,0 +1,181 @@
+"""Durable queue of processed records awaiting upload."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+PENDING = 0
+IN_FLIGHT = 1
+DEAD = 2
+
+
+class UploadQueue:
+    """Write-ahead queue of processed records awaiting upload.
+    
+    Records are journaled in a SQLite database (WAL journal, full sync)
+    before they are submitted and deleted only once their batch is accepted,
+    so delivery is at-least-once. Claimed records are marked in flight; on
+    open, records a crash left in flight go back to pending. Recovery is a
+    single indexed UPDATE, so startup time does not grow with the backlog.
+    A record whose batch failed ``max_attempts`` times is dead-lettered:
+    it stays in the database for inspection but is no longer claimed
+    (``0`` retries forever).
+    """
+    
+    def __init__(self, path: Union[str, Path], max_attempts: int = 0):
+        """Open the queue, returning records left in flight to pending."""
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queue (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                state INTEGER NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                enqueued_at REAL NOT NULL,
+                record TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queue_state ON queue (state, id)")
+        
+        self.stats = {'enqueued': 0, 'acked': 0, 'released': 0, 'dead_lettered': 0, 'recovered': self._recover()}
+        if self.stats['recovered']:
+            self.logger.info(f"♻️  Re-queued {self.stats['recovered']} records left in flight")
+    
+    def _recover(self) -> int:
+        """Return in-flight records to pending."""
+        with self._lock:
+            return self._conn.execute("UPDATE queue SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT)).rowcount
+    
+    def enqueue(self, records: Iterable[Dict], claimed: bool = False) -> List[int]:
+        """Journal records and return their ids; ``claimed`` marks them in flight already."""
+        state = IN_FLIGHT if claimed else PENDING
+        now = time.time()
+        rows = [(state, now, json.dumps(record, default=str)) for record in records]
+        
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                ids = [self._conn.execute(
+                    "INSERT INTO queue (state, enqueued_at, record) VALUES (?, ?, ?)", row
+                ).lastrowid for row in rows]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats['enqueued'] += len(ids)
+        
+        return ids
+    
+    def claim(self, limit: int, after: int = 0) -> List[Tuple[int, Dict]]:
+        """Mark up to ``limit`` pending records with ids above ``after`` in flight, oldest first."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, record FROM queue WHERE state = ? AND id > ? ORDER BY id LIMIT ?",
+                    (PENDING, after, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE queue SET state = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(IN_FLIGHT, row_id) for row_id, _ in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        
+        return [(row_id, json.loads(record)) for row_id, record in rows]
+    
+    def claim_ids(self, ids: List[int]) -> Set[int]:
+        """Mark those of ``ids`` that are still pending in flight and return them."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                claimed = {row_id for row_id in ids if self._conn.execute(
+                    "UPDATE queue SET state = ?, attempts = attempts + 1 WHERE id = ? AND state = ?",
+                    (IN_FLIGHT, row_id, PENDING)
+                ).rowcount}
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        
+        return claimed
+    
+    def ack(self, ids: List[int]):
+        """Delete records whose batch was accepted."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM queue WHERE id = ?", [(row_id,) for row_id in ids])
+            self.stats['acked'] += len(ids)
+    
+    def release(self, ids: List[int]):
+        """Return records whose batch failed to pending, dead-lettering those out of attempts."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("UPDATE queue SET state = ? WHERE id = ?", [(PENDING, row_id) for row_id in ids])
+                dead = 0
+                if self.max_attempts > 0:
+                    dead = sum(self._conn.execute(
+                        "UPDATE queue SET state = ? WHERE id = ? AND attempts >= ?", (DEAD, row_id, self.max_attempts)
+                    ).rowcount for row_id in ids)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.stats['released'] += len(ids) - dead
+            self.stats['dead_lettered'] += dead
+        
+        if dead:
+            self.logger.warning(f"☠️  Dead-lettered {dead} records after {self.max_attempts} failed attempts")
+    
+    def dead_letters(self, limit: int = 100) -> List[Tuple[int, Dict]]:
+        """Dead-lettered records, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, record FROM queue WHERE state = ? ORDER BY id LIMIT ?", (DEAD, limit)
+            ).fetchall()
+        return [(row_id, json.loads(record)) for row_id, record in rows]
+    
+    def requeue_dead(self) -> int:
+        """Return dead-lettered records to pending with their attempts reset."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE queue SET state = ?, attempts = 0 WHERE state = ?", (PENDING, DEAD)
+            ).rowcount
+    
+    def pending(self) -> int:
+        """Number of records waiting to be claimed."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queue WHERE state = ?", (PENDING,)).fetchone()[0]
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queue WHERE state != ?", (DEAD,)).fetchone()[0]
+    
+    def get_stats(self) -> Dict:
+        """Get queue statistics."""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM queue GROUP BY state").fetchall())
+            return {
+                **self.stats,
+                'pending': counts.get(PENDING, 0),
+                'in_flight': counts.get(IN_FLIGHT, 0),
+                'dead': counts.get(DEAD, 0)
+            }
+    
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
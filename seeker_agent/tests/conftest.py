@@ -0,0 +1,27 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+from core.config import Config
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Factory of default configs whose storage lives under ``tmp_path`` (or a subdirectory of it)."""
+    def make(name: str = '') -> Config:
+        root = Path(tmp_path) / name
+        config = Config()
+        config.storage.processed_data_dir = str(root / 'processed')
+        config.storage.historical_dir = str(root / 'historical')
+        config.storage.cache_dir = str(root / 'cache')
+        return config
+    
+    return make
+
+
+@pytest.fixture
+def tmp_config(make_config):
+    """Default config with its storage under ``tmp_path``."""
+    return make_config()
@@ -0,0 +1,29 @@
+"""Test agent scheduling."""
+
+import asyncio
+
+from apscheduler.triggers.cron import CronTrigger
+
+from core.agent import SeekerAgent
+
+
+def test_async_mode_schedules_all_jobs(tmp_path, tmp_config):
+    """Test that run_async honors the schedule mode and schedules historical_sync."""
+    tmp_config.storage.raw_data_dir = str(tmp_path / 'raw')
+    tmp_config.scheduling.mode = 'cron'
+    tmp_config.performance.async_collection = True
+    agent = SeekerAgent(tmp_config)
+    
+    async def run():
+        task = asyncio.create_task(agent.run_async())
+        await asyncio.sleep(0.2)
+        jobs = {job.id: job.trigger for job in agent.scheduler.get_jobs()}
+        agent.running = False
+        await task
+        return jobs
+    
+    jobs = asyncio.run(run())
+    
+    assert set(jobs) == {'stock_updates', 'historical_sync'}
+    assert all(isinstance(trigger, CronTrigger) for trigger in jobs.values())
+    assert not agent.scheduler.running
@@ -0,0 +1,71 @@
+"""Test historical backfill."""
+
+import pytest
+from unittest.mock import Mock
+from datetime import datetime
+import pandas as pd
+
+from collectors.backfill import HistoricalBackfill
+
+
+@pytest.fixture
+def backfill_config(tmp_config):
+    """Create configuration with temporary storage."""
+    config = tmp_config
+    config.data_sources.yahoo_finance.stocks = ['AAPL', 'MSFT']
+    config.backfill.chunk_days = 30
+    config.backfill.max_workers = 4
+    return config
+
+
+def _frame(start, end, interval):
+    """Build a daily OHLCV frame for a chunk."""
+    dates = pd.date_range(start, end, freq='D', inclusive='left')
+    return pd.DataFrame({
+        'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 100
+    }, index=dates)
+
+
+class TestHistoricalBackfill:
+    """Test backfill planning, execution and resume."""
+    
+    def test_plan_chunks_aligned(self):
+        """Test that chunks cover the range with aligned boundaries."""
+        chunks = HistoricalBackfill.plan_chunks(datetime(2024, 1, 10), datetime(2024, 3, 1), 30)
+        
+        assert chunks[0][0] == '2024-01-10'
+        assert chunks[-1][1] == '2024-03-01'
+        assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+        
+        # Interior boundaries do not depend on the start date
+        later = HistoricalBackfill.plan_chunks(datetime(2024, 1, 12), datetime(2024, 3, 1), 30)
+        assert chunks[1:] == later[1:]
+    
+    def test_resume_after_failure(self, backfill_config):
+        """Test that a rerun only fetches chunks that previously failed."""
+        collector = Mock()
+        calls = []
+        failures = ['MSFT']
+        
+        def fetch(symbol, start, end, interval):
+            calls.append((symbol, start))
+            if symbol in failures:
+                failures.remove(symbol)
+                raise RuntimeError("network error")
+            return _frame(start, end, interval)
+        
+        collector.fetch_history_range.side_effect = fetch
+        
+        backfill = HistoricalBackfill(backfill_config, collector)
+        first = backfill.run(days=90)
+        
+        assert first['chunks_failed'] == 1
+        assert first['rows'] > 0
+        
+        calls.clear()
+        second = HistoricalBackfill(backfill_config, collector).run(days=90)
+        
+        assert second['chunks_fetched'] == 1
+        assert second['chunks_failed'] == 0
+        assert len(calls) == 1
+        assert second['chunks_skipped'] == first['chunks_total'] - 1
@@ -0,0 +1,132 @@
+"""Test columnar bar store."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from storage.bar_store import BarStore
+
+
+def _frame(start, periods, base=100.0):
+    """Build a daily OHLCV frame."""
+    dates = pd.date_range(start, periods=periods, freq='D', tz='America/New_York')
+    values = base + np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'Open': values,
+        'High': values + 2,
+        'Low': values - 1,
+        'Close': values + 1,
+        'Volume': np.arange(periods) * 1000
+    }, index=dates)
+
+
+class TestBarStore:
+    """Test bar store append and reads."""
+    
+    def test_append_partitions_by_year(self, tmp_path):
+        """Test that appends spanning a year boundary land in two partitions."""
+        store = BarStore(tmp_path)
+        
+        added = store.append('AAPL', _frame('2023-12-20', 30))
+        store.close()
+        
+        assert added == 30
+        assert sorted(p.name for p in (tmp_path / 'AAPL').glob('*.npy')) == ['2023.npy', '2024.npy']
+    
+    def test_append_deduplicates(self, tmp_path):
+        """Test that overlapping appends keep one row per timestamp, newest wins."""
+        store = BarStore(tmp_path)
+        store.append('AAPL', _frame('2024-01-01', 10))
+        added = store.append('AAPL', _frame('2024-01-06', 10, base=500.0))
+        
+        bars = store.scan('AAPL')
+        
+        assert added == 5
+        assert len(bars) == 15
+        assert np.all(np.diff(bars['ts']) > 0)
+        assert bars['open'][5] == 500.0
+    
+    def test_scan_range(self, tmp_path):
+        """Test half-open range scans across partitions."""
+        store = BarStore(tmp_path)
+        store.append('BTC-USD', _frame('2023-12-25', 20))
+        
+        frame = BarStore.to_frame(store.scan('BTC-USD', '2023-12-30', '2024-01-03'))
+        
+        assert len(frame) == 4
+        assert list(frame.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    
+    def test_last_n(self, tmp_path):
+        """Test reading the newest bars across partitions."""
+        store = BarStore(tmp_path)
+        store.append('AAPL', _frame('2023-12-28', 10))
+        
+        bars = store.last('AAPL', 6)
+        
+        assert len(bars) == 6
+        assert bars['close'][-1] == 110.0
+        assert store.last('MSFT', 5).size == 0
+        assert store.last_timestamp('AAPL') == pd.Timestamp(int(bars['ts'][-1]), tz='UTC')
+    
+    def test_from_records(self, tmp_path):
+        """Test converting collector records."""
+        store = BarStore(tmp_path)
+        records = [{
+            'timestamp': '2024-01-02T00:00:00-05:00',
+            'prices': {'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10}
+        }]
+        
+        store.append('AAPL', BarStore.from_records(records))
+        
+        assert store.scan('AAPL')['volume'][0] == 10
+    
+    def test_small_appends_go_to_tail_until_compacted(self, tmp_path):
+        """Test that per-cycle appends leave the year partition alone until compaction."""
+        store = BarStore(tmp_path, compact_rows=4)
+        store.append('AAPL', _frame('2024-01-01', 10))
+        partition = tmp_path / 'AAPL' / '2024.npy'
+        written = partition.stat().st_mtime_ns
+        
+        assert store.append('AAPL', _frame('2024-01-10', 2, base=500.0)) == 1
+        assert partition.stat().st_mtime_ns == written
+        assert store.get_stats()['tail_rows'] == 2
+        
+        # Reads overlay the tail, newest values winning
+        bars = store.scan('AAPL')
+        assert len(bars) == 11 and bars['open'][9] == 500.0
+        assert list(store.last('AAPL', 2)['open']) == [500.0, 501.0]
+        
+        # Reaching compact_rows merges the tail into the partition
+        store.append('AAPL', _frame('2024-01-12', 2, base=600.0))
+        assert not (tmp_path / 'AAPL' / 'tail.bin').exists()
+        assert len(BarStore(tmp_path).scan('AAPL')) == 13
+    
+    def test_partial_tail_row_is_ignored(self, tmp_path):
+        """Test that a row cut short by a crash is dropped and close() compacts the rest."""
+        store = BarStore(tmp_path)
+        store.append('AAPL', _frame('2024-01-01', 3))
+        with open(tmp_path / 'AAPL' / 'tail.bin', 'ab') as f:
+            f.write(b'\x00' * 7)
+        
+        assert len(store.scan('AAPL')) == 3
+        store.close()
+        assert store.get_stats()['tail_rows'] == 0
+        assert len(store.last('AAPL', 10)) == 3
+    
+    def test_stores_sharing_a_directory_keep_every_append(self, tmp_path):
+        """Test that concurrent appends and compactions from separate stores lose no bars."""
+        stores = [BarStore(tmp_path, compact_rows=3), BarStore(tmp_path, compact_rows=3)]
+        
+        def append(index):
+            store = stores[index % 2]
+            start = pd.Timestamp('2024-01-01') + pd.Timedelta(days=index * 2)
+            store.append('AAPL', _frame(start, 2, base=float(index)))
+            store.compact('AAPL')
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(append, range(100)))
+        stores[0].close()
+        
+        assert len(stores[1].scan('AAPL')) == 200
+        assert (tmp_path / 'AAPL' / '.lock').exists()
@@ -0,0 +1,137 @@
+"""Test cache utilities."""
+
+import time
+from unittest.mock import patch
+
+from utils.cache import DiskCache, LRUCache
+
+
+class TestDiskCache:
+    """Test persistent disk cache."""
+    
+    def test_set_get_roundtrip(self, tmp_path):
+        """Test storing and reading back a value."""
+        cache = DiskCache(tmp_path, ttl=60)
+        key = DiskCache.make_key('AAPL', '1d', '1y')
+        
+        cache.set(key, {'symbol': 'AAPL', 'close': 152.0})
+        
+        assert cache.get(key) == {'symbol': 'AAPL', 'close': 152.0}
+        assert cache.get('missing') is None
+        assert cache.get_stats()['hits'] == 1
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_survives_restart(self, tmp_path):
+        """Test that a new instance sees flushed entries."""
+        cache = DiskCache(tmp_path, ttl=60)
+        cache.set('a', [1, 2, 3])
+        cache.flush()
+        
+        reopened = DiskCache(tmp_path, ttl=60)
+        assert reopened.get('a') == [1, 2, 3]
+    
+    def test_unflushed_entries_are_cleaned_up(self, tmp_path):
+        """Test that files missing from the index are dropped on load."""
+        cache = DiskCache(tmp_path, ttl=60)
+        cache.set('a', 1)
+        cache.flush()
+        cache.set('b', 2)
+        
+        reopened = DiskCache(tmp_path, ttl=60)
+        assert len(reopened) == 1
+        assert len(list(tmp_path.glob('*.json'))) == 2  # entry + index
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Test that expired entries are not returned."""
+        cache = DiskCache(tmp_path, ttl=0.05)
+        cache.set('a', 1)
+        time.sleep(0.06)
+        
+        assert cache.get('a') is None
+        assert len(cache) == 0
+    
+    def test_lru_eviction_by_entries(self, tmp_path):
+        """Test that the least recently used entry is evicted first."""
+        cache = DiskCache(tmp_path, ttl=60, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_entry_evicted_during_read(self, tmp_path):
+        """Test that a read racing an eviction is a miss rather than an error."""
+        cache = DiskCache(tmp_path, ttl=60)
+        cache.set('a', 1)
+        
+        def evict_then_read(f):
+            # Another thread evicts the entry while this one reads its file
+            cache.delete('a')
+            raise FileNotFoundError(f.name)
+        
+        with patch('utils.cache.json.load', side_effect=evict_then_read):
+            assert cache.get('a') is None
+        
+        assert len(cache) == 0
+        assert cache.get_stats()['bytes'] == 0
+    
+    def test_eviction_by_bytes(self, tmp_path):
+        """Test that the byte bound is enforced."""
+        cache = DiskCache(tmp_path, ttl=60, max_bytes=20)
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'y' * 10)
+        
+        assert len(cache) == 1
+        assert cache.get_stats()['bytes'] <= 20
+
+
+class TestLRUCache:
+    """Test bounded in-memory cache."""
+    
+    def test_hits_and_misses(self):
+        """Test hit/miss accounting."""
+        cache = LRUCache(ttl=60)
+        cache.set('AAPL', {'close': 152.0})
+        
+        assert cache.get('AAPL') == {'close': 152.0}
+        assert cache.get('MSFT') is None
+        
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = LRUCache(ttl=60, max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        
+        assert cache.get('b') is None
+        assert len(cache) == 2
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_byte_bound(self):
+        """Test that the byte bound is enforced."""
+        cache = LRUCache(ttl=60, max_bytes=100)
+        for i in range(20):
+            cache.set(i, 'x' * 20)
+        
+        assert cache.get_stats()['bytes'] <= 100
+        assert len(cache) == 4
+    
+    def test_background_expiry(self):
+        """Test that the sweeper drops entries that are never read again."""
+        cache = LRUCache(ttl=0.02, sweep_interval=0.01)
+        cache.set('a', 1)
+        time.sleep(0.1)
+        cache.close()
+        
+        assert len(cache) == 0
+        assert cache.get_stats()['expirations'] == 1
@@ -0,0 +1,46 @@
+"""Test the cleanup sweep."""
+
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from main import expired_record_files
+
+
+def _touch(path: Path, age_days: float) -> Path:
+    """Create a file last modified ``age_days`` ago."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('{}')
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_cleanup_sweeps_only_old_record_files(tmp_path, tmp_config):
+    """Test that old raw/processed records are swept and agent state is kept however old."""
+    tmp_config.storage.raw_data_dir = str(tmp_path / 'raw')
+    raw = Path(tmp_config.storage.raw_data_dir)
+    processed = Path(tmp_config.storage.processed_data_dir)
+    cache = Path(tmp_config.storage.cache_dir)
+    historical = Path(tmp_config.storage.historical_dir)
+    
+    expired = [
+        _touch(raw / 'yahoo_finance' / 'raw_20240101_000000.json', 60),
+        _touch(processed / 'processed_AAPL_20240101_000000.json', 60),
+        _touch(processed / 'processed_20240101_000000_1_0001.jsonl', 60)
+    ]
+    kept = [
+        _touch(raw / 'yahoo_finance' / 'raw_20240301_000000.json', 1),
+        _touch(processed / 'processed_20240101_000000_1_0002.jsonl.open', 60),
+        _touch(historical / 'AAPL' / '2020.npy', 60),
+        _touch(cache / 'backfill' / 'checkpoint.log', 60),
+        _touch(processed / 'uploads' / 'queue.db', 60),
+        _touch(processed / 'uploads' / 'ledger.db', 60),
+        _touch(processed / 'uploads' / 'nonce', 60),
+        _touch(processed / 'uploads' / 'merkle' / 'abc.npy', 60),
+        _touch(processed / 'dedup' / 'processed.npy', 60)
+    ]
+    
+    assert expired_record_files(tmp_config, datetime.now() - timedelta(days=30)) == sorted(expired)
+    assert expired_record_files(tmp_config, datetime.now()) == sorted(expired + kept[:1])
@@ -0,0 +1,92 @@
+"""Test bar deduplication."""
+
+import pandas as pd
+
+from processors.data_processor import DataProcessor
+from storage.dedup_index import BloomFilter, DedupIndex
+
+
+def _record(symbol='AAPL', day=0, close=152.0):
+    """Build a raw collector record for a recent daily bar."""
+    ts = (pd.Timestamp.now(tz='UTC').normalize() - pd.Timedelta(days=day)).isoformat()
+    return {
+        'source': 'yahoo_finance', 'symbol': symbol, 'timestamp': ts, 'collected_at': ts,
+        'prices': {'open': 150.0, 'high': 155.0, 'low': 148.0, 'close': close, 'volume': 1000}
+    }
+
+
+class TestDedupIndex:
+    """Test membership, persistence and the Bloom filter front."""
+    
+    def test_unseen_skips_indexed_and_repeated(self, tmp_path):
+        """Test that indexed bars and repeats within the input are dropped."""
+        index = DedupIndex(tmp_path / 'index.npy')
+        index.add_records([dict(_record('AAPL'), timestamp='2024-01-15T00:00:00Z')])
+        
+        records = [
+            dict(_record('AAPL'), timestamp='2024-01-15T00:00:00+00:00'),
+            dict(_record('MSFT'), timestamp='2024-01-15T00:00:00Z'),
+            dict(_record('MSFT'), timestamp='2024-01-15T00:00:00Z'),
+            dict(_record('AAPL'), timestamp='2024-01-16T00:00:00Z'),
+            dict(_record('AAPL', close=153.0), timestamp='2024-01-15T00:00:00Z')
+        ]
+        
+        assert [r['symbol'] for r in index.unseen(records)] == ['MSFT', 'AAPL', 'AAPL']
+        assert index.get_stats()['duplicates'] == 2
+    
+    def test_snapshot_round_trip(self, tmp_path):
+        """Test that a flushed index is restored on startup and expired entries are dropped."""
+        aapl, msft = _record('AAPL'), _record('MSFT')
+        index = DedupIndex(tmp_path / 'index.npy')
+        index.add_records([aapl, msft])
+        index.flush()
+        
+        restored = DedupIndex(tmp_path / 'index.npy', bloom_bits=1024)
+        expired = DedupIndex(tmp_path / 'index.npy', retention_days=-1)
+        
+        assert restored.seen(aapl) and restored.seen(msft)
+        assert not restored.seen(_record('AAPL', day=1))
+        assert not restored.seen(_record('AAPL', close=153.0))
+        assert len(expired) == 0
+    
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Test that every added key is reported present."""
+        bloom = BloomFilter(4096, 4)
+        keys = list(range(1, 2 ** 40, 2 ** 32 + 12345))[:200]
+        for key in keys:
+            bloom.add(key)
+        
+        assert all(key in bloom for key in keys)
+
+
+def test_processor_and_uploader_skip_repeated_bars(tmp_config):
+    """Test that a re-collected bar is neither processed nor uploaded twice unless it changed."""
+    from uploaders.blockchain_uploader import BlockchainUploader
+    
+    config = tmp_config
+    config.blockchain.upload_config['batch_delay'] = 0
+    
+    processor = DataProcessor(config)
+    first = processor.process_batch([_record('AAPL'), _record('MSFT'), _record('AAPL')])
+    # A still-forming bar whose close moved is processed again; an unchanged one is not
+    again = processor.process_batch([_record('AAPL', close=153.0), _record('MSFT'), _record('AAPL', day=-1)])
+    processor.close()
+    
+    assert [item['symbol'] for item in first] == ['AAPL', 'MSFT']
+    assert [item['original_prices']['close'] for item in again] == [153.0, 152.0]
+    assert processor.get_stats()['dedup']['duplicates'] == 2
+    
+    # The index survives a restart; uncommitted bars are not indexed until commit()
+    restarted = DataProcessor(config)
+    assert restarted.process_batch([_record('MSFT')]) == []
+    pending = restarted.process_batch([_record('MSFT', day=1)], commit=False)
+    assert len(restarted.process_batch([_record('MSFT', day=1)], commit=False)) == len(pending) == 1
+    restarted.commit(pending)
+    assert restarted.process_batch([_record('MSFT', day=1)]) == []
+    restarted.close()
+    
+    uploader = BlockchainUploader(config)
+    assert uploader.upload_batch(first) == 2
+    assert uploader.upload_batch(first + again) == 2
+    assert uploader.get_upload_stats()['duplicates_skipped'] == 2
+    uploader.close()
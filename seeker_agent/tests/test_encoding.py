@@ -0,0 +1,95 @@
+"""Test fixed-point encoding."""
+
+import hashlib
+import json
+
+import pytest
+
+from processors.data_processor import DataProcessor
+from processors.encoding import SCALE, U64_MAX, FixedPointEncoder, FixedPointError, from_fixed, to_fixed
+from uploaders.blockchain_uploader import BlockchainUploader
+
+
+def _record(symbol='AAPL', close=152.0):
+    """Build a raw collector record."""
+    return {
+        'source': 'yahoo_finance', 'symbol': symbol,
+        'timestamp': '2024-01-15T14:30:00+00:00', 'collected_at': '2024-01-15T14:30:05+00:00',
+        'prices': {'open': 150.0, 'high': 155.0, 'low': 148.0, 'close': close, 'volume': 50000000}
+    }
+
+
+class TestFixedPoint:
+    """Test scalar conversions."""
+    
+    def test_round_trip(self):
+        """Test conversion at the Leo scale."""
+        assert SCALE == 1000000
+        assert to_fixed(1.234567) == 1234567
+        assert to_fixed(0.5) == 500000
+        assert from_fixed(to_fixed(-2.5, signed=True)) == -2.5
+    
+    def test_overflow_and_underflow(self):
+        """Test that values outside u64 are rejected."""
+        with pytest.raises(FixedPointError, match='underflow'):
+            to_fixed(-0.1, 'quality_score')
+        with pytest.raises(FixedPointError, match='overflow'):
+            to_fixed(U64_MAX / SCALE * 2)
+        with pytest.raises(FixedPointError, match='finite'):
+            to_fixed(float('nan'))
+
+
+class TestEncoder:
+    """Test record encoding through the processor and uploader."""
+    
+    def test_processed_record_is_encoded(self, tmp_config):
+        """Test that processed records carry a canonical integer payload."""
+        processor = DataProcessor(tmp_config)
+        processed = processor.process_batch([_record(close=149.0)])[0]
+        processor.close()
+        
+        encoded = json.loads(processed['encoded'])
+        
+        assert processed['encoded'] == json.dumps(encoded, sort_keys=True, separators=(',', ':'))
+        assert encoded['timestamp'] == 1705329000
+        assert encoded['quality_score'] == to_fixed(processed['quality_score'])
+        assert encoded['prices'] == {k: v for k, v in processed['normalized_prices'].items() if k != '_normalization'}
+        assert encoded['features']['change'] == 1000000
+        assert 'features.change' in encoded['negative']
+        assert 'sma_20' not in encoded['features']
+    
+    def test_unrepresentable_record_rejected(self, tmp_config):
+        """Test that the processor drops a record whose values do not fit u64."""
+        processor = DataProcessor(tmp_config)
+        record = _record()
+        record['prices']['volume'] = 2 ** 64
+        
+        assert processor.process_batch([record]) == []
+        assert processor.get_stats()['encoding']['rejected'] == 1
+        processor.close()
+    
+    def test_uploader_commits_encoded_payload(self, tmp_config):
+        """Test that the batch commitment is built from the cached record text."""
+        processor = DataProcessor(tmp_config)
+        batch = processor.process_batch([_record('AAPL'), _record('MSFT')])
+        processor.close()
+        uploader = BlockchainUploader(tmp_config)
+        
+        tree = uploader._commit_batch(batch)
+        leaves = [hashlib.sha256(b'\x00' + item['encoded'].encode()).digest() for item in batch]
+        
+        assert tree.root == hashlib.sha256(b'\x01' + leaves[0] + leaves[1]).hexdigest()
+        assert uploader._create_transaction('hash', batch)['parameters']['quality_score'] == \
+            to_fixed(sum(item['quality_score'] for item in batch) / 2)
+    
+    def test_uploader_encodes_legacy_records(self, tmp_config):
+        """Test that records without a payload are encoded on demand."""
+        processor = DataProcessor(tmp_config)
+        item = processor.process(_record())
+        processor.close()
+        
+        expected = item.pop('encoded')
+        uploader = BlockchainUploader(tmp_config)
+        
+        assert uploader._encoded(item) == expected
+        assert FixedPointEncoder().encode(item) == expected
@@ -0,0 +1,79 @@
+"""Test Merkle batch commitments."""
+
+import math
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from uploaders.blockchain_uploader import BlockchainUploader
+from uploaders.merkle import MerkleStore, MerkleTree, verify_proof
+
+
+def _encoded(n):
+    """Build distinct canonical record encodings."""
+    return [f'{{"symbol":"S{i}","timestamp":{1705329000 + i}}}' for i in range(n)]
+
+
+class TestMerkleTree:
+    """Test tree construction and proofs."""
+    
+    @pytest.mark.parametrize('n', [1, 2, 3, 7, 8, 1001])
+    def test_every_leaf_proves_against_root(self, n):
+        """Test that each record's proof verifies and has at most ceil(log2 n) steps."""
+        encoded = _encoded(n)
+        tree = MerkleTree.build(encoded)
+        
+        for i in (0, n // 2, n - 1):
+            proof = tree.proof(i)
+            assert len(proof) <= math.ceil(math.log2(n)) if n > 1 else proof == []
+            assert verify_proof(encoded[i], proof, tree.root)
+    
+    def test_tampered_record_or_wrong_position_fails(self):
+        """Test that a proof only verifies the record it was issued for."""
+        encoded = _encoded(5)
+        tree = MerkleTree.build(encoded)
+        
+        assert not verify_proof(encoded[1], tree.proof(2), tree.root)
+        assert not verify_proof(encoded[2].replace('S2', 'S9'), tree.proof(2), tree.root)
+    
+    def test_odd_node_is_not_duplicated(self):
+        """Test that a batch and the batch with its last record repeated commit differently."""
+        encoded = _encoded(3)
+        
+        assert MerkleTree.build(encoded).root != MerkleTree.build(encoded + encoded[-1:]).root
+
+
+def test_stored_tree_serves_proofs(tmp_config):
+    """Test that proofs come from the stored tree after the upload."""
+    config = tmp_config
+    config.features.dry_run = True
+    uploader = BlockchainUploader(config)
+    batch = [{'symbol': f'S{i}', 'quality_score': 1.0, 'encoded': text} for i, text in enumerate(_encoded(6))]
+    
+    tree = uploader._commit_batch(batch)
+    store = MerkleStore(Path(config.storage.processed_data_dir) / 'uploads' / 'merkle')
+    with pytest.raises(FileNotFoundError):
+        store.load(tree.root)
+    
+    assert uploader._upload_single_batch(batch, 1)
+    proof = uploader.inclusion_proof(tree.root, 4)
+    restored = store.load(tree.root)
+    
+    assert restored.leaves == 6
+    assert verify_proof(batch[4]['encoded'], proof['proof'], proof['root'])
+    
+    with pytest.raises(FileNotFoundError):
+        uploader.inclusion_proof('00' * 32, 0)
+
+
+def test_failed_batch_leaves_no_tree(tmp_config):
+    """Test that a batch whose root was never accepted stores no tree."""
+    tmp_config.blockchain.upload_config.update(max_retries=2, retry_delay=0, batch_delay=0)
+    uploader = BlockchainUploader(tmp_config)
+    uploader._submit_transaction = Mock(side_effect=ConnectionError('node down'))
+    batch = [{'symbol': f'S{i}', 'quality_score': 1.0, 'encoded': text} for i, text in enumerate(_encoded(3))]
+    
+    assert not uploader._upload_single_batch(batch, 1)
+    assert uploader._submit_transaction.call_count == 2
+    assert list((Path(tmp_config.storage.processed_data_dir) / 'uploads' / 'merkle').glob('*.npy')) == []
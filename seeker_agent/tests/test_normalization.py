@@ -0,0 +1,116 @@
+"""Test history-aware normalization."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import NormalizationConfig
+from processors.normalization import ScalingCache, fit_params
+from storage.bar_store import BarStore
+
+
+@pytest.fixture
+def history():
+    """Sixty recent daily bars trading between 90 and 110."""
+    dates = pd.date_range(end=pd.Timestamp.now(tz='UTC').normalize(), periods=60, freq='D')
+    close = np.linspace(95, 105, len(dates))
+    frame = pd.DataFrame({
+        'Open': close, 'High': close + 5, 'Low': close - 5, 'Close': close, 'Volume': 1000
+    }, index=dates)
+    return BarStore.from_frame(frame)
+
+
+def _record(symbol, low, high):
+    """Build a raw record with the given range."""
+    mid = (low + high) / 2
+    now = pd.Timestamp.now(tz='UTC').isoformat()
+    return {
+        'source': 'yahoo_finance', 'symbol': symbol, 'timestamp': now, 'collected_at': now,
+        'prices': {'open': mid, 'high': high, 'low': low, 'close': mid, 'volume': 100}
+    }
+
+
+class TestScalingCache:
+    """Test parameter fitting, caching and refresh."""
+    
+    def test_fit_params(self, history):
+        """Test the parameters of each method."""
+        values = np.concatenate([history[f] for f in ('open', 'high', 'low', 'close')])
+        
+        assert fit_params('minmax', history) == {'min_price': 90.0, 'max_price': 110.0}
+        assert fit_params('zscore', history)['std'] == pytest.approx(values.std())
+        assert fit_params('robust', history)['median'] == pytest.approx(np.median(values))
+    
+    def test_cached_until_refresh(self, history):
+        """Test that history is read once per refresh interval."""
+        calls = []
+        
+        def load(symbol):
+            calls.append(symbol)
+            return history
+        
+        cache = ScalingCache(NormalizationConfig(refresh_interval=3600), load)
+        cache.get('AAPL')
+        cache.get('AAPL')
+        assert calls == ['AAPL']
+        
+        cache.config.refresh_interval = 0
+        cache.get('AAPL')
+        assert calls == ['AAPL', 'AAPL']
+    
+    def test_too_little_history(self, history):
+        """Test that symbols below min_bars get no parameters."""
+        cache = ScalingCache(NormalizationConfig(min_bars=100), lambda symbol: history)
+        
+        assert cache.get('AAPL') is None
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_minmax_range_widens(self, history):
+        """Test that a new extreme widens the cached range."""
+        cache = ScalingCache(NormalizationConfig(), lambda symbol: history)
+        cache.get('AAPL')
+        
+        params = cache.observe('AAPL', 95.0, 120.0)
+        
+        assert (params['min_price'], params['max_price']) == (90.0, 120.0)
+        assert cache.get('AAPL')['max_price'] == 120.0
+
+
+class TestProcessorNormalization:
+    """Test normalization through the processor."""
+    
+    @pytest.fixture
+    def processor(self, tmp_config, history):
+        from processors.data_processor import DataProcessor
+        
+        processor = DataProcessor(tmp_config)
+        processor.bar_store.append('AAPL', history)
+        yield processor
+        processor.close()
+    
+    def test_values_comparable_across_bars(self, processor):
+        """Test that bars are scaled on the symbol's range instead of their own."""
+        narrow, wide = processor.process_batch([_record('AAPL', 99.0, 101.0), _record('AAPL', 90.0, 110.0)])
+        
+        assert narrow['normalized_prices']['high'] == 550000
+        assert narrow['normalized_prices']['low'] == 450000
+        assert wide['normalized_prices']['high'] == 1000000
+        assert narrow['normalized_prices']['_normalization']['scope'] == 'history'
+    
+    @pytest.mark.parametrize('method', ['zscore', 'robust'])
+    def test_other_methods(self, processor, method):
+        """Test that zscore and robust scaling use the cached center and spread."""
+        processor.processing_config.normalization.method = method
+        processor.scaling = type(processor.scaling)(processor.processing_config.normalization, processor._load_history)
+        
+        processed = processor.process(_record('AAPL', 99.0, 101.0))
+        
+        assert processed['normalized_prices']['close'] == pytest.approx(0.0, abs=0.05)
+        assert processed['normalized_prices']['_normalization']['method'] == method
+    
+    def test_falls_back_without_history(self, processor):
+        """Test per-bar scaling for a symbol with no stored bars."""
+        processed = processor.process(_record('NEW', 99.0, 101.0))
+        
+        assert processed['normalized_prices']['high'] == 1000000
+        assert 'scope' not in processed['normalized_prices']['_normalization']
@@ -0,0 +1,96 @@
+"""Test streaming outlier detection."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.config import OutlierDetectionConfig
+from processors.outliers import OutlierDetector, P2Quantile, Welford
+from storage.bar_store import BarStore
+
+
+@pytest.fixture
+def closes():
+    """Random walk closes with 1% daily moves."""
+    rng = np.random.default_rng(11)
+    dates = pd.date_range('2023-01-01', periods=400, freq='D', tz='UTC')
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates)))), index=dates)
+
+
+class TestEstimators:
+    """Test the constant-memory estimators."""
+    
+    def test_welford_exact_until_capped(self):
+        """Test exact mean/variance before the cap and bounded memory after."""
+        values = np.random.default_rng(0).normal(5, 2, 100)
+        moments = Welford(1000)
+        for value in values:
+            moments.add(value)
+        
+        assert moments.mean == pytest.approx(values.mean())
+        assert moments.std == pytest.approx(values.std())
+    
+    def test_welford_tracks_regime_change(self):
+        """Test that the capped estimator forgets an old regime."""
+        moments = Welford(50)
+        for value in np.random.default_rng(0).normal(0, 1, 1000):
+            moments.add(value)
+        for value in np.random.default_rng(1).normal(10, 1, 500):
+            moments.add(value)
+        
+        assert moments.mean == pytest.approx(10, abs=0.5)
+    
+    @pytest.mark.parametrize('p', [0.25, 0.5, 0.75])
+    def test_p2_quantile_accuracy(self, p):
+        """Test the P² estimate against the exact quantile."""
+        values = np.random.default_rng(2).normal(0, 1, 5000)
+        sketch = P2Quantile(p)
+        for value in values:
+            sketch.add(value)
+        
+        assert sketch.value() == pytest.approx(np.quantile(values, p), abs=0.05)
+
+
+class TestOutlierDetector:
+    """Test per-symbol detection against recent history."""
+    
+    @pytest.mark.parametrize('method', ['iqr', 'zscore'])
+    def test_flags_only_the_spike(self, closes, method):
+        """Test that ordinary moves pass and a 15% jump is flagged."""
+        detector = OutlierDetector(OutlierDetectionConfig(method=method, threshold=5.0, window=100))
+        flags = [detector.check('AAPL', ts, close) for ts, close in closes.items()]
+        
+        assert not any(flags)
+        assert detector.check('AAPL', closes.index[-1] + pd.Timedelta(days=1), closes.iloc[-1] * 1.15)
+    
+    def test_warming_up_never_flags(self, closes):
+        """Test that a symbol is not flagged before min_samples returns."""
+        detector = OutlierDetector(OutlierDetectionConfig(min_samples=30))
+        for ts, close in closes.iloc[:10].items():
+            detector.check('AAPL', ts, close)
+        
+        assert not detector.check('AAPL', closes.index[10], closes.iloc[9] * 2)
+        assert detector.get_stats()['warming_up'] == 11
+    
+    def test_redelivered_bar_counted_once(self, closes):
+        """Test that re-scoring the latest bar does not add it to the statistics twice."""
+        detector = OutlierDetector(OutlierDetectionConfig())
+        for ts, close in closes.iloc[:50].items():
+            detector.check('AAPL', ts, close)
+            detector.check('AAPL', ts, close)
+        
+        state = detector.states['AAPL']
+        assert state.moments.count == 48
+        assert detector.check('AAPL', closes.index[10], 1.0) is False
+        assert detector.get_stats()['stale'] == 1
+    
+    def test_warm_start_from_history(self, closes):
+        """Test that history lets a new symbol be scored immediately."""
+        frame = pd.DataFrame({'Open': closes, 'High': closes, 'Low': closes, 'Close': closes, 'Volume': 1})
+        history = BarStore.from_frame(frame)
+        detector = OutlierDetector(OutlierDetectionConfig(), history=lambda symbol: history)
+        
+        spike = detector.check('AAPL', closes.index[-1] + pd.Timedelta(days=1), closes.iloc[-1] * 1.2)
+        
+        assert spike
+        assert detector.states['AAPL'].samples >= 250
@@ -0,0 +1,141 @@
+"""Test the streaming pipeline."""
+
+import threading
+from unittest.mock import Mock
+
+from core.pipeline import StreamingPipeline
+
+
+class _Collector:
+    """Collector that yields records until released."""
+    
+    def __init__(self, count, gate=None):
+        self.count = count
+        self.gate = gate
+        self.yielded = 0
+        self.closed = False
+    
+    def iter_collect(self):
+        try:
+            for i in range(self.count):
+                if self.gate is not None and i == self.count // 2:
+                    assert self.gate.wait(timeout=5)
+                self.yielded += 1
+                yield {'symbol': f'S{i}', 'n': i}
+        finally:
+            self.closed = True
+
+
+def _processor():
+    """Processor mock that tags records."""
+    processor = Mock()
+    processor.process_batch.side_effect = lambda batch, commit=True: [dict(r, processed=True) for r in batch]
+    return processor
+
+
+class TestStreamingPipeline:
+    """Test streaming, backpressure and shutdown."""
+    
+    def test_streams_all_records(self):
+        """Test that every record from every collector reaches the uploader."""
+        received = []
+        
+        def upload(records):
+            received.extend(records)
+            return len(received)
+        
+        collectors = {'a': _Collector(25), 'b': _Collector(15)}
+        stats = StreamingPipeline(collectors, _processor(), upload, queue_size=4, batch_size=3).run()
+        
+        assert stats['collected'] == 40
+        assert stats['processed'] == 40
+        assert stats['uploaded'] == 40
+        assert all(r['processed'] for r in received)
+        assert all(c.closed for c in collectors.values())
+    
+    def test_upload_starts_before_collection_finishes(self):
+        """Test that the first record is uploaded while the collector is still blocked."""
+        gate = threading.Event()
+        collector = _Collector(10, gate)
+        
+        def upload(records):
+            count = 0
+            for record in records:
+                # Collector is parked half way until we see the first record
+                gate.set()
+                count += 1
+            return count
+        
+        stats = StreamingPipeline({'a': collector}, _processor(), upload, queue_size=2).run()
+        
+        assert stats['uploaded'] == 10
+    
+    def test_backpressure_bounds_collector(self):
+        """Test that a stalled uploader stops the collector from running ahead."""
+        collector = _Collector(1000)
+        seen = []
+        
+        def upload(records):
+            for record in records:
+                seen.append(collector.yielded)
+                if len(seen) == 1:
+                    threading.Event().wait(0.3)
+            return len(seen)
+        
+        StreamingPipeline({'a': collector}, _processor(), upload, queue_size=5, batch_size=5).run()
+        
+        # Two queues and one in-flight batch are all that may be buffered
+        assert seen[0] <= 5 + 5 + 5 + 2
+    
+    def test_early_upload_exit_closes_collectors(self):
+        """Test that the pipeline shuts down when the upload stage stops early."""
+        collector = _Collector(1000)
+        
+        def upload(records):
+            next(iter(records))
+            return 1
+        
+        stats = StreamingPipeline({'a': collector}, _processor(), upload, queue_size=2).run()
+        
+        assert stats['uploaded'] == 1
+        assert collector.closed
+        assert collector.yielded < 1000
+    
+    def test_journal_runs_before_upload_and_dedup_commit(self):
+        """Test that each micro-batch is journaled before its bars are indexed or uploaded."""
+        processor = _processor()
+        journaled = []
+        
+        def journal(records):
+            processor.commit.assert_not_called()
+            journaled.extend(records)
+            return [(len(journaled) - len(records) + i, record) for i, record in enumerate(records)]
+        
+        def upload(entries):
+            entries = list(entries)
+            assert all(record is journaled[row_id] for row_id, record in entries)
+            return len(entries)
+        
+        stats = StreamingPipeline({'a': _Collector(4)}, processor, upload, batch_size=4, journal=journal).run()
+        
+        assert stats['uploaded'] == 4
+        processor.process_batch.assert_called_once()
+        assert processor.process_batch.call_args.kwargs == {'commit': False}
+        processor.commit.assert_called_once_with(journaled)
+
+
+def test_uploader_stream_sends_partial_last_batch(tmp_config):
+    """Test that upload_stream batches records and flushes the remainder."""
+    from uploaders.blockchain_uploader import BlockchainUploader
+    
+    config = tmp_config
+    config.blockchain.upload_config['batch_size'] = 4
+    config.blockchain.upload_config['batch_delay'] = 0
+    config.blockchain.upload_config['max_in_flight'] = 1
+    uploader = BlockchainUploader(config)
+    uploader._upload_single_batch = Mock(return_value=True)
+    
+    uploaded = uploader.upload_stream(iter([{'symbol': 'A'}] * 10))
+    
+    assert uploaded == 10
+    assert [len(c.args[0]) for c in uploader._upload_single_batch.call_args_list] == [4, 4, 2]
@@ -0,0 +1,109 @@
+"""Test sharded process-pool processing."""
+
+import numpy as np
+import pandas as pd
+
+from processors.data_processor import DataProcessor
+from core.pool import ShardedProcessPool
+
+
+def _config(make_config, name, mode):
+    """Config writing into its own temporary directories."""
+    config = make_config(name)
+    config.performance.processing_mode = mode
+    config.performance.max_workers = 3
+    return config
+
+
+def _batches(symbols=8, days=60, per_batch=40):
+    """Interleaved daily bars of several random-walk symbols, split into batches."""
+    rng = np.random.default_rng(5)
+    dates = pd.date_range('2024-01-01', periods=days, freq='D', tz='UTC')
+    records = []
+    for ts in dates:
+        for i in range(symbols):
+            close = float(100 + i + rng.normal(0, 1))
+            records.append({
+                'source': 'yahoo_finance', 'symbol': f"S{i}", 'timestamp': ts.isoformat(),
+                'collected_at': ts.isoformat(),
+                'prices': {'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close, 'volume': 1000}
+            })
+    records.append({'symbol': 'MISSING'})
+    return [records[i:i + per_batch] for i in range(0, len(records), per_batch)]
+
+
+def _strip(item):
+    item = dict(item)
+    item.pop('processed_at')
+    return item
+
+
+class TestShardedProcessPool:
+    """Test symbol sharding and ordered merging."""
+    
+    def test_sharding_is_sticky(self, make_config):
+        """Test that a symbol always maps to the same worker."""
+        pool = ShardedProcessPool(_config(make_config, 'pool', 'process'), 3)
+        
+        assert {pool.shard_of('AAPL') for _ in range(10)} == {pool.shard_of('AAPL')}
+        assert {pool.shard_of(f"S{i}") for i in range(50)} == {0, 1, 2}
+    
+    def test_matches_inline(self, make_config):
+        """Test that pooled results equal inline results, in input order."""
+        inline = DataProcessor(_config(make_config, 'inline', 'inline'))
+        pooled = DataProcessor(_config(make_config, 'pooled', 'process'))
+        
+        try:
+            for batch in _batches():
+                expected = [_strip(item) for item in inline.process_batch(batch)]
+                actual = [_strip(item) for item in pooled.process_batch(batch)]
+                assert actual == expected
+            
+            stats = pooled.get_stats()['pool']
+            assert stats['failed_shards'] == 0
+            assert sum(worker['outliers']['checked'] for worker in stats['worker_stats'].values()) == 480
+        finally:
+            inline.close()
+            pooled.close()
+    
+    def test_workers_warm_up_like_inline(self, make_config):
+        """Test that symbols without stored bars get the provider's history in worker processes too."""
+        dates = pd.date_range(end=pd.Timestamp.now(tz='UTC').normalize(), periods=60, freq='D')
+        close = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(dates)))
+        history = pd.DataFrame({
+            'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': 1000
+        }, index=dates)
+        calls = []
+        
+        def provider(symbol, days):
+            calls.append(symbol)
+            return history.iloc[:-1]
+        
+        last = history.iloc[-1]
+        batch = [{
+            'source': 'yahoo_finance', 'symbol': symbol, 'timestamp': dates[-1].isoformat(),
+            'collected_at': dates[-1].isoformat(),
+            'prices': {'open': last.Open, 'high': last.High, 'low': last.Low, 'close': last.Close, 'volume': 1000}
+        } for symbol in ('S0', 'S1', 'S2')]
+        
+        inline = DataProcessor(_config(make_config, 'inline', 'inline'), history_provider=provider)
+        pooled = DataProcessor(_config(make_config, 'pooled', 'process'), history_provider=provider)
+        
+        def strip(item):
+            # When the scaling parameters were fitted is not part of the output
+            item = _strip(item)
+            item['normalized_prices'] = dict(item['normalized_prices'])
+            item['normalized_prices']['_normalization'] = {
+                k: v for k, v in item['normalized_prices']['_normalization'].items() if k != 'fitted_at'
+            }
+            return item
+        
+        try:
+            expected = [strip(item) for item in inline.process_batch(batch)]
+            actual = [strip(item) for item in pooled.process_batch(batch)]
+            assert actual == expected
+            assert actual[0]['features']['sma_20'] is not None
+            assert sorted(calls) == ['S0', 'S0', 'S1', 'S1', 'S2', 'S2']
+        finally:
+            inline.close()
+            pooled.close()
@@ -0,0 +1,66 @@
+"""Test token bucket rate limiter."""
+
+import asyncio
+import time
+import threading
+
+from utils.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Test rate limiter."""
+    
+    def test_disabled_never_waits(self):
+        """Test that a zero interval never blocks."""
+        limiter = RateLimiter(0)
+        
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+        
+        assert time.monotonic() - start < 0.1
+        assert limiter.get_stats()['acquired'] == 100
+        assert limiter.get_stats()['waited'] == 0
+    
+    def test_burst_then_paced(self):
+        """Test that burst tokens are free and later calls are paced."""
+        limiter = RateLimiter(0.05, burst=3)
+        
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.03
+        
+        for _ in range(2):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+        
+        stats = limiter.get_stats()
+        assert stats['waited'] == 2
+        assert stats['max_wait'] > 0
+    
+    def test_threads_share_budget(self):
+        """Test that concurrent threads are paced by one shared bucket."""
+        limiter = RateLimiter(0.02)
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(6)]
+        
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert time.monotonic() - start >= 0.09
+    
+    def test_acquire_async(self):
+        """Test that asyncio callers are paced without blocking the loop."""
+        limiter = RateLimiter(0.02)
+        
+        async def run():
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(4)))
+        
+        start = time.monotonic()
+        asyncio.run(run())
+        
+        assert time.monotonic() - start >= 0.05
+        assert limiter.get_stats()['acquired'] == 4
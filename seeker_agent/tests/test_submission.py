@@ -0,0 +1,209 @@
+"""Test pipelined batch submission."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+from uploaders.blockchain_uploader import BlockchainUploader
+from uploaders.submission import AdaptiveBackoff, AdaptiveBatcher, NodeBusyError, NonceManager
+
+
+def _config(config, **upload_config):
+    """Configure a temporary-directory config for fast dry-run uploads."""
+    config.dedup.enabled = False
+    config.features.dry_run = True
+    config.blockchain.upload_config.update({'batch_size': 2, 'retry_delay': 0, 'adaptive_batching': False, **upload_config})
+    return config
+
+
+def _records(n):
+    """Build minimal encoded records."""
+    return [{'symbol': f'S{i}', 'quality_score': 1.0, 'encoded': '{}'} for i in range(n)]
+
+
+class TestAdaptiveBackoff:
+    """Test node-driven pacing."""
+    
+    def test_grows_on_failure_and_shrinks_on_success(self):
+        """Test that failures double the delay up to the cap and successes halve it."""
+        backoff = AdaptiveBackoff(step=1.0, max_delay=5.0)
+        assert backoff.current() == 0
+        
+        for expected in (1.0, 2.0, 4.0, 5.0):
+            backoff.failure()
+            assert backoff.current() == expected
+        
+        backoff.success()
+        assert backoff.current() == 2.5
+        for _ in range(5):
+            backoff.success()
+        assert backoff.current() == 0
+    
+    def test_honors_retry_after(self):
+        """Test that a node's retry hint sets a longer delay."""
+        backoff = AdaptiveBackoff(step=1.0, max_delay=5.0)
+        backoff.failure(NodeBusyError('busy', retry_after=30))
+        
+        assert backoff.current() == 30
+        assert backoff.get_stats()['throttled'] == 1
+
+
+class TestNonceManager:
+    """Test nonce allocation."""
+    
+    def test_released_nonces_are_reused_and_counter_persists(self, tmp_path):
+        """Test that released nonces go out first and fresh ones resume after a restart."""
+        nonces = NonceManager(tmp_path / 'nonce')
+        assert [nonces.allocate() for _ in range(4)] == [0, 1, 2, 3]
+        
+        nonces.release(2)
+        nonces.release(1)
+        assert [nonces.allocate() for _ in range(3)] == [1, 2, 4]
+        
+        assert NonceManager(tmp_path / 'nonce').allocate() == 5
+    
+    def test_released_nonces_survive_restart(self, tmp_path):
+        """Test that a nonce released before a restart is reused instead of leaving a gap."""
+        nonces = NonceManager(tmp_path / 'nonce')
+        assert [nonces.allocate() for _ in range(3)] == [0, 1, 2]
+        nonces.release(1)
+        
+        restarted = NonceManager(tmp_path / 'nonce')
+        assert [restarted.allocate() for _ in range(2)] == [1, 3]
+        assert restarted.get_stats() == {'next_nonce': 4, 'released': 0}
+    
+    def test_reads_plain_counter_file(self, tmp_path):
+        """Test that a counter-only nonce file from an older version is resumed."""
+        (tmp_path / 'nonce').write_text('7')
+        assert NonceManager(tmp_path / 'nonce').allocate() == 7
+
+
+class TestPipelinedUpload:
+    """Test concurrent submission through the uploader."""
+    
+    def test_batches_overlap_with_ordered_nonces(self, tmp_config):
+        """Test that up to max_in_flight transactions are pending at once."""
+        uploader = BlockchainUploader(_config(tmp_config, max_in_flight=3))
+        lock = threading.Lock()
+        pending = 0
+        peak = 0
+        submitted = []
+        
+        def submit(signed_tx):
+            nonlocal pending, peak
+            with lock:
+                pending += 1
+                peak = max(peak, pending)
+            time.sleep(0.1)
+            with lock:
+                pending -= 1
+                submitted.append((signed_tx['nonce'], signed_tx['parameters']['symbols']))
+            return f"tx_{signed_tx['nonce']}"
+        
+        uploader._submit_transaction = submit
+        
+        assert uploader.upload_batch(_records(12)) == 12
+        assert peak == 3
+        
+        # Without failures, nonces follow batch order
+        assert sorted(submitted) == [(i, f'S{2 * i},S{2 * i + 1}') for i in range(6)]
+    
+    def test_busy_node_triggers_backoff(self, tmp_config):
+        """Test that a throttled submission is retried and raises the dispatch delay."""
+        uploader = BlockchainUploader(_config(tmp_config, max_in_flight=1, batch_delay=0.05))
+        calls = []
+        
+        def submit(signed_tx):
+            calls.append(signed_tx['nonce'])
+            if len(calls) == 1:
+                raise NodeBusyError('429 Too Many Requests', retry_after=0.1)
+            return 'tx'
+        
+        uploader._submit_transaction = submit
+        
+        assert uploader.upload_stream(iter(_records(4))) == 4
+        assert calls == [0, 0, 1]
+        
+        stats = uploader.get_upload_stats()
+        assert stats['backoff']['throttled'] == 1
+        assert stats['backoff']['max_delay_seen'] == 0.1
+        assert stats['nonces'] == {'next_nonce': 2, 'released': 0}
+    
+    def test_retry_waits_for_retry_after(self, tmp_config, monkeypatch):
+        """Test that a retry sleeps at least as long as the node asked."""
+        uploader = BlockchainUploader(_config(tmp_config, max_in_flight=1, retry_delay=1))
+        sleeps = []
+        monkeypatch.setattr('uploaders.blockchain_uploader.time.sleep', sleeps.append)
+        calls = []
+        
+        def submit(signed_tx):
+            calls.append(signed_tx['nonce'])
+            if len(calls) == 1:
+                raise NodeBusyError('503 Service Unavailable', retry_after=30)
+            return 'tx'
+        
+        uploader._submit_transaction = submit
+        
+        assert uploader._upload_single_batch(_records(2), 1, nonce=0)
+        assert sleeps == [30]
+
+
+class TestAdaptiveBatcher:
+    """Test batch sizing."""
+    
+    def test_stream_batches_are_sized_from_the_backlog(self, tmp_config):
+        """Test that streamed batches pass the records still waiting to the batcher."""
+        uploader = BlockchainUploader(_config(tmp_config))
+        uploader.batcher.next_size = Mock(wraps=uploader.batcher.next_size)
+        
+        assert uploader.upload_stream(_records(5)) == 5
+        assert [call.args[0] for call in uploader.batcher.next_size.call_args_list] == [5, 3, 1]
+        
+        uploader.batcher.next_size.reset_mock()
+        assert uploader.upload_stream(iter(_records(2)), pending=lambda: 42) == 2
+        assert [call.args[0] for call in uploader.batcher.next_size.call_args_list] == [42, 42]
+    
+    def test_grows_with_backlog_and_shrinks_on_failure(self):
+        """Test that a backed-up queue grows batches and failures shrink them."""
+        batcher = AdaptiveBatcher(8, min_size=1, max_size=100, target_latency=1.0,
+                                  gas_limit=100000, gas_per_record=100, max_in_flight=2)
+        
+        assert batcher.next_size(backlog=10) == 8
+        assert batcher.next_size(backlog=1000) == 10
+        
+        batcher.observe(None, ok=False)
+        assert batcher.size == 5
+        batcher.observe(5.0, ok=True)
+        assert batcher.size == 3
+        
+        # Slow confirmations stop growth
+        assert batcher.next_size(backlog=1000) == 3
+        assert batcher.get_stats()['shrunk'] == 2
+    
+    def test_capped_by_gas_budget(self):
+        """Test that batches stay within 90% of the gas limit."""
+        batcher = AdaptiveBatcher(10, min_size=1, max_size=500, target_latency=1.0,
+                                  gas_limit=10000, gas_per_record=300, fee=1000)
+        
+        for _ in range(50):
+            batcher.next_size(backlog=10 ** 6)
+        
+        stats = batcher.get_stats()
+        assert stats['size'] == stats['gas_cap'] == 30
+        assert stats['estimated_gas'] <= 9000
+        assert stats['fee_per_record'] == 1000 / 30
+
+
+def test_uploader_sizes_batches_and_lists_all_symbols(tmp_config):
+    """Test that a large backlog is sent in growing batches with every symbol listed once."""
+    uploader = BlockchainUploader(_config(tmp_config, adaptive_batching=True, max_in_flight=1))
+    records = _records(60)
+    
+    assert uploader.upload_batch(records) == 60
+    
+    sizes = uploader.get_upload_stats()['batching']['sizes']
+    assert max(sizes) > 2
+    assert sum(size * count for size, count in sizes.items()) == 60
+    
+    tx = uploader._create_transaction('root', records[:12] + records[:3])
+    assert tx['parameters']['symbols'] == ','.join(f'S{i}' for i in range(12))
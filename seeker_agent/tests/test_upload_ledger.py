@@ -0,0 +1,68 @@
+"""Test the upload ledger."""
+
+import json
+from datetime import datetime
+
+from storage.upload_ledger import UploadLedger
+from uploaders.blockchain_uploader import BlockchainUploader
+
+
+def _batch(*symbols):
+    """Build uploaded records."""
+    return [{'symbol': symbol, 'timestamp': '2024-01-15T00:00:00+00:00'} for symbol in symbols]
+
+
+class TestUploadLedger:
+    """Test indexed lookups and running totals."""
+    
+    def test_lookups_and_totals(self, tmp_path):
+        """Test lookups by tx_id, file hash, symbol and time."""
+        ledger = UploadLedger(tmp_path / 'ledger.db')
+        ledger.record('tx_1', 'root_a', _batch('AAPL', 'MSFT'), uploaded_at=1000.0)
+        ledger.record('tx_2', 'root_b', _batch('AAPL'), uploaded_at=2000.0)
+        ledger.record('tx_2', 'root_b', _batch('AAPL'), uploaded_at=2000.0)
+        
+        assert ledger.totals() == {'total_uploads': 2, 'total_records': 3}
+        assert ledger.get('tx_1')['symbols'] == ['AAPL', 'MSFT']
+        assert ledger.get('tx_missing') is None
+        assert [u['tx_id'] for u in ledger.by_file_hash('root_b')] == ['tx_2']
+        assert [u['tx_id'] for u in ledger.between(1500, 2500)] == ['tx_2']
+        
+        history = ledger.symbol_history('AAPL')
+        assert [(h['tx_id'], h['file_hash'], h['position']) for h in history] == \
+            [('tx_2', 'root_b', 0), ('tx_1', 'root_a', 0)]
+        assert [h['tx_id'] for h in ledger.symbol_history('MSFT', since=1500)] == []
+        ledger.close()
+    
+    def test_imports_tracking_files(self, tmp_path):
+        """Test that legacy per-upload JSON files are migrated once."""
+        tracking = {
+            'tx_id': 'tx_old', 'file_hash': 'abc', 'uploaded_at': datetime(2024, 1, 15, 12).isoformat(),
+            'batch_size': 2, 'symbols': ['AAPL', 'MSFT'], 'network': 'testnet', 'contract': 'prophetia.aleo'
+        }
+        (tmp_path / 'upload_20240115_120000.json').write_text(json.dumps(tracking))
+        ledger = UploadLedger(tmp_path / 'ledger.db')
+        
+        assert ledger.import_tracking_files(tmp_path) == 1
+        assert ledger.import_tracking_files(tmp_path) == 0
+        assert ledger.get('tx_old')['uploaded_at'] == tracking['uploaded_at']
+        assert (tmp_path / 'upload_20240115_120000.json.imported').exists()
+        ledger.close()
+
+
+def test_uploader_records_batches_in_ledger(tmp_config):
+    """Test that accepted batches land in the ledger and feed the stats."""
+    config = tmp_config
+    config.features.dry_run = True
+    config.dedup.enabled = False
+    config.blockchain.upload_config.update(batch_size=2, max_in_flight=2)
+    uploader = BlockchainUploader(config)
+    records = [{**item, 'quality_score': 1.0, 'encoded': f'"{i}"'} for i, item in enumerate(_batch('A', 'B', 'C'))]
+    
+    assert uploader.upload_batch(records) == 3
+    
+    stats = uploader.get_upload_stats()
+    history = uploader.ledger.symbol_history('C')
+    assert (stats['total_uploads'], stats['total_records']) == (2, 3)
+    assert uploader.inclusion_proof(history[0]['file_hash'], history[0]['position'])['proof'] == []
+    uploader.close()
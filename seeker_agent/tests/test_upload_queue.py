@@ -0,0 +1,137 @@
+"""Test the durable upload queue."""
+
+from unittest.mock import Mock
+
+from storage.upload_queue import UploadQueue
+from uploaders.blockchain_uploader import BlockchainUploader
+
+
+def _records(n, day=15):
+    """Build minimal encoded records for distinct bars."""
+    return [
+        {'symbol': f'S{i}', 'timestamp': f'2024-01-{day}T00:00:00Z', 'quality_score': 1.0, 'encoded': '{}'}
+        for i in range(n)
+    ]
+
+
+def _uploader(config):
+    """Create an uploader from a temporary-directory config."""
+    config.blockchain.upload_config.update(batch_size=2, max_in_flight=1, adaptive_batching=False)
+    return BlockchainUploader(config)
+
+
+class TestUploadQueue:
+    """Test journaling, claiming and recovery."""
+    
+    def test_claim_ack_release(self, tmp_path):
+        """Test that claims go oldest first and acknowledged records leave the queue."""
+        queue = UploadQueue(tmp_path / 'queue.db')
+        ids = queue.enqueue(_records(5))
+        
+        first = queue.claim(2)
+        assert [row_id for row_id, _ in first] == ids[:2]
+        assert first[0][1]['symbol'] == 'S0'
+        
+        queue.ack(ids[:1])
+        queue.release(ids[1:2])
+        
+        assert [row_id for row_id, _ in queue.claim(10, after=ids[1])] == ids[2:]
+        assert queue.get_stats()['pending'] == 1
+        assert len(queue) == 4
+        queue.close()
+    
+    def test_in_flight_records_recovered_after_crash(self, tmp_path):
+        """Test that records claimed by a process that died are pending again on open."""
+        queue = UploadQueue(tmp_path / 'queue.db')
+        queue.enqueue(_records(3))
+        queue.claim(2)
+        queue.close()
+        
+        reopened = UploadQueue(tmp_path / 'queue.db')
+        stats = reopened.get_stats()
+        
+        assert stats['recovered'] == 2
+        assert stats['pending'] == 3 and stats['in_flight'] == 0
+        reopened.close()
+    
+    def test_dead_letters_after_max_attempts(self, tmp_path):
+        """Test that a record failing every drain stops being claimed."""
+        queue = UploadQueue(tmp_path / 'queue.db', max_attempts=2)
+        ids = queue.enqueue(_records(2))
+        
+        for _ in range(2):
+            queue.release([row_id for row_id, _ in queue.claim(1)])
+        
+        assert [row_id for row_id, _ in queue.claim(10)] == ids[1:]
+        assert [row_id for row_id, _ in queue.dead_letters()] == ids[:1]
+        assert queue.get_stats()['dead'] == 1
+        assert len(queue) == 1
+        
+        assert queue.requeue_dead() == 1
+        assert queue.get_stats()['pending'] == 1
+        queue.close()
+
+
+class TestQueuedUpload:
+    """Test draining the queue through the uploader."""
+    
+    def test_failed_batches_stay_queued_until_next_drain(self, tmp_path, tmp_config):
+        """Test at-least-once delivery: a failed batch is retried by the next drain."""
+        uploader = _uploader(tmp_config)
+        queue = UploadQueue(tmp_path / 'queue.db')
+        queue.enqueue(_records(4))
+        
+        uploader._upload_single_batch = Mock(side_effect=[False, True])
+        assert uploader.upload_queued(queue) == 2
+        assert uploader._upload_single_batch.call_count == 2
+        assert queue.get_stats()['pending'] == 2
+        
+        uploader._upload_single_batch = Mock(return_value=True)
+        assert uploader.upload_queued(queue) == 2
+        assert len(queue) == 0
+        queue.close()
+    
+    def test_streamed_entries_stay_queued_on_failure(self, tmp_path, tmp_config):
+        """Test that journaled stream entries survive a failed upload and are claimed once."""
+        uploader = _uploader(tmp_config)
+        queue = UploadQueue(tmp_path / 'queue.db')
+        uploader._upload_single_batch = Mock(return_value=False)
+        
+        records = _records(3)
+        assert uploader.upload_queued(queue, iter(zip(queue.enqueue(records), records))) == 0
+        assert uploader._upload_single_batch.call_count == 2
+        assert queue.get_stats()['pending'] == 3
+        queue.close()
+    
+    def test_backlog_already_uploaded_is_not_resubmitted(self, tmp_path, tmp_config):
+        """Test that replayed records whose bars were uploaded are acknowledged without a new transaction."""
+        uploader = _uploader(tmp_config)
+        records = _records(2)
+        uploader.dedup.add_records(records)
+        
+        queue = UploadQueue(tmp_path / 'queue.db')
+        queue.enqueue(records + _records(1, day=16))
+        uploader._upload_single_batch = Mock(return_value=True)
+        
+        assert uploader.upload_queued(queue) == 1
+        assert uploader._upload_single_batch.call_count == 1
+        assert len(queue) == 0
+        queue.close()
+    
+    def test_streamed_batches_are_sized_from_queue_depth(self, tmp_path, tmp_config):
+        """Test that each batch of a stream is sized from the records still pending in the queue."""
+        uploader = _uploader(tmp_config)
+        uploader.dedup = None
+        queue = UploadQueue(tmp_path / 'queue.db')
+        uploader._upload_single_batch = Mock(return_value=True)
+        uploader.batcher.next_size = Mock(wraps=uploader.batcher.next_size)
+        
+        def entries():
+            # One processed micro-batch, journaled as it arrives
+            records = _records(6)
+            yield from zip(queue.enqueue(records), records)
+        
+        assert uploader.upload_queued(queue, entries()) == 6
+        backlogs = [call.args[0] for call in uploader.batcher.next_size.call_args_list]
+        assert backlogs == [0, 0, 4, 2, 0]
+        queue.close()
@@ -0,0 +1,96 @@
+"""Test the shared record schema."""
+
+import random
+
+import pytest
+
+from utils.validation import RAW_RECORD_SCHEMA, Rejection, RejectionStats
+
+
+def _record(**prices):
+    """Build a valid raw record, overriding some price fields."""
+    values = {'open': 150.0, 'high': 155.0, 'low': 148.0, 'close': 152.0, 'volume': 1000}
+    values.update(prices)
+    return {'symbol': 'AAPL', 'timestamp': '2024-01-15T14:30:00', 'prices': values}
+
+
+def _legacy_completeness(data):
+    """Dotted-path completeness as computed before the schema."""
+    fields = ['symbol', 'timestamp', 'prices',
+              'prices.open', 'prices.high', 'prices.low', 'prices.close', 'prices.volume']
+    present = 0
+    for field in fields:
+        value = data
+        for part in field.split('.'):
+            value = value.get(part, {})
+        if (value if '.' in field else field in data):
+            present += 1
+    return present / len(fields)
+
+
+class TestRecordSchema:
+    """Test scalar and batch validation."""
+    
+    @pytest.mark.parametrize('record, expected', [
+        (_record(), None),
+        ({'symbol': 'AAPL', 'prices': {}}, Rejection('missing_field', 'timestamp')),
+        ({'symbol': 'AAPL', 'timestamp': 't', 'prices': None}, Rejection('invalid_prices', 'prices')),
+        ({'symbol': 'AAPL', 'timestamp': 't', 'prices': {'open': 1.0}}, Rejection('missing_price', 'high')),
+        (_record(volume=10.5), Rejection('invalid_type', 'volume')),
+        (_record(low=-1.0), Rejection('non_positive_price', 'low')),
+        (_record(volume=-5), Rejection('negative_volume', 'volume')),
+        (_record(close=160.0), Rejection('inconsistent_ohlc')),
+    ])
+    def test_reasons(self, record, expected):
+        """Test the structured reason of each failure."""
+        assert RAW_RECORD_SCHEMA.validate(record) == expected
+    
+    def test_batch_matches_scalar(self):
+        """Test that the vectorized form reports exactly what the scalar form does."""
+        rng = random.Random(3)
+        records = []
+        for _ in range(500):
+            record = _record(**{
+                field: rng.choice([rng.uniform(-10, 200), 150.0, 0.0])
+                for field in ('open', 'high', 'low', 'close') if rng.random() < 0.3
+            })
+            if rng.random() < 0.1:
+                record['prices'].pop(rng.choice(list(record['prices'])))
+            if rng.random() < 0.05:
+                record.pop('timestamp')
+            records.append(record)
+        
+        assert RAW_RECORD_SCHEMA.validate_batch(records) == [RAW_RECORD_SCHEMA.validate(r) for r in records]
+        assert RAW_RECORD_SCHEMA.validate_batch([]) == []
+    
+    @pytest.mark.parametrize('record', [
+        _record(),
+        _record(volume=0),
+        {'symbol': 'AAPL', 'timestamp': 't'},
+        {'symbol': 'AAPL', 'timestamp': 't', 'prices': {'open': 1.0, 'close': 0.0}},
+    ])
+    def test_completeness_matches_dotted_paths(self, record):
+        """Test that compiled completeness equals the old dotted-path walk."""
+        assert RAW_RECORD_SCHEMA.completeness(record) == _legacy_completeness(record)
+    
+    def test_rejection_stats(self):
+        """Test counts by reason."""
+        stats = RejectionStats()
+        for record in (_record(close=160.0), _record(close=170.0), _record(low=0.0)):
+            stats.record(RAW_RECORD_SCHEMA.validate(record))
+        
+        assert stats.as_dict() == {'total': 3, 'by_reason': {'inconsistent_ohlc': 2, 'non_positive_price': 1}}
+
+
+def test_processor_reports_rejections(tmp_config):
+    """Test that the processor counts records it rejects by reason."""
+    from processors.data_processor import DataProcessor
+    
+    processor = DataProcessor(tmp_config)
+    
+    processor.process_batch([{'symbol': 'X'}, {'symbol': 'Y', 'timestamp': 't'}])
+    processor.close()
+    
+    assert processor.get_stats()['rejections'] == {
+        'total': 2, 'by_reason': {'missing_field': 2}
+    }
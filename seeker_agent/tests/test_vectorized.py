@@ -0,0 +1,128 @@
+"""Test vectorized batch processing against the scalar path."""
+
+import pytest
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from processors.data_processor import DataProcessor
+from storage.bar_store import BarStore
+
+
+@pytest.fixture
+def processor(tmp_config):
+    """Create a processor writing into a temporary directory."""
+    config = tmp_config
+    # History-aware steps are stateful across calls; covered in their own tests
+    config.data_processing.rolling_features.enabled = False
+    config.data_processing.outlier_detection.scope = 'bar'
+    config.data_processing.normalization.scope = 'bar'
+    return DataProcessor(config)
+
+
+def _record(symbol, open_, high, low, close, volume, age_hours=0.0):
+    """Build a raw collector record."""
+    return {
+        'source': 'yahoo_finance',
+        'symbol': symbol,
+        'timestamp': (datetime.now() - timedelta(hours=age_hours)).isoformat(),
+        'collected_at': datetime.now().isoformat(),
+        'prices': {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        'metadata': {'company_name': symbol},
+        'stats': {}
+    }
+
+
+def _records(count=200, seed=7):
+    """Random well-formed records plus edge cases."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        low = rng.uniform(1, 500)
+        high = low + rng.choice([0.0, rng.uniform(0, 50)])
+        open_ = rng.uniform(low, high) if high > low else low
+        close = rng.uniform(low, high) if high > low else low
+        records.append(_record(f"S{i % 17}", open_, high, low, close, rng.randint(0, 10**7),
+                               age_hours=rng.choice([0.0, 48.0])))
+    
+    records.append(_record('BAD', 150.0, 145.0, 148.0, 152.0, 0))        # inconsistent OHLC
+    records.append(_record('SPIKE', 150.0, 155.0, 148.0, 500.0, 1000))    # outlier
+    records.append(_record('INT', 150, 155, 148, 152, 1000))              # non-float prices
+    records.append(_record('ZERO', 0.0, 1.0, 0.0, 0.5, 10))               # zero open
+    records.append({'symbol': 'MISSING'})                                  # invalid
+    return records
+
+
+def _strip(item):
+    item = dict(item)
+    item.pop('processed_at')
+    return item
+
+
+class TestVectorizedBatch:
+    """Test that process_batch matches process() record for record."""
+    
+    @pytest.mark.parametrize('method', ['minmax', 'standard'])
+    @pytest.mark.parametrize('outliers', ['iqr', 'zscore'])
+    def test_batch_matches_scalar(self, processor, method, outliers):
+        """Test identical output for all normalization and outlier methods."""
+        processor.processing_config.normalization.method = method
+        processor.processing_config.outlier_detection.method = outliers
+        records = _records()
+        
+        scalar = [p for p in (processor._process_record(r) for r in records) if p]
+        batch = processor.process_batch(records)
+        
+        assert len(batch) == len(scalar)
+        assert [_strip(p) for p in batch] == [_strip(p) for p in scalar]
+    
+    @pytest.mark.parametrize('method', ['minmax', 'standard', 'zscore', 'robust'])
+    @pytest.mark.parametrize('scope', ['bar', 'history'])
+    def test_batch_matches_scalar_for_every_normalization(self, make_config, method, scope):
+        """Test identical output for every normalization method and scope."""
+        dates = pd.date_range(end=pd.Timestamp.now(tz='UTC').normalize(), periods=60, freq='D')
+        close = np.linspace(95, 105, len(dates))
+        history = BarStore.from_frame(pd.DataFrame({
+            'Open': close, 'High': close + 5, 'Low': close - 5, 'Close': close, 'Volume': 1000
+        }, index=dates))
+        
+        def build(name):
+            config = make_config(name)
+            config.data_processing.rolling_features.enabled = False
+            config.data_processing.outlier_detection.scope = 'bar'
+            config.data_processing.normalization.method = method
+            config.data_processing.normalization.scope = scope
+            processor = DataProcessor(config)
+            for i in range(17):
+                processor.bar_store.append(f'S{i}', history)
+            return processor
+        
+        scalar_processor, batch_processor = build('scalar'), build('batch')
+        records = _records(60)
+        
+        scalar = [p for p in (scalar_processor._process_record(r) for r in records) if p]
+        batch = batch_processor.process_batch(records)
+        scalar_processor.close()
+        batch_processor.close()
+        
+        def strip(item):
+            # When the symbol's parameters were fitted is not part of the output
+            item = _strip(item)
+            item['normalized_prices'] = dict(item['normalized_prices'])
+            item['normalized_prices']['_normalization'] = {
+                k: v for k, v in item['normalized_prices']['_normalization'].items() if k != 'fitted_at'
+            }
+            return item
+        
+        assert len(batch) == len(scalar)
+        assert [strip(p) for p in batch] == [strip(p) for p in scalar]
+    
+    def test_batch_rejects_invalid(self, processor):
+        """Test that invalid records are dropped and order is preserved."""
+        records = [_record('A', 1.0, 2.0, 0.5, 1.5, 10), {'symbol': 'X'}, _record('B', 1.0, 2.0, 0.5, 1.5, 10)]
+        
+        batch = processor.process_batch(records)
+        
+        assert [p['symbol'] for p in batch] == ['A', 'B']
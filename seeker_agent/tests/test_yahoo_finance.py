@@ -1,7 +1,9 @@
 """Test Yahoo Finance collector."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch, MagicMock, PropertyMock
+import asyncio
+import time
 from datetime import datetime
 import pandas as pd
 
@@ -18,6 +20,7 @@ def mock_config():
         stocks=['AAPL', 'GOOGL'],
         period='1mo',
         interval='1d',
+        retry_limit=3,
         max_retries=3,
         retry_delay=1
     )
@@ -218,3 +221,226 @@ class TestYahooFinanceCollector:
         assert 'symbols' in stats
         assert 'symbol_count' in stats
         assert stats['symbol_count'] == 2
+
+
+@pytest.fixture
+def bulk_config(tmp_path):
+    """Create a real configuration with bulk download enabled."""
+    config = Config()
+    config.data_sources.yahoo_finance.stocks = ['AAPL', 'GOOGL', 'MSFT']
+    config.data_sources.yahoo_finance.bulk_download = True
+    config.data_sources.yahoo_finance.bulk_chunk_size = 2
+    config.storage.raw_data_dir = str(tmp_path / 'raw')
+    config.storage.cache_dir = str(tmp_path / 'cache')
+    config.performance.rate_limit_delay = 0
+    return config
+
+
+def _bulk_frame(symbols, sample_ticker_data):
+    """Build a multi-ticker frame grouped by ticker like yf.download."""
+    return pd.concat({symbol: sample_ticker_data for symbol in symbols}, axis=1)
+
+
+class TestBulkDownload:
+    """Test bulk multi-ticker collection."""
+    
+    def test_split_bulk_frame(self, sample_ticker_data):
+        """Test splitting a grouped frame back into per-symbol frames."""
+        frame = _bulk_frame(['AAPL', 'GOOGL'], sample_ticker_data)
+        frames = YahooFinanceCollector._split_bulk_frame(frame, ['AAPL', 'GOOGL', 'MSFT'])
+        
+        assert set(frames) == {'AAPL', 'GOOGL'}
+        assert list(frames['AAPL'].columns) == list(sample_ticker_data.columns)
+    
+    @patch('collectors.yahoo_finance.yf.download')
+    def test_collect_bulk_groups_requests(self, mock_download, bulk_config, sample_ticker_data):
+        """Test that bulk collection issues one request per chunk and keeps order."""
+        mock_download.side_effect = lambda tickers, **kwargs: _bulk_frame(tickers, sample_ticker_data)
+        
+        collector = YahooFinanceCollector(bulk_config)
+        data_list = collector.collect()
+        
+        assert mock_download.call_count == 2
+        assert all(call.kwargs['auto_adjust'] is True for call in mock_download.call_args_list)
+        assert [d['symbol'] for d in data_list] == ['AAPL', 'GOOGL', 'MSFT']
+        assert data_list[0]['prices']['close'] == 181.0
+        
+        # One limiter token per ticker, not per chunk
+        assert collector.rate_limiter.acquired == 3
+        
+        # Second cycle is served from cache
+        collector.collect()
+        assert mock_download.call_count == 2
+
+
+class TestConcurrentCollection:
+    """Test worker-pool collection."""
+    
+    def test_collect_concurrent_preserves_order(self, bulk_config):
+        """Test that results follow symbol order and failures stay isolated."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL', 'BAD', 'GOOGL', 'MSFT']
+        bulk_config.performance.max_workers = 4
+        
+        collector = YahooFinanceCollector(bulk_config)
+        
+        def fake_fetch(symbol):
+            if symbol == 'BAD':
+                raise RuntimeError("boom")
+            time.sleep(0.05 if symbol == 'AAPL' else 0)
+            return {'symbol': symbol}
+        
+        with patch.object(collector, '_fetch_stock_data', side_effect=fake_fetch):
+            data_list = collector.collect()
+        
+        assert [d['symbol'] for d in data_list] == ['AAPL', 'GOOGL', 'MSFT']
+    
+    def test_iter_collect_yields_in_completion_order(self, bulk_config):
+        """Test that streamed records arrive as they complete and raw data is saved at the end."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL', 'GOOGL', 'MSFT']
+        bulk_config.performance.max_workers = 3
+        
+        collector = YahooFinanceCollector(bulk_config)
+        
+        def fake_fetch(symbol):
+            time.sleep(0.2 if symbol == 'AAPL' else 0)
+            return {'symbol': symbol}
+        
+        with patch.object(collector, '_fetch_stock_data', side_effect=fake_fetch), \
+             patch.object(collector, '_save_raw_data') as save:
+            data_list = list(collector.iter_collect())
+        
+        assert data_list[-1]['symbol'] == 'AAPL'
+        assert sorted(d['symbol'] for d in data_list) == ['AAPL', 'GOOGL', 'MSFT']
+        save.assert_called_once_with(data_list)
+
+
+class TestIncrementalFetch:
+    """Test incremental fetches driven by persisted high-water marks."""
+    
+    @patch('collectors.yahoo_finance.yf.Ticker')
+    def test_incremental_requests_only_new_bars(self, mock_ticker, bulk_config, sample_ticker_data, sample_ticker_info):
+        """Test that the second run starts at the last seen bar, even after a restart."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.incremental = True
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL']
+        bulk_config.features.cache_enabled = False
+        
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = sample_ticker_data
+        mock_instance.info = sample_ticker_info
+        mock_ticker.return_value = mock_instance
+        
+        YahooFinanceCollector(bulk_config).collect()
+        assert mock_instance.history.call_args.kwargs['period'] == '5d'
+        
+        # New collector instance simulates a restart
+        YahooFinanceCollector(bulk_config).collect()
+        assert mock_instance.history.call_args.kwargs == {'interval': '1d', 'timeout': 30, 'start': '2024-01-30'}
+
+
+class TestMetadataCache:
+    """Test the long-TTL ticker.info cache."""
+    
+    @patch('collectors.yahoo_finance.yf.Ticker')
+    def test_metadata_fetched_once_and_persisted(self, mock_ticker, bulk_config, sample_ticker_data, sample_ticker_info):
+        """Test that price refreshes reuse cached metadata across restarts."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL']
+        bulk_config.features.cache_enabled = False
+        
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = sample_ticker_data
+        info = PropertyMock(return_value=sample_ticker_info)
+        type(mock_instance).info = info
+        mock_ticker.return_value = mock_instance
+        
+        collector = YahooFinanceCollector(bulk_config)
+        collector.collect()
+        collector.collect()
+        data = YahooFinanceCollector(bulk_config).collect()
+        
+        assert info.call_count == 1
+        assert mock_instance.history.call_count == 3
+        assert data[0]['metadata']['company_name'] == 'Apple Inc.'
+    
+    @patch('collectors.yahoo_finance.yf.Ticker')
+    def test_refresh_metadata_forces_fetch(self, mock_ticker, bulk_config, sample_ticker_info):
+        """Test that refresh_metadata bypasses the TTL."""
+        mock_instance = MagicMock()
+        info = PropertyMock(return_value=sample_ticker_info)
+        type(mock_instance).info = info
+        mock_ticker.return_value = mock_instance
+        
+        collector = YahooFinanceCollector(bulk_config)
+        assert collector.refresh_metadata() == 3
+        assert collector.refresh_metadata(['AAPL']) == 1
+        assert info.call_count == 4
+
+
+class TestDiskCacheIntegration:
+    """Test the collector's persistent cache tier."""
+    
+    @patch('collectors.yahoo_finance.yf.Ticker')
+    def test_cold_start_hits_disk_cache(self, mock_ticker, bulk_config, sample_ticker_data, sample_ticker_info):
+        """Test that a restarted collector serves bars from disk."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL']
+        
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = sample_ticker_data
+        mock_instance.info = sample_ticker_info
+        mock_ticker.return_value = mock_instance
+        
+        YahooFinanceCollector(bulk_config).collect()
+        data = YahooFinanceCollector(bulk_config).collect()
+        
+        assert mock_instance.history.call_count == 1
+        assert data[0]['symbol'] == 'AAPL'
+
+
+class TestAsyncCollection:
+    """Test asyncio collection."""
+    
+    def test_collect_async_skips_slow_symbol(self, bulk_config):
+        """Test that a symbol exceeding the request timeout does not block the cycle."""
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = ['AAPL', 'SLOW', 'MSFT']
+        bulk_config.performance.request_timeout = 0.1
+        
+        collector = YahooFinanceCollector(bulk_config)
+        
+        def fake_fetch(symbol):
+            time.sleep(1.0 if symbol == 'SLOW' else 0)
+            return {'symbol': symbol}
+        
+        with patch.object(collector, '_fetch_stock_data', side_effect=fake_fetch):
+            start = time.monotonic()
+            data_list = asyncio.run(collector.collect_async())
+            elapsed = time.monotonic() - start
+        
+        assert [d['symbol'] for d in data_list] == ['AAPL', 'MSFT']
+        assert elapsed < 0.8
+    
+    @patch('collectors.yahoo_finance.yf.Ticker')
+    def test_collect_async_limiter_wait_is_not_timed(self, mock_ticker, bulk_config, sample_ticker_data,
+                                                      sample_ticker_info):
+        """Test that symbols queued behind the rate limiter are not counted as timeouts."""
+        symbols = [f'S{i}' for i in range(20)]
+        bulk_config.data_sources.yahoo_finance.bulk_download = False
+        bulk_config.data_sources.yahoo_finance.stocks = symbols
+        bulk_config.performance.rate_limit_delay = 0.05
+        bulk_config.performance.request_timeout = 0.3
+        
+        mock_instance = MagicMock()
+        mock_instance.history.return_value = sample_ticker_data
+        mock_instance.info = sample_ticker_info
+        mock_ticker.return_value = mock_instance
+        
+        collector = YahooFinanceCollector(bulk_config)
+        data_list = asyncio.run(collector.collect_async())
+        
+        assert sorted(d['symbol'] for d in data_list) == sorted(symbols)
+        # One history and one metadata request per symbol, each paced exactly once
+        assert collector.rate_limiter.get_stats()['acquired'] == 40
@@ -1,5 +1,7 @@
 """Uploaders package."""
 
 from .blockchain_uploader import BlockchainUploader
+from .merkle import MerkleStore, MerkleTree, verify_proof
+from .submission import AdaptiveBackoff, AdaptiveBatcher, NodeBusyError, NonceManager
 
-__all__ = ['BlockchainUploader']
+__all__ = ['BlockchainUploader', 'MerkleStore', 'MerkleTree', 'verify_proof', 'AdaptiveBackoff', 'AdaptiveBatcher', 'NodeBusyError', 'NonceManager']
@@ -4,13 +4,21 @@ import logging
 import time
 import json
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sized, Tuple
 from pathlib import Path
 
 from web3 import Web3
 
 from core.config import Config
+from processors.encoding import FixedPointEncoder, to_fixed
+from storage.dedup_index import DedupIndex
+from storage.upload_ledger import UploadLedger
+from storage.upload_queue import UploadQueue
+from uploaders.merkle import MerkleStore, MerkleTree
+from uploaders.submission import AdaptiveBackoff, AdaptiveBatcher, NonceManager
 
 
 class BlockchainUploader:
@@ -26,6 +34,39 @@ class BlockchainUploader:
         self.upload_dir = Path(config.storage.processed_data_dir) / "uploads"
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         
+        # Indexed record of every accepted batch
+        self.ledger = UploadLedger(self.upload_dir / "ledger.db")
+        self.ledger.import_tracking_files(self.upload_dir)
+        
+        # Merkle trees of submitted batches, kept for inclusion proofs
+        self.merkle = MerkleStore(self.upload_dir / "merkle")
+        
+        # Encodes records that arrive without a cached fixed-point payload
+        self.encoder = FixedPointEncoder()
+        
+        # (symbol, bar timestamp) pairs already uploaded
+        self.dedup = DedupIndex.for_config(config, 'uploaded')
+        
+        # Pipelined submission: bounded in-flight transactions, ordered nonces, node-driven pacing
+        upload_config = self.blockchain_config.upload_config
+        self.max_in_flight = max(1, upload_config.get('max_in_flight', 4))
+        self.backoff = AdaptiveBackoff(upload_config.get('batch_delay', 5), upload_config.get('max_backoff', 60))
+        self.nonces = NonceManager(self.upload_dir / 'nonce')
+        
+        # Batch sizes follow queue depth, confirmation latency and the gas budget
+        batch_size = upload_config['batch_size']
+        adaptive = upload_config.get('adaptive_batching', True)
+        self.batcher = AdaptiveBatcher(
+            batch_size,
+            min_size=upload_config.get('min_batch_size', 1) if adaptive else batch_size,
+            max_size=upload_config.get('max_batch_size', 500) if adaptive else batch_size,
+            target_latency=upload_config.get('target_latency', 10.0),
+            gas_limit=self.blockchain_config.gas_limit,
+            gas_per_record=upload_config.get('gas_per_record', 100),
+            fee=self.blockchain_config.fee,
+            max_in_flight=self.max_in_flight
+        )
+        
         # Initialize connection (mock for now, real Aleo integration later)
         self.connected = False
         self._setup_connection()
@@ -58,107 +99,276 @@ class BlockchainUploader:
     
     def upload_batch(self, data_list: List[Dict]) -> int:
         """Upload batch of processed data to blockchain."""
+        if self.dedup is not None:
+            data_list = self._skip_duplicates(data_list)
+        
         if not data_list:
             self.logger.warning("No data to upload")
             return 0
         
         self.logger.info(f"📤 Uploading {len(data_list)} records in batches...")
         
-        uploaded = 0
-        batch_size = self.blockchain_config.upload_config['batch_size']
-        batch_delay = self.blockchain_config.upload_config['batch_delay']
+        def batches():
+            # Sized one at a time from the records still waiting
+            i = 0
+            while i < len(data_list):
+                size = self.batcher.next_size(len(data_list) - i)
+                yield data_list[i:i + size]
+                i += size
+        
+        uploaded = self._dispatch(batches())
+        
+        self.logger.info(f"   📊 Upload summary: {uploaded}/{len(data_list)} successful")
+        return uploaded
+    
+    def upload_stream(self, records: Iterable[Dict], pending: Optional[Callable[[], int]] = None) -> int:
+        """Upload records from an iterable, submitting each batch as soon as it fills.
+        
+        ``pending()`` returns how many records are still waiting upstream
+        (e.g. a queue's depth) and sizes the batches; for a sized
+        ``records`` it defaults to the records not yet read.
+        """
+        total = 0
+        size = len(records) if isinstance(records, Sized) else None
+        
+        if self.dedup is not None:
+            records = self.dedup.unseen(records)
         
-        # Split into batches
-        for i in range(0, len(data_list), batch_size):
-            batch = data_list[i:i + batch_size]
+        def backlog() -> int:
+            if pending is not None:
+                return pending()
+            return size - total if size is not None else 0
+        
+        def batches():
+            nonlocal total
+            batch = []
+            batch_size = self.batcher.next_size(backlog())
+            for record in records:
+                batch.append(record)
+                total += 1
+                
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+                    batch_size = self.batcher.next_size(backlog())
             
-            try:
-                # Upload batch
-                success = self._upload_single_batch(batch, i // batch_size + 1)
+            if batch:
+                yield batch
+        
+        uploaded = self._dispatch(batches())
+        
+        if total:
+            self.logger.info(f"   📊 Upload summary: {uploaded}/{total} successful")
+        else:
+            self.logger.warning("No data to upload")
+        
+        return uploaded
+    
+    def upload_queued(self, queue: UploadQueue, entries: Optional[Iterable[Tuple[int, Dict]]] = None) -> int:
+        """Upload the queue's backlog, then ``entries``.
+        
+        ``entries`` are ``(id, record)`` pairs already journaled with
+        ``queue.enqueue()``, e.g. a stream filled as records are processed.
+        Entries the backlog drain already claimed are skipped; entries never
+        reached stay pending. Accepted batches are removed from the queue;
+        failed ones go back to pending for the next drain. Records whose bar
+        was already uploaded are removed without being submitted again.
+        """
+        claimed: Dict[int, List[int]] = {}
+        total = 0
+        last_id = 0
+        
+        def backlog():
+            # Only ids above the last claim, so released batches wait for the next drain
+            nonlocal last_id
+            depth = len(queue)
+            while True:
+                rows = queue.claim(self.batcher.next_size(depth), after=last_id)
+                if not rows:
+                    return
+                last_id = rows[-1][0]
+                depth -= len(rows)
+                yield self._skip_uploaded(queue, rows)
+        
+        def take(batch):
+            # Entries up to the backlog's last claim were already tried by this drain
+            ids = queue.claim_ids([row_id for row_id, _ in batch if row_id > last_id])
+            return self._skip_uploaded(queue, [entry for entry in batch if entry[0] in ids])
+        
+        def incoming():
+            # Entries are journaled before they arrive, so the queue's pending count is the backlog
+            batch = []
+            batch_size = self.batcher.next_size(queue.pending())
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) >= batch_size:
+                    yield take(batch)
+                    batch = []
+                    batch_size = self.batcher.next_size(queue.pending())
+            if batch:
+                yield take(batch)
+        
+        def batches():
+            nonlocal total
+            sources = [backlog()] if entries is None else [backlog(), incoming()]
+            for source in sources:
+                for batch in source:
+                    if batch:
+                        total += len(batch)
+                        claimed[len(claimed) + 1] = [row_id for row_id, _ in batch]
+                        yield [record for _, record in batch]
+        
+        def settle(batch_num: int, uploaded: int):
+            ids = claimed[batch_num]
+            if uploaded:
+                queue.ack(ids)
+            else:
+                queue.release(ids)
+        
+        uploaded = self._dispatch(batches(), settle)
+        
+        if total:
+            self.logger.info(f"   📊 Upload summary: {uploaded}/{total} successful")
+        
+        return uploaded
+    
+    def _skip_uploaded(self, queue: UploadQueue, entries: List[Tuple[int, Dict]]) -> List[Tuple[int, Dict]]:
+        """Acknowledge queued records whose bar was already uploaded and return the rest."""
+        if self.dedup is None:
+            return entries
+        
+        fresh = {id(record) for record in self.dedup.unseen(record for _, record in entries)}
+        done = [row_id for row_id, record in entries if id(record) not in fresh]
+        if done:
+            queue.ack(done)
+        
+        return [(row_id, record) for row_id, record in entries if id(record) in fresh]
+    
+    def _dispatch(self, batches: Iterable[List[Dict]],
+                  on_result: Optional[Callable[[int, int], None]] = None) -> int:
+        """Submit batches in order, keeping up to ``max_in_flight`` transactions pending.
+        
+        Each batch takes a nonce when it is dispatched, so nonces follow batch
+        order unless an earlier batch failed and released its nonce. Dispatch waits for a free slot and for the adaptive
+        backoff delay, which is zero while the node accepts transactions.
+        ``on_result(batch_num, uploaded)`` is called as each batch completes.
+        """
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        futures = []
+        
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix='upload') as executor:
+            for batch_num, batch in enumerate(batches, 1):
+                slots.acquire()
                 
-                if success:
-                    uploaded += len(batch)
-                    self.logger.info(f"   ✓ Batch {i // batch_size + 1}: {len(batch)} records uploaded")
-                else:
-                    self.logger.warning(f"   ✗ Batch {i // batch_size + 1}: Upload failed")
+                delay = self.backoff.current()
+                if delay > 0:
+                    self.logger.debug(f"   ⏳ Backing off {delay:.1f}s before batch {batch_num}")
+                    time.sleep(delay)
                 
-                # Delay between batches
-                if i + batch_size < len(data_list):
-                    time.sleep(batch_delay)
-                    
-            except Exception as e:
-                self.logger.error(f"   ✗ Batch {i // batch_size + 1}: {e}")
+                self.batcher.dispatched(len(batch))
+                future = executor.submit(self._send_batch, batch, batch_num, self.nonces.allocate())
+                if on_result is not None:
+                    future.add_done_callback(lambda done, num=batch_num: on_result(num, done.result()))
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
         
-        self.logger.info(f"   📊 Upload summary: {uploaded}/{len(data_list)} successful")
-        return uploaded
+        return sum(future.result() for future in futures)
+    
+    def _send_batch(self, batch: List[Dict], batch_num: int, nonce: Optional[int] = None) -> int:
+        """Upload one batch and return the number of records uploaded."""
+        try:
+            if self._upload_single_batch(batch, batch_num, nonce):
+                self.logger.info(f"   ✓ Batch {batch_num}: {len(batch)} records uploaded")
+                if self.dedup is not None:
+                    self.dedup.add_records(batch)
+                    self.dedup.checkpoint()
+                return len(batch)
+            
+            self.logger.warning(f"   ✗ Batch {batch_num}: Upload failed")
+        except Exception as e:
+            self.logger.error(f"   ✗ Batch {batch_num}: {e}")
+        
+        # Nonce was never consumed on-chain; hand it to the next batch
+        if nonce is not None:
+            self.nonces.release(nonce)
+        return 0
     
-    def _upload_single_batch(self, batch: List[Dict], batch_num: int) -> bool:
+    def _skip_duplicates(self, data_list: List[Dict]) -> List[Dict]:
+        """Drop records whose bar was already uploaded."""
+        fresh = list(self.dedup.unseen(data_list))
+        
+        skipped = len(data_list) - len(fresh)
+        if skipped:
+            self.logger.info(f"⏭️  Skipped {skipped} already uploaded bars")
+        
+        return fresh
+    
+    def _upload_single_batch(self, batch: List[Dict], batch_num: int, nonce: Optional[int] = None) -> bool:
         """Upload a single batch to blockchain."""
         max_retries = self.blockchain_config.upload_config['max_retries']
         retry_delay = self.blockchain_config.upload_config['retry_delay']
         
+        # Commitment is built once and reused by every attempt
+        tree = self._commit_batch(batch)
+        file_hash = tree.root
+        
         for attempt in range(max_retries):
             try:
-                # Prepare batch data
-                batch_data = self._prepare_batch_data(batch)
-                
-                # Generate file hash
-                file_hash = self._generate_file_hash(batch_data)
-                
                 # Create transaction
-                tx = self._create_transaction(file_hash, batch_data)
+                tx = self._create_transaction(file_hash, batch, nonce)
                 
                 # Sign transaction
                 signed_tx = self._sign_transaction(tx)
                 
                 # Submit transaction
+                started = time.monotonic()
                 tx_id = self._submit_transaction(signed_tx)
+                self.batcher.observe(time.monotonic() - started, ok=True)
+                
+                # Keep the tree for inclusion proofs only once its root is accepted
+                self.merkle.save(tree)
                 
                 # Track upload
                 self._track_upload(batch, tx_id, file_hash)
                 
+                self.backoff.success()
                 return True
                 
             except Exception as e:
+                self.backoff.failure(e)
+                self.batcher.observe(None, ok=False)
                 if attempt < max_retries - 1:
                     self.logger.warning(f"      Retry {attempt + 1}/{max_retries}: {e}")
-                    time.sleep(retry_delay)
+                    # A throttled node's retry_after can ask for longer than retry_delay
+                    time.sleep(max(retry_delay, self.backoff.current()))
                 else:
                     self.logger.error(f"      Failed after {max_retries} attempts: {e}")
                     return False
         
         return False
     
-    def _prepare_batch_data(self, batch: List[Dict]) -> Dict:
-        """Prepare batch data for upload."""
-        return {
-            'version': '1.0',
-            'timestamp': datetime.now().isoformat(),
-            'batch_size': len(batch),
-            'records': [
-                {
-                    'symbol': item['symbol'],
-                    'source': item['source'],
-                    'timestamp': item['timestamp'],
-                    'normalized_prices': item['normalized_prices'],
-                    'quality_score': item['quality_score'],
-                    'is_outlier': item['is_outlier'],
-                    'features': item['features']
-                }
-                for item in batch
-            ]
-        }
+    def _commit_batch(self, batch: List[Dict]) -> MerkleTree:
+        """Build the Merkle tree of a batch over the records' cached fixed-point encodings.
+        
+        Only the root is submitted; the tree is stored once the batch is
+        accepted, so any record's inclusion can be proven without the rest of
+        the batch.
+        """
+        return MerkleTree.build([self._encoded(item) for item in batch])
     
-    def _generate_file_hash(self, data: Dict) -> str:
-        """Generate SHA256 hash of data."""
-        data_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+    def _encoded(self, item: Dict) -> str:
+        """Fixed-point payload of a record, encoding it here if the processor did not."""
+        encoded = item.get('encoded')
+        if encoded is None:
+            encoded = self.encoder.encode(item)
+            item['encoded'] = encoded
+        return encoded
     
-    def _create_transaction(self, file_hash: str, data: Dict) -> Dict:
+    def _create_transaction(self, file_hash: str, batch: List[Dict], nonce: Optional[int] = None) -> Dict:
         """Create blockchain transaction."""
-        # Extract metadata
-        symbols = [r['symbol'] for r in data['records']]
-        avg_quality = sum(r['quality_score'] for r in data['records']) / len(data['records'])
+        # Extract metadata (each symbol once, in batch order; per-record detail is in the ledger)
+        symbols = list(dict.fromkeys(item['symbol'] for item in batch))
+        avg_quality = sum(item['quality_score'] for item in batch) / len(batch)
         
         # Determine category based on symbols
         category = self._determine_category(symbols)
@@ -170,14 +380,16 @@ class BlockchainUploader:
             'parameters': {
                 'file_hash': file_hash,
                 'category': category,
-                'quality_score': int(avg_quality * 100),  # Convert to integer
+                'quality_score': to_fixed(avg_quality, 'quality_score'),  # u64 fixed-point, 1.0 = SCALE
                 'timestamp': int(datetime.now().timestamp()),
-                'batch_size': len(data['records']),
-                'symbols': ','.join(symbols[:10])  # Limit to 10 symbols
+                'batch_size': len(batch),
+                'symbols': ','.join(symbols)
             },
             'gas_limit': self.blockchain_config.gas_limit,
             'fee': self.blockchain_config.fee
         }
+        if nonce is not None:
+            tx['nonce'] = nonce
         
         return tx
     
@@ -220,7 +432,9 @@ class BlockchainUploader:
         # For now, simulate submission
         
         if self.config.features.dry_run:
-            tx_id = f"dry_run_{hashlib.sha256(str(datetime.now()).encode()).hexdigest()[:16]}"
+            # Nonce keeps ids of concurrent batches distinct
+            seed = f"{datetime.now()}|{signed_tx.get('nonce')}"
+            tx_id = f"dry_run_{hashlib.sha256(seed.encode()).hexdigest()[:16]}"
             self.logger.debug(f"      [DRY RUN] Simulated TX ID: {tx_id}")
             return tx_id
         
@@ -235,29 +449,21 @@ class BlockchainUploader:
     
     def _track_upload(self, batch: List[Dict], tx_id: str, file_hash: str):
         """Track upload for auditing."""
-        tracking = {
-            'tx_id': tx_id,
-            'file_hash': file_hash,
-            'uploaded_at': datetime.now().isoformat(),
-            'batch_size': len(batch),
-            'symbols': [item['symbol'] for item in batch],
-            'network': self.blockchain_config.network,
-            'contract': self.blockchain_config.contract_address
-        }
-        
-        # Save tracking info
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = self.upload_dir / f"upload_{timestamp}.json"
-        
         try:
-            with open(filename, 'w') as f:
-                json.dump(tracking, f, indent=2)
-            
-            self.logger.debug(f"      💾 Upload tracked: {filename}")
+            self.ledger.record(
+                tx_id, file_hash, batch,
+                network=self.blockchain_config.network,
+                contract=self.blockchain_config.contract_address
+            )
+            self.logger.debug(f"      💾 Upload tracked: {tx_id}")
             
         except Exception as e:
             self.logger.error(f"      Failed to track upload: {e}")
     
+    def inclusion_proof(self, file_hash: str, index: int) -> Dict:
+        """Proof that record ``index`` belongs to the batch committed as ``file_hash``."""
+        return {'root': file_hash, 'index': index, 'proof': self.merkle.proof(file_hash, index)}
+    
     def verify_upload(self, tx_id: str) -> Dict:
         """Verify transaction status on blockchain."""
         # TODO: Replace with real Aleo verification
@@ -277,24 +483,20 @@ class BlockchainUploader:
     
     def get_upload_stats(self) -> Dict:
         """Get upload statistics."""
-        # Count upload files
-        upload_files = list(self.upload_dir.glob("upload_*.json"))
-        
-        total_uploads = len(upload_files)
-        total_records = 0
-        
-        for file in upload_files:
-            try:
-                with open(file) as f:
-                    data = json.load(f)
-                    total_records += data.get('batch_size', 0)
-            except Exception:
-                pass
-        
         return {
-            'total_uploads': total_uploads,
-            'total_records': total_records,
+            **self.ledger.totals(),
             'network': self.blockchain_config.network,
             'contract': self.blockchain_config.contract_address,
-            'connected': self.connected
+            'connected': self.connected,
+            'duplicates_skipped': self.dedup.get_stats()['duplicates'] if self.dedup is not None else 0,
+            'max_in_flight': self.max_in_flight,
+            'backoff': self.backoff.get_stats(),
+            'nonces': self.nonces.get_stats(),
+            'batching': self.batcher.get_stats()
         }
+    
+    def close(self):
+        """Persist the upload dedup index and close the ledger."""
+        if self.dedup is not None:
+            self.dedup.flush()
+        self.ledger.close()
@@ -0,0 +1,145 @@
+"""Merkle tree commitments over encoded batch records."""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+# Domain separation keeps a leaf from being passed off as an inner node
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+
+def leaf_hash(encoded: str) -> bytes:
+    """Hash of a record's canonical encoding."""
+    return hashlib.sha256(LEAF_PREFIX + encoded.encode()).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash of two child nodes."""
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def level_sizes(leaves: int) -> List[int]:
+    """Number of nodes on each level, leaves first."""
+    sizes = [leaves]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+class MerkleTree:
+    """Binary SHA-256 Merkle tree over record encodings.
+    
+    A node without a sibling is carried up to the next level unchanged
+    rather than paired with a copy of itself, so repeating the last record
+    changes the root. ``nodes`` holds every level, leaves first, as one
+    ``(total, 32)`` uint8 array; proofs read one node per level.
+    """
+    
+    def __init__(self, nodes: np.ndarray, leaves: int):
+        """Wrap a flattened tree (use ``build()`` to construct one)."""
+        self.nodes = nodes
+        self.leaves = leaves
+        self.sizes = level_sizes(leaves)
+        self.offsets = np.concatenate(([0], np.cumsum(self.sizes)[:-1])).tolist()
+    
+    @classmethod
+    def build(cls, encoded: Sequence[str]) -> 'MerkleTree':
+        """Build the tree of a batch's encoded records."""
+        if not encoded:
+            raise ValueError("Cannot build a Merkle tree of an empty batch")
+        
+        level = [leaf_hash(text) for text in encoded]
+        levels = [level]
+        while len(level) > 1:
+            level = [
+                node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                for i in range(0, len(level), 2)
+            ]
+            levels.append(level)
+        
+        nodes = np.frombuffer(b''.join(b''.join(level) for level in levels), dtype=np.uint8).reshape(-1, 32)
+        return cls(nodes, len(encoded))
+    
+    @property
+    def root(self) -> str:
+        """Hex root committed on-chain."""
+        return self.nodes[-1].tobytes().hex()
+    
+    def _node(self, depth: int, index: int) -> bytes:
+        """Node bytes at a level."""
+        return self.nodes[self.offsets[depth] + index].tobytes()
+    
+    def proof(self, index: int) -> List[Dict]:
+        """Inclusion proof of leaf ``index``: sibling hashes from the leaf up, O(log n)."""
+        if not 0 <= index < self.leaves:
+            raise IndexError(f"Leaf {index} out of range (tree has {self.leaves})")
+        
+        path = []
+        for depth, size in enumerate(self.sizes[:-1]):
+            sibling = index ^ 1
+            if sibling < size:
+                path.append({'side': 'left' if sibling < index else 'right',
+                             'hash': self._node(depth, sibling).hex()})
+            index //= 2
+        return path
+
+
+def verify_proof(encoded: str, proof: List[Dict], root: str) -> bool:
+    """Check that a record encoding is included under ``root``."""
+    node = leaf_hash(encoded)
+    for step in proof:
+        sibling = bytes.fromhex(step['hash'])
+        node = node_hash(sibling, node) if step['side'] == 'left' else node_hash(node, sibling)
+    return node.hex() == root
+
+
+class MerkleStore:
+    """Trees of submitted batches, one ``<root>.npy`` file each.
+    
+    Files are opened memory-mapped, so a proof touches only the nodes on
+    its path however large the batch.
+    """
+    
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize store."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, root: str) -> Path:
+        return self.directory / f"{root}.npy"
+    
+    def save(self, tree: MerkleTree):
+        """Persist a tree atomically (leaf count is implied by the node count)."""
+        path = self._path(tree.root)
+        if path.exists():
+            return
+        
+        tmp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp.npy")
+        np.save(tmp_path, tree.nodes)
+        os.replace(tmp_path, path)
+    
+    def load(self, root: str) -> MerkleTree:
+        """Open a stored tree; raises ``FileNotFoundError`` for unknown roots."""
+        nodes = np.load(self._path(root), mmap_mode='r')
+        return MerkleTree(nodes, _leaves_for(len(nodes)))
+    
+    def proof(self, root: str, index: int) -> List[Dict]:
+        """Inclusion proof of record ``index`` of the batch committed as ``root``."""
+        return self.load(root).proof(index)
+
+
+def _leaves_for(total: int) -> int:
+    """Leaf count of a tree with ``total`` nodes."""
+    low, high = 1, total
+    while low < high:
+        mid = (low + high) // 2
+        if sum(level_sizes(mid)) < total:
+            low = mid + 1
+        else:
+            high = mid
+    return low
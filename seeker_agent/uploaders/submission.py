@@ -0,0 +1,214 @@
+"""Transaction pacing, nonce allocation and batch sizing for pipelined uploads."""
+
+import heapq
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class NodeBusyError(Exception):
+    """The node asked us to slow down (e.g. HTTP 429/503)."""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveBackoff:
+    """Delay before the next submission, driven by node responses.
+    
+    Healthy responses halve the delay down to zero, so batches go out back
+    to back. A failure raises it to at least ``step`` seconds and doubles it
+    on every further failure, up to ``max_delay``; a node's ``retry_after``
+    hint is honored when larger.
+    """
+    
+    def __init__(self, step: float, max_delay: float):
+        """Initialize backoff."""
+        self.step = step
+        self.max_delay = max(step, max_delay)
+        self.delay = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'successes': 0, 'failures': 0, 'throttled': 0, 'max_delay_seen': 0.0}
+    
+    def success(self):
+        """Record an accepted transaction."""
+        with self._lock:
+            self.stats['successes'] += 1
+            self.delay /= 2
+            if self.delay < self.step / 8:
+                self.delay = 0.0
+    
+    def failure(self, error: Optional[Exception] = None):
+        """Record a rejected or failed submission."""
+        with self._lock:
+            self.stats['failures'] += 1
+            delay = min(self.max_delay, max(self.step, self.delay * 2))
+            
+            if isinstance(error, NodeBusyError):
+                self.stats['throttled'] += 1
+                if error.retry_after is not None:
+                    delay = max(delay, error.retry_after)
+            
+            self.delay = delay
+            self.stats['max_delay_seen'] = max(self.stats['max_delay_seen'], delay)
+    
+    def current(self) -> float:
+        """Current delay in seconds."""
+        with self._lock:
+            return self.delay
+    
+    def get_stats(self) -> Dict:
+        """Get backoff statistics."""
+        with self._lock:
+            return {**self.stats, 'delay': self.delay}
+
+
+class NonceManager:
+    """Allocates gap-free transaction nonces.
+    
+    New nonces increase monotonically across restarts. A nonce whose batch
+    ultimately failed is released and handed to the next batch before any
+    new one, so the sequence has no gaps but a retried range is not in
+    dispatch order. The next free value and the released
+    nonces are persisted together, so a restart does not leave a gap either.
+    """
+    
+    def __init__(self, path: Path):
+        """Initialize manager, resuming after the last allocated nonce."""
+        self.path = Path(path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._next, self._released = self._load()
+        heapq.heapify(self._released)
+    
+    def _load(self) -> Tuple[int, List[int]]:
+        """Read the next free nonce and the released ones."""
+        try:
+            text = self.path.read_text().strip()
+        except FileNotFoundError:
+            return 0, []
+        
+        try:
+            if text.isdigit():
+                # Plain counter written before released nonces were persisted
+                return int(text), []
+            state = json.loads(text)
+            return int(state['next']), [int(nonce) for nonce in state['released']]
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable nonce file {self.path}: {e}")
+            return 0, []
+    
+    def allocate(self) -> int:
+        """Next nonce: the lowest released one, else a fresh one."""
+        with self._lock:
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._save()
+            return nonce
+    
+    def release(self, nonce: int):
+        """Return the nonce of a batch that was not accepted."""
+        with self._lock:
+            heapq.heappush(self._released, nonce)
+            self._save()
+    
+    def _save(self):
+        """Persist the next free nonce and the released ones (lock must be held)."""
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            tmp_path.write_text(json.dumps({'next': self._next, 'released': sorted(self._released)}))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            self.logger.error(f"Failed to persist nonce: {e}")
+    
+    def get_stats(self) -> Dict:
+        """Get nonce statistics."""
+        with self._lock:
+            return {'next_nonce': self._next, 'released': len(self._released)}
+
+
+class AdaptiveBatcher:
+    """Chooses the size of the next batch from queue depth, latency and gas.
+    
+    Batches grow by a quarter while the backlog exceeds what the pending
+    transactions can carry and confirmations stay under ``target_latency``.
+    A failed submission halves the size; a slow confirmation cuts it by a
+    quarter. The size never exceeds ``gas_cap``, the most records whose
+    estimated gas (``gas_per_record`` each) fits in 90% of ``gas_limit``.
+    The fee is charged per transaction, so larger batches lower the fee
+    paid per record.
+    """
+    
+    GAS_HEADROOM = 0.9
+    
+    def __init__(self, initial: int, min_size: int, max_size: int, target_latency: float,
+                 gas_limit: int, gas_per_record: int, fee: int = 0, max_in_flight: int = 1):
+        """Initialize batcher."""
+        self.gas_cap = max(1, int(gas_limit * self.GAS_HEADROOM) // max(1, gas_per_record))
+        self.max_size = max(1, min(max_size, self.gas_cap))
+        self.min_size = max(1, min(min_size, self.max_size))
+        self.size = min(max(initial, self.min_size), self.max_size)
+        self.target_latency = target_latency
+        self.gas_per_record = gas_per_record
+        self.fee = fee
+        self.max_in_flight = max_in_flight
+        
+        self._lock = threading.Lock()
+        self.latency: Optional[float] = None  # EWMA of confirmation latency
+        self.stats = {'grown': 0, 'shrunk': 0, 'sizes': {}}
+    
+    def next_size(self, backlog: int = 0) -> int:
+        """Size of the next batch, given the number of records waiting."""
+        with self._lock:
+            healthy = self.latency is None or self.latency <= self.target_latency
+            if healthy and backlog > self.size * self.max_in_flight and self.size < self.max_size:
+                self.size = min(self.max_size, self.size + max(1, self.size // 4))
+                self.stats['grown'] += 1
+            return self.size
+    
+    def dispatched(self, size: int):
+        """Count a dispatched batch of ``size`` records."""
+        with self._lock:
+            sizes = self.stats['sizes']
+            sizes[size] = sizes.get(size, 0) + 1
+    
+    def observe(self, latency: Optional[float], ok: bool):
+        """Record the outcome of a submission attempt."""
+        with self._lock:
+            if not ok:
+                self._shrink(self.size // 2)
+                return
+            
+            self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+            if latency > self.target_latency:
+                self._shrink(self.size * 3 // 4)
+    
+    def _shrink(self, size: int):
+        """Lower the size (lock must be held)."""
+        size = max(self.min_size, size)
+        if size < self.size:
+            self.size = size
+            self.stats['shrunk'] += 1
+    
+    def get_stats(self) -> Dict:
+        """Get batch sizing metrics."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'gas_cap': self.gas_cap,
+                'estimated_gas': self.size * self.gas_per_record,
+                'fee_per_record': self.fee / self.size,
+                'latency': self.latency,
+                'grown': self.stats['grown'],
+                'shrunk': self.stats['shrunk'],
+                'sizes': dict(self.stats['sizes'])
+            }
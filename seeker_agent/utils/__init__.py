@@ -2,5 +2,8 @@
 
 from .logger import setup_logger
 from .metrics import MetricsTracker
+from .rate_limiter import RateLimiter
+from .cache import DiskCache, LRUCache
+from .validation import RAW_RECORD_SCHEMA, RecordSchema, Rejection
 
-__all__ = ['setup_logger', 'MetricsTracker']
+__all__ = ['setup_logger', 'MetricsTracker', 'RateLimiter', 'DiskCache', 'LRUCache', 'RAW_RECORD_SCHEMA', 'RecordSchema', 'Rejection']
@@ -0,0 +1,323 @@
+"""Caching utilities."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a JSON-like value from its encoded length."""
+    return len(json.dumps(value, separators=(',', ':'), default=str))
+
+
+class LRUCache:
+    """Thread-safe in-memory cache bounded by entries and bytes, with TTL.
+    
+    Entries are evicted least recently used first once either bound is
+    exceeded. Expired entries are dropped on access and by an optional
+    background sweeper so keys that are never read again do not linger.
+    """
+    
+    def __init__(self, ttl: float, max_entries: int = 0, max_bytes: int = 0,
+                 sweep_interval: float = 0, sizeof: Callable[[Any], int] = estimate_size):
+        """Initialize LRU cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._total_bytes = 0
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        # Background expiry
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(sweep_interval,),
+                name='lru-cache-sweeper', daemon=True
+            )
+            self._sweeper.start()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Get a value if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if entry[2] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least recently used entries past the bounds."""
+        size = self.sizeof(value) if self.max_bytes else 0
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (value, size, expires_at)
+            self._total_bytes += size
+            
+            while self._entries and (
+                (self.max_entries and len(self._entries) > self.max_entries) or
+                (self.max_bytes and self._total_bytes > self.max_bytes)
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def delete(self, key: Any):
+        """Remove an entry."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+    
+    def _remove(self, key: Any):
+        """Remove an entry (lock must be held)."""
+        _, size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+    
+    def expire(self) -> int:
+        """Drop all expired entries and return how many were removed."""
+        now = time.monotonic()
+        
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if entry[2] <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        
+        return len(expired)
+    
+    def _sweep_loop(self, interval: float):
+        """Periodically expire entries until closed."""
+        while not self._stop.wait(interval):
+            self.expire()
+    
+    def close(self):
+        """Stop the background sweeper."""
+        self._stop.set()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class DiskCache:
+    """Persistent JSON cache with TTL, size bounds and LRU eviction.
+    
+    Each entry lives in its own file, written atomically via a temp file and
+    ``os.replace``. A small index (key → size, timestamps) is loaded once at
+    startup and kept in LRU order in memory, so lookups and evictions never
+    scan the cache directory.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, directory: Path, ttl: float, max_entries: int = 10000, max_bytes: int = 0):
+        """Initialize disk cache."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, Dict]" = self._load_index()
+        self._total_bytes = sum(entry['size'] for entry in self._index.values())
+        self._dirty = False
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from its parts."""
+        return '|'.join(str(part) for part in parts)
+    
+    def _entry_path(self, key: str) -> Path:
+        """Get the file holding an entry."""
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired."""
+        with self._lock:
+            entry = self._index.get(key)
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if time.time() - entry['stored_at'] >= self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._index.move_to_end(key)
+            self._dirty = True
+        
+        try:
+            with open(self._entry_path(key)) as f:
+                value = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            with self._lock:
+                self._remove(key)
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Any):
+        """Store a value, evicting least recently used entries past the bounds."""
+        payload = json.dumps(value, separators=(',', ':')).encode()
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous:
+                self._total_bytes -= previous['size']
+            
+            self._index[key] = {'size': len(payload), 'stored_at': time.time()}
+            self._total_bytes += len(payload)
+            self._evict()
+            self._dirty = True
+    
+    def delete(self, key: str):
+        """Remove an entry."""
+        with self._lock:
+            if key in self._index:
+                self._remove(key)
+    
+    def _remove(self, key: str):
+        """Remove an entry if still indexed (lock must be held)."""
+        # Another thread may have evicted it while this one read the file unlocked
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        
+        self._total_bytes -= entry['size']
+        self._dirty = True
+        
+        try:
+            self._entry_path(key).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _evict(self):
+        """Evict least recently used entries until within bounds (lock must be held)."""
+        while self._index and (
+            (self.max_entries and len(self._index) > self.max_entries) or
+            (self.max_bytes and self._total_bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._index))
+            self._remove(oldest)
+            self.evictions += 1
+    
+    def _load_index(self) -> "OrderedDict[str, Dict]":
+        """Load the persisted index, dropping entries whose files are gone."""
+        index_path = self.directory / self.INDEX_FILE
+        
+        if not index_path.exists():
+            return OrderedDict()
+        
+        try:
+            with open(index_path) as f:
+                entries = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache index: {e}")
+            return OrderedDict()
+        
+        # Stored in LRU order (oldest first)
+        index = OrderedDict(
+            (key, entry) for key, entry in entries
+            if self._entry_path(key).exists()
+        )
+        
+        # Drop files written after the last index flush (e.g. before a crash)
+        known = {self._entry_path(key).name for key in index}
+        for path in self.directory.glob("*.json"):
+            if path.name != self.INDEX_FILE and path.name not in known:
+                path.unlink(missing_ok=True)
+        
+        return index
+    
+    def flush(self):
+        """Persist the index atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [[key, entry] for key, entry in self._index.items()]
+            self._dirty = False
+        
+        index_path = self.directory / self.INDEX_FILE
+        tmp_path = index_path.with_suffix('.tmp')
+        
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, index_path)
+        except Exception as e:
+            self.logger.error(f"Failed to persist cache index: {e}")
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def get_stats(self) -> Dict:
+        """Get cache statistics."""
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
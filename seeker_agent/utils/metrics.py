@@ -16,6 +16,7 @@ class MetricsTracker:
         # Metrics storage
         self.cycles = []
         self.errors = []
+        self.components = {}
         
         # Aggregated stats
         self.total_collected = 0
@@ -59,6 +60,13 @@ class MetricsTracker:
         
         self.logger.debug(f"❌ Error recorded: {error}")
     
+    def record_component(self, name: str, stats: Dict):
+        """Record the latest statistics reported by a component (limiter, cache, ...)."""
+        self.components[name] = {
+            'timestamp': datetime.now().isoformat(),
+            **stats
+        }
+    
     def get_stats(self) -> Dict:
         """Get aggregated statistics."""
         uptime = (datetime.now() - self.start_time).total_seconds()
@@ -93,6 +101,7 @@ class MetricsTracker:
                 'elapsed_per_cycle': round(avg_elapsed, 2)
             },
             'success_rate': round(success_rate, 2),
+            'components': self.components,
             'recent_cycles': self.cycles[-10:] if self.cycles else []
         }
     
@@ -0,0 +1,78 @@
+"""Rate limiting utility."""
+
+import asyncio
+import threading
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    """Thread- and asyncio-safe token bucket.
+    
+    Tokens refill at one per ``min_interval`` seconds up to ``burst``. Callers
+    reserve tokens under a lock and then sleep outside it, so concurrent
+    workers queue up fairly without holding the lock while waiting.
+    """
+    
+    def __init__(self, min_interval: float, burst: int = 1):
+        """Initialize rate limiter."""
+        self.min_interval = max(0.0, float(min_interval))
+        self.burst = max(1, int(burst))
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        
+        # Wait-time metrics
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def _reserve(self, tokens: int) -> float:
+        """Take tokens from the bucket and return how long the caller must wait."""
+        with self._lock:
+            self.acquired += tokens
+            
+            if self.min_interval <= 0:
+                return 0.0
+            
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self.burst, self._tokens + elapsed / self.min_interval)
+            self._last_refill = now
+            
+            # Going negative is a reservation on future refills
+            self._tokens -= tokens
+            wait = -self._tokens * self.min_interval if self._tokens < 0 else 0.0
+            
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            
+            return wait
+    
+    def acquire(self, tokens: int = 1):
+        """Block the calling thread until ``tokens`` requests may be issued."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int = 1):
+        """Wait without blocking the event loop until ``tokens`` requests may be issued."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def get_stats(self) -> Dict:
+        """Get limiter statistics."""
+        with self._lock:
+            return {
+                'min_interval': self.min_interval,
+                'burst': self.burst,
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'total_wait': round(self.total_wait, 3),
+                'avg_wait': round(self.total_wait / self.waited, 3) if self.waited else 0.0,
+                'max_wait': round(self.max_wait, 3)
+            }
@@ -0,0 +1,168 @@
+"""Shared raw record schema with structured rejection reasons."""
+
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """Why a record failed validation."""
+    reason: str  # missing_field, invalid_prices, missing_price, invalid_type, non_positive_price, negative_volume, inconsistent_ohlc
+    field: Optional[str] = None
+    
+    def __str__(self) -> str:
+        return f"{self.reason} ({self.field})" if self.field else self.reason
+
+
+class RecordSchema:
+    """Raw collector record schema, compiled once into flat checks.
+    
+    Checks run in a fixed order so the scalar and batch forms report the
+    same first reason: required fields, the prices mapping, each price field
+    present, each value's type, each value's range (prices > 0, volume >= 0)
+    and finally the OHLC relationship (low <= open, close <= high).
+    """
+    
+    def __init__(self, required: Sequence[str] = ('symbol', 'timestamp', 'prices'),
+                 price_fields: Sequence[str] = ('open', 'high', 'low', 'close'),
+                 volume_field: str = 'volume'):
+        """Compile the schema."""
+        self.required = tuple(required)
+        self.price_fields = tuple(price_fields)
+        self.volume_field = volume_field
+        
+        # (field, accepted types) in check order
+        self._typed_fields = tuple((field, (int, float)) for field in self.price_fields) + ((volume_field, int),)
+        self._value_fields = self.price_fields + (volume_field,)
+        self._completeness_fields = len(self.required) + len(self._value_fields)
+        
+        # Prebuilt rejections: validation allocates nothing
+        self._missing = {field: Rejection('missing_field', field) for field in self.required}
+        self._missing_price = {field: Rejection('missing_price', field) for field in self._value_fields}
+        self._invalid_type = {field: Rejection('invalid_type', field) for field in self._value_fields}
+        self._out_of_range = [Rejection('non_positive_price', field) for field in self.price_fields] + \
+            [Rejection('negative_volume', volume_field)]
+        self._invalid_prices = Rejection('invalid_prices', 'prices')
+        self._inconsistent = Rejection('inconsistent_ohlc')
+    
+    def check_structure(self, record: Dict) -> Optional[Rejection]:
+        """Check required top-level fields only."""
+        for field in self.required:
+            if field not in record:
+                return self._missing[field]
+        return None
+    
+    def _check_types(self, record: Dict) -> Optional[Rejection]:
+        """Check structure, price presence and value types."""
+        rejection = self.check_structure(record)
+        if rejection is not None:
+            return rejection
+        
+        prices = record['prices']
+        if not isinstance(prices, dict):
+            return self._invalid_prices
+        
+        for field in self._value_fields:
+            if field not in prices:
+                return self._missing_price[field]
+        
+        for field, types in self._typed_fields:
+            if not isinstance(prices[field], types):
+                return self._invalid_type[field]
+        
+        return None
+    
+    def validate(self, record: Dict) -> Optional[Rejection]:
+        """Validate one record; returns None if it is valid."""
+        rejection = self._check_types(record)
+        if rejection is not None:
+            return rejection
+        
+        prices = record['prices']
+        for i, field in enumerate(self.price_fields):
+            if prices[field] <= 0:
+                return self._out_of_range[i]
+        if prices[self.volume_field] < 0:
+            return self._out_of_range[-1]
+        
+        o, h, l, c = (prices[field] for field in self.price_fields)
+        if not (l <= o <= h and l <= c <= h):
+            return self._inconsistent
+        
+        return None
+    
+    def validate_batch(self, records: List[Dict]) -> List[Optional[Rejection]]:
+        """Validate records at once; value and OHLC checks run as array operations.
+        
+        Returns one entry per record, None for valid ones, identical to
+        calling ``validate()`` on each record.
+        """
+        results: List[Optional[Rejection]] = [None] * len(records)
+        rows = []
+        values = []
+        
+        for i, record in enumerate(records):
+            rejection = self._check_types(record)
+            if rejection is not None:
+                results[i] = rejection
+                continue
+            
+            prices = record['prices']
+            rows.append(i)
+            values.append([prices[field] for field in self._value_fields])
+        
+        if not rows:
+            return results
+        
+        matrix = np.array(values, dtype=np.float64).reshape(len(rows), len(self._value_fields))
+        o, h, l, c = (matrix[:, i] for i in range(4))
+        
+        out_of_range = np.column_stack([matrix[:, :-1] <= 0, matrix[:, -1] < 0])
+        has_range_error = out_of_range.any(axis=1)
+        first_range_error = out_of_range.argmax(axis=1)
+        inconsistent = ~((l <= o) & (o <= h) & (l <= c) & (c <= h))
+        
+        for k in np.flatnonzero(has_range_error | inconsistent).tolist():
+            if has_range_error[k]:
+                results[rows[k]] = self._out_of_range[first_range_error[k]]
+            else:
+                results[rows[k]] = self._inconsistent
+        
+        return results
+    
+    def completeness(self, record: Dict) -> float:
+        """Fraction of required fields present, counting price fields only when truthy."""
+        present = sum(1 for field in self.required if field in record)
+        
+        prices = record.get('prices')
+        if isinstance(prices, dict):
+            present += sum(1 for field in self._value_fields if prices.get(field))
+        
+        return present / self._completeness_fields
+
+
+class RejectionStats:
+    """Thread-safe count of rejections by reason."""
+    
+    def __init__(self):
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+    
+    def record(self, rejection: Rejection):
+        """Count a rejection."""
+        with self._lock:
+            self._counts[rejection.reason] += 1
+    
+    def as_dict(self) -> Dict:
+        """Total and per-reason counts."""
+        with self._lock:
+            return {'total': sum(self._counts.values()), 'by_reason': dict(self._counts)}
+
+
+# Compiled once; shared by the collectors and the processor
+RAW_RECORD_SCHEMA = RecordSchema()